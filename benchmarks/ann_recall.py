@@ -0,0 +1,54 @@
+"""
+Evaluate the approximate nearest-neighbour index of recommend_books.
+
+Loads a catalog (the real books.csv or a synthetic one from
+benchmarks.run_benchmarks), builds the index or memory-maps a saved one,
+and reports recall@k and per-query latency for several n_probe settings
+against exact search.
+
+Usage (from the repository root):
+    python -m benchmarks.ann_recall --csv benchmarks/data/synthetic-1000000-seed0.csv \
+        --index-dir benchmarks/data/ann-1000000 --n-probe 1 --n-probe 4 --n-probe 16
+"""
+import argparse
+import json
+import os
+import time
+from src.analyzer import BookAnalyzer
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure recall@k of the ANN recommendation index")
+    parser.add_argument('--csv', default='data/books.csv', help="Path to the books CSV")
+    parser.add_argument('--cache-dir', default=None, help="Directory for the parsed data cache")
+    parser.add_argument('--index-dir', default=None,
+                        help="Load the index from this directory, or build and save it there")
+    parser.add_argument('--n-lists', type=int, default=None, help="Cells of a newly built index")
+    parser.add_argument('-k', type=int, default=10, help="Recommendations per query")
+    parser.add_argument('--queries', type=int, default=200, help="Random single-book queries")
+    parser.add_argument('--n-probe', type=int, action='append', dest='n_probes',
+                        help="n_probe setting, repeatable; default 1 2 4 8 16 32")
+    parser.add_argument('--output', default=None, help="Optional JSON results file")
+    args = parser.parse_args(argv)
+
+    analyzer = BookAnalyzer(args.csv, cache_dir=args.cache_dir)
+    analyzer.get_recommender()
+    start = time.perf_counter()
+    if args.index_dir and os.path.exists(os.path.join(args.index_dir, 'meta.json')):
+        index = analyzer.load_ann_index(args.index_dir)
+        action = 'loaded'
+    else:
+        index = analyzer.build_ann_index(n_lists=args.n_lists, path=args.index_dir)
+        action = 'built'
+    print(f"{action} index of {index.n_rows:,} books in {index.n_lists:,} cells "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    results = analyzer.evaluate_ann_index(k=args.k, n_queries=args.queries,
+                                          n_probes=args.n_probes or (1, 2, 4, 8, 16, 32))
+    print(results.to_string())
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'n_rows': index.n_rows, 'n_lists': index.n_lists,
+                       'results': results.reset_index().to_dict(orient='records')}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
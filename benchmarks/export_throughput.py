@@ -0,0 +1,86 @@
+"""
+Compare the throughput of the columnar export with the CSV and print paths.
+
+Loads a catalog (the real books.csv or a synthetic one from
+benchmarks.run_benchmarks) and writes three outputs of different shapes:
+the whole cleaned catalog, the per-author table and the top-rated books.
+Each is written as CSV (the batch report's to_csv), printed with to_string
+to /dev/null (the interactive report), and exported to Arrow IPC, Parquet
+and NDJSON in record batches. The ratings_count display formatting is
+timed separately, with the per-row f"{x:,}" lambda against
+format_thousands.
+
+Usage (from the repository root):
+    python -m benchmarks.export_throughput --csv benchmarks/data/synthetic-1000000-seed0.csv \
+        --cache-dir benchmarks/data/cache --output export.json
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from src.analyzer import BookAnalyzer
+from src.export import DEFAULT_BATCH_SIZE, export_table
+from src.utils import format_thousands
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def _print_table(table):
+    with open(os.devnull, 'w') as sink:
+        print(table.to_string(), file=sink)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure export throughput against CSV and print")
+    parser.add_argument('--csv', default='data/books.csv', help="Path to the books CSV")
+    parser.add_argument('--cache-dir', default=None, help="Directory for the parsed data cache")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows per record batch")
+    parser.add_argument('--skip-print', action='store_true',
+                        help="Skip the print path, which is slow for the whole catalog")
+    parser.add_argument('--output', default=None, help="Optional JSON results file")
+    args = parser.parse_args(argv)
+
+    analyzer = BookAnalyzer(args.csv, cache_dir=args.cache_dir)
+    outputs = {
+        'catalog': analyzer.df,
+        'author_table': analyzer.get_author_table(split_authors=True).to_frame(),
+        'top_rated_books': analyzer.get_top_rated_books()
+    }
+    out_dir = tempfile.mkdtemp()
+    results = []
+    try:
+        for name, table in outputs.items():
+            writers = {'csv': lambda path: table.to_csv(path)}
+            if not args.skip_print:
+                writers['print'] = lambda path: _print_table(table)
+            for format in ('arrow', 'parquet', 'ndjson'):
+                writers[format] = (lambda path, format=format:
+                                   export_table(table, path, format, batch_size=args.batch_size))
+            for method, write in writers.items():
+                path = os.path.join(out_dir, f'{name}.{method}')
+                seconds = _timed(lambda: write(path))
+                size = os.path.getsize(path) if os.path.exists(path) else 0
+                results.append({'output': name, 'method': method, 'rows': len(table), 'seconds': seconds,
+                                'rows_per_second': len(table) / seconds if seconds else None,
+                                'megabytes': size / 2 ** 20})
+                print(f"{name:<16}{method:<9}{len(table):>10,} rows {seconds:8.3f} s "
+                      f"{len(table) / max(seconds, 1e-9):>14,.0f} rows/s {size / 2 ** 20:8.1f} MB")
+    finally:
+        shutil.rmtree(out_dir)
+
+    counts = analyzer.df['ratings_count']
+    lambda_seconds = _timed(lambda: counts.apply(lambda x: f"{x:,}"))
+    format_seconds = _timed(lambda: format_thousands(counts))
+    print(f"format {len(counts):,} counts: lambda {lambda_seconds:.3f} s, format_thousands {format_seconds:.3f} s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'n_rows': len(analyzer.df), 'batch_size': args.batch_size, 'results': results,
+                       'formatting': {'lambda_seconds': lambda_seconds, 'format_thousands_seconds': format_seconds}},
+                      f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Load test a running query service (src.server).
+
+Opens --concurrency keep-alive connections. Each connection sends
+requests back to back, cycling through the given paths, until --requests
+have been sent in total. Reports latency percentiles and throughput, and
+optionally writes them as JSON.
+
+Usage (from the repository root, with the server running):
+    python -m benchmarks.load_test --concurrency 32 --requests 5000 \
+        --path /get_basic_stats --path "/recommend_books?query_value=Tolkien"
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from urllib.parse import urlsplit
+import numpy as np
+
+async def _request(reader, writer, host, path):
+    """Send one GET on an open connection; returns the status code."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+        field, _, value = line.decode('latin-1').partition(':')
+        if field.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(host, port, paths, remaining, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while next(remaining, None) is not None:
+            path = next(paths)
+            start = time.perf_counter()
+            statuses.append(await _request(reader, writer, host, path))
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+async def run_load(url, paths, concurrency, n_requests):
+    """
+    Send n_requests over concurrency connections.
+
+    Returns:
+        dict: Request count, error count, requests per second and
+        p50/p90/p99/max latency in milliseconds
+    """
+    target = urlsplit(url)
+    paths = itertools.cycle(paths)
+    remaining = iter(range(n_requests))
+    latencies, statuses = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(target.hostname, target.port or 80, paths, remaining, latencies, statuses)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': sum(status != 200 for status in statuses),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p90_ms': round(float(np.percentile(latencies_ms, 90)), 3),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3),
+        'max_ms': round(float(latencies_ms.max()), 3)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the book query service")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the server")
+    parser.add_argument('--path', action='append', dest='paths',
+                        help="Request path, repeatable; default /get_basic_stats")
+    parser.add_argument('--concurrency', type=int, default=16, help="Open connections")
+    parser.add_argument('--requests', type=int, default=2000, help="Total requests")
+    parser.add_argument('--output', default=None, help="Optional JSON results file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run_load(args.url, args.paths or ['/get_basic_stats'],
+                                   args.concurrency, args.requests))
+    for key, value in results.items():
+        print(f"{key:<12}{value}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
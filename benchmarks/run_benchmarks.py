@@ -0,0 +1,197 @@
+"""
+Benchmark BookAnalyzer on synthetic catalogs of increasing size.
+
+Each catalog size is measured in a fresh subprocess, so peak memory of one
+size does not leak into the next. Every step records wall time and the
+peak resident set size reached while it ran. Results are written as JSON
+and can be compared against an earlier run.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 1000000
+    python -m benchmarks.run_benchmarks --output new.json --compare old.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.synthetic import write_catalog
+from src.utils import clean_books
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Most prolific generated author; a substring of no other author name
+QUERY_AUTHOR = 'Author 0000001'
+
+def _current_rss():
+    """Resident set size of this process in bytes."""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def _max_rss():
+    """Peak resident set size of this process so far in bytes."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class PeakMemory:
+    """Sample RSS in a background thread while a block runs and keep the peak."""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = 0
+        self._sampling = os.path.exists('/proc/self/statm')
+
+    def _sample(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def __enter__(self):
+        if not self._sampling:
+            return self
+        self.peak = _current_rss()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._sampling:
+            self._done.set()
+            self._thread.join()
+            self.peak = max(self.peak, _current_rss())
+        else:
+            # High-water mark of the whole process, an upper bound for the step
+            self.peak = _max_rss()
+
+# (step name, function of (analyzer, raw frame)); construction and cleaning are timed separately
+STEPS = [
+    ('get_basic_stats', lambda analyzer, raw: analyzer.get_basic_stats()),
+    ('get_language_distribution', lambda analyzer, raw: analyzer.get_language_distribution()),
+    ('get_top_rated_books', lambda analyzer, raw: analyzer.get_top_rated_books()),
+    ('get_most_prolific_authors', lambda analyzer, raw: analyzer.get_most_prolific_authors()),
+    ('analyze_author_performance', lambda analyzer, raw: analyzer.analyze_author_performance(QUERY_AUTHOR)),
+    ('get_top_authors_by_rating', lambda analyzer, raw: analyzer.get_top_authors_by_rating()),
+    ('recommend_books', lambda analyzer, raw: analyzer.recommend_books(QUERY_AUTHOR)),
+    ('recommend_books_batch', lambda analyzer, raw: analyzer.recommend_books_batch([(QUERY_AUTHOR, 'authors')])),
+]
+
+def _measure(func, repeat):
+    """Median wall time over repeats and the highest peak RSS."""
+    times, peak = [], 0
+    for _ in range(repeat):
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        peak = max(peak, memory.peak)
+    return {'wall_s': float(np.median(times)), 'peak_rss_mb': round(peak / 2**20, 1)}
+
+def run_size(csv_path, n_rows, repeat):
+    """Benchmark every step on one catalog; runs inside the child process."""
+    results = []
+
+    def record(step, func, repeat):
+        try:
+            measurement = _measure(func, repeat)
+        except Exception as e:
+            # A failed step must not pass for a measurement
+            raise RuntimeError(f"Step {step!r} failed on {n_rows:,} rows") from e
+        results.append({'rows': n_rows, 'step': step, **measurement})
+        print(f"{n_rows:>10,} {step:<28}{measurement['wall_s']:9.4f}s {measurement['peak_rss_mb']:9.1f} MB",
+              file=sys.stderr)
+
+    analyzers = []
+    record('construct', lambda: analyzers.append(BookAnalyzer(csv_path, result_cache_size=0)), 1)
+    analyzer = analyzers[0]
+    raw = pd.read_csv(csv_path)
+    # Cleans a copy, so the analyzer's data and derived structures stay as built
+    record('clean_data', lambda: clean_books(raw.copy()), repeat)
+    for step, func in STEPS:
+        record(step, lambda: func(analyzer, raw), repeat)
+    return results
+
+def _metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def compare(results, baseline, threshold=1.2):
+    """
+    Print the wall time ratio of each step against a baseline run.
+
+    Returns:
+        list: (rows, step, ratio) for steps slower than threshold times baseline
+    """
+    before = {(r['rows'], r['step']): r for r in baseline['results'] if 'wall_s' in r}
+    regressions = []
+    for r in results['results']:
+        old = before.get((r['rows'], r['step']))
+        if old is None:
+            continue
+        ratio = r['wall_s'] / old['wall_s'] if old['wall_s'] > 0 else float('inf')
+        flag = '  <-- slower' if ratio > threshold else ''
+        print(f"{r['rows']:>10,} {r['step']:<28}{old['wall_s']:9.4f}s -> {r['wall_s']:9.4f}s  x{ratio:5.2f}{flag}")
+        if ratio > threshold:
+            regressions.append((r['rows'], r['step'], ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark BookAnalyzer on synthetic catalogs")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Catalog sizes in rows")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per query step; the median is kept")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic catalogs")
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'),
+                        help="Directory where generated catalogs are kept between runs")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results file")
+    parser.add_argument('--compare', default=None, help="Earlier results file to compare against")
+    parser.add_argument('--child', nargs=2, metavar=('CSV', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        # Child process: benchmark one catalog and print its results as JSON
+        print(json.dumps(run_size(args.child[0], int(args.child[1]), args.repeat)))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {'metadata': _metadata(), 'results': []}
+    for n_rows in args.sizes:
+        csv_path = os.path.join(args.data_dir, f'synthetic-{n_rows}-seed{args.seed}.csv')
+        if not os.path.exists(csv_path):
+            print(f"Generating {n_rows:,} rows -> {csv_path}", file=sys.stderr)
+            write_catalog(csv_path, n_rows, seed=args.seed)
+        child = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.run_benchmarks', '--repeat', str(args.repeat),
+             '--child', csv_path, str(n_rows)],
+            stdout=subprocess.PIPE, check=True, text=True
+        )
+        results['results'].extend(json.loads(child.stdout))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+if __name__ == '__main__':
+    main()
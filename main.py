@@ -1,82 +1,223 @@
+import argparse
+import json
+import multiprocessing
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from src.analyzer import BookAnalyzer
+from src.export import export_table
 from src.utils import plot_rating_distribution, create_author_summary
 
-def main():
-    # Initialize our analyzer with the dataset
-    analyzer = BookAnalyzer('data/books.csv')
+# Analyzer shared by the sections of a batch run, set once per worker process
+_analyzer = None
 
-    # 1. Basic Dataset Analysis
-    print("Basic Statistics:")
-    print(analyzer.get_basic_stats())
-    input("\nPress Enter to continue...")  # Pause for user to read
+def section_basic_stats(analyzer):
+    """1. Basic Dataset Analysis"""
+    return {'basic_stats': analyzer.get_basic_stats()}, {}
 
-    # 2. Language Distribution
-    print("\nLanguage Distribution:")
+def section_language_distribution(analyzer):
+    """2. Language Distribution"""
     lang_dist = analyzer.get_language_distribution()
-    plt.figure(figsize=(12, 6))
+    fig = plt.figure(figsize=(12, 6))
     lang_dist.head(10).plot(kind='bar')
     plt.title('Top 10 Languages in Dataset')
     plt.xlabel('Language Code')
     plt.ylabel('Number of Books')
     plt.tight_layout()
-    plt.show()
+    return {'language_distribution': lang_dist}, {'language_distribution': fig}
 
-    # 3. Top Rated Books
-    print("\nTop Rated Books (with at least 1000 ratings):")
-    top_books = analyzer.get_top_rated_books(min_ratings=1000)
-    print(top_books)
-    input("\nPress Enter to continue...")
+def section_top_rated_books(analyzer):
+    """3. Top Rated Books"""
+    return {'top_rated_books': analyzer.get_top_rated_books(min_ratings=1000)}, {}
 
-    # 4. Most Prolific Authors
-    print("\nAuthors with Most Books:")
-    print(analyzer.get_most_prolific_authors())
-    input("\nPress Enter to continue...")
+def section_prolific_authors(analyzer):
+    """4. Most Prolific Authors"""
+    return {'prolific_authors': analyzer.get_most_prolific_authors()}, {}
 
-    # 5. Author Performance Analysis
+def section_author_performance(analyzer):
+    """5. Author Performance Analysis"""
     authors = ['J.K. Rowling', 'John Grisham', 'James Patterson', 'Lee Child']
-    plt.figure(figsize=(15, 8))
+    fig = plt.figure(figsize=(15, 8))
+    summaries, performances = analyzer.analyze_authors(authors)
 
-    for author in authors:
-        perf = analyzer.analyze_author_performance(author)
-        if not perf.empty:
-            plt.plot(perf['publication_date'], perf['average_rating'], 
-                    marker='o', label=author)
+    for author, perf in performances.groupby(level='author', sort=False):
+        plt.plot(perf['publication_date'], perf['average_rating'],
+                marker='o', label=author)
 
     plt.title('Author Ratings Over Time')
     plt.xlabel('Publication Date')
     plt.ylabel('Average Rating')
     plt.legend()
     plt.grid(True)
-    plt.show()
+    return ({'author_performance': performances, 'author_summaries': summaries},
+            {'author_performance': fig})
 
-    # 6. Top Rated Authors
-    print("\nTop Rated Authors (minimum 3 books):")
-    print(analyzer.get_top_authors_by_rating())
-    input("\nPress Enter to continue...")
+def section_top_authors(analyzer):
+    """6. Top Rated Authors"""
+    return {'top_authors': analyzer.get_top_authors_by_rating()}, {}
 
-    # 7. Correlation Analysis
-    plt.figure(figsize=(12, 5))
-    plt.subplot(1, 2, 1)
+def section_author_table(analyzer):
+    """Per-author statistics of every author"""
+    return {'author_table': analyzer.get_author_table(split_authors=True).to_frame()}, {}
+
+def section_correlations(analyzer):
+    """7. Correlation Analysis"""
+    figures = {}
     analyzer.plot_ratings_reviews_correlation()
-    plt.subplot(1, 2, 2)
+    figures['ratings_reviews_correlation'] = plt.gcf()
     analyzer.plot_pages_ratings_correlation()
-    plt.tight_layout()
-    plt.show()
+    figures['pages_ratings_correlation'] = plt.gcf()
+    return {}, figures
+
+def section_recommendations(analyzer):
+    """8. Book Recommendations"""
+    return {
+        'recommendations_rowling': analyzer.recommend_books('J.K. Rowling'),
+        'recommendations_hobbit': analyzer.recommend_books('The Hobbit', attribute='title'),
+        'similar_to_hobbit': analyzer.recommend_similar_books('The Hobbit')
+    }, {}
+
+# (name, heading, section, pause after it in interactive mode)
+SECTIONS = [
+    ('basic_stats', "Basic Statistics", section_basic_stats, True),
+    ('language_distribution', "Language Distribution", section_language_distribution, False),
+    ('top_rated_books', "Top Rated Books (with at least 1000 ratings)", section_top_rated_books, True),
+    ('prolific_authors', "Authors with Most Books", section_prolific_authors, True),
+    ('author_performance', "Author Ratings Over Time", section_author_performance, False),
+    ('top_authors', "Top Rated Authors (minimum 3 books)", section_top_authors, True),
+    ('author_table', "Author Statistics", section_author_table, False),
+    ('correlations', "Correlation Analysis", section_correlations, False),
+    ('recommendations', "Book Recommendations (J.K. Rowling, 'The Hobbit')", section_recommendations, True),
+]
+
+# Table formats of batch mode besides CSV, written by src.export
+TABLE_FORMATS = ['csv', 'arrow', 'parquet', 'ndjson']
+
+def write_table(table, path_stem, table_format='csv'):
+    """
+    Write a result table. Returns the path.
+
+    With table_format='csv', DataFrames and Series are written as CSV and
+    anything else as JSON; the other formats write every result in record
+    batches with export_table.
+    """
+    if table_format != 'csv':
+        return export_table(table, f"{path_stem}.{table_format}", table_format)['path']
+    if isinstance(table, (pd.DataFrame, pd.Series)):
+        path = f"{path_stem}.csv"
+        table.to_csv(path)
+    else:
+        path = f"{path_stem}.json"
+        with open(path, 'w') as f:
+            json.dump(table, f, indent=2, default=lambda value: value.item() if hasattr(value, 'item') else str(value))
+    return path
+
+def _init_worker(csv_path, cache_dir, analyzer=None):
+    global _analyzer
+    plt.switch_backend('Agg')
+    # Forked workers inherit the parent's analyzer; others load the data again
+    _analyzer = analyzer if analyzer is not None else BookAnalyzer(csv_path, cache_dir=cache_dir)
+
+def run_section(name, output_dir, formats, table_format='csv'):
+    """
+    Run one report section in a worker and write its outputs.
+
+    Returns:
+        tuple: (section name, wall time in seconds, written paths)
+    """
+    section = {section_name: func for section_name, _, func, _ in SECTIONS}[name]
+    start = time.perf_counter()
+    tables, figures = section(_analyzer)
+    paths = [write_table(table, os.path.join(output_dir, table_name), table_format)
+             for table_name, table in tables.items()]
+    for figure_name, fig in figures.items():
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{figure_name}.{fmt}")
+            fig.savefig(path, format=fmt)
+            paths.append(path)
+        plt.close(fig)
+    return name, time.perf_counter() - start, paths
+
+def run_batch(csv_path, output_dir, formats=('png',), workers=None, cache_dir=None, table_format='csv',
+              start_method=None):
+    """
+    Write every report section to an output directory without prompts.
+
+    The data is loaded once, then the sections run concurrently in a
+    process pool on the Agg backend. Per-section wall times are printed as
+    sections finish. With the fork start method the workers share the
+    loaded analyzer; with spawn or forkserver each worker loads the data
+    itself, from cache_dir when given.
+
+    Args:
+        start_method (str, optional): multiprocessing start method of the
+            pool, default the platform's
+
+    Returns:
+        dict: Wall time in seconds per section and 'total'
+    """
+    plt.switch_backend('Agg')
+    start = time.perf_counter()
+    analyzer = BookAnalyzer(csv_path, cache_dir=cache_dir)
+    load_time = time.perf_counter() - start
+    print(f"{'load':<24}{load_time:8.2f}s")
+    os.makedirs(output_dir, exist_ok=True)
+
+    timings = {'load': load_time}
+    workers = workers or min(len(SECTIONS), os.cpu_count() or 1)
+    context = multiprocessing.get_context(start_method)
+    # A forked worker inherits the analyzer instead of unpickling a copy of the data
+    shared = analyzer if context.get_start_method() == 'fork' else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(csv_path, cache_dir, shared)) as pool:
+        futures = [pool.submit(run_section, name, output_dir, formats, table_format) for name, *_ in SECTIONS]
+        for future in as_completed(futures):
+            name, seconds, paths = future.result()
+            timings[name] = seconds
+            print(f"{name:<24}{seconds:8.2f}s  {len(paths)} file(s)")
+
+    timings['total'] = time.perf_counter() - start
+    print(f"{'total':<24}{timings['total']:8.2f}s")
+    return timings
+
+def main():
+    # Initialize our analyzer with the dataset
+    analyzer = BookAnalyzer('data/books.csv')
 
-    # 8. Book Recommendations
-    print("\nBook Recommendations based on J.K. Rowling:")
-    recommendations = analyzer.recommend_books('J.K. Rowling')
-    print(recommendations)
-    input("\nPress Enter to continue...")
+    for _, heading, section, pause in SECTIONS:
+        tables, figures = section(analyzer)
+        print(f"\n{heading}:")
+        for name, table in tables.items():
+            # The author table has a row per author; show only its first rows
+            print(table.head() if name == 'author_table' else table)
+        if figures:
+            plt.show()
+        if pause:
+            input("\nPress Enter to continue...")  # Pause for user to read
 
-    print("\nBook Recommendations based on 'The Hobbit':")
-    recommendations = analyzer.recommend_books('The Hobbit', attribute='title')
-    print(recommendations)
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Book analysis report")
+    parser.add_argument('--batch', action='store_true',
+                        help="Write the report to --output-dir without prompts or windows")
+    parser.add_argument('--csv', default='data/books.csv',
+                        help="Path to the books CSV, or a directory or glob of CSV shards")
+    parser.add_argument('--output-dir', default='reports', help="Directory for batch outputs")
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg'],
+                        help="Figure formats written in batch mode")
+    parser.add_argument('--table-format', default='csv', choices=TABLE_FORMATS,
+                        help="Format of the result tables written in batch mode")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes")
+    parser.add_argument('--cache-dir', default=None, help="Directory for the parsed data cache")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args(sys.argv[1:])
+    if args.batch:
+        run_batch(args.csv, args.output_dir, args.formats, args.workers, args.cache_dir, args.table_format)
+    else:
+        main()
@@ -1,108 +1,379 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime
+from src.ann_index import IVFIndex, evaluate_recall
+from src.author_analytics import author_analytics
+from src.author_index import AuthorIndex
+from src.author_table import INPUT_COLUMNS as AUTHOR_TABLE_COLUMNS, AuthorTable
+from src.cache import load_cached_frame
+from src.compact import compact_frame, encode_rows, restore_columns
+from src.editions import collapse_frame
+from src.instrument import Instrumentation, instrumented, profile, stage
+from src.memo import ResultCache, memoized
+from src.query import QueryEngine
+from src.recommender import RecommendationEngine
+from src.shards import find_shards, load_shards
+from src.streaming import StreamingBookStats
+from src.text_index import TextIndex
+from src.utils import clean_books, match_values, plot_scatter, validate_columns
 
 class BookAnalyzer:
     """A class for analyzing book data and making recommendations."""
     
-    def __init__(self, csv_path):
-        """Initialize BookAnalyzer with a CSV file path."""
-        self.df = pd.read_csv(csv_path)
+    def __init__(self, csv_path, cache_dir=None, compact=False, result_cache_size=128,
+                 collapse_editions=False, instrument=False, workers=None):
+        """
+        Initialize BookAnalyzer with a CSV file path.
+        
+        Parameters:
+        - csv_path: Path to the books CSV file, or a directory or glob
+          pattern of CSV shards in the books.csv schema (see shard_report)
+        - cache_dir: Optional directory for a binary cache of the cleaned data,
+          reused until the CSV content changes
+        - compact: Hold the data in compact dtypes (see compact())
+        - collapse_editions: Hold one row per work instead of per edition
+          (see collapse_editions())
+        - result_cache_size: Number of query results kept for repeated calls
+          with the same arguments (0 disables the result cache)
+        - instrument: Record timings, row counts and memory deltas of the
+          load and every query method (see instrumentation); a callable is
+          also called with each record
+        - workers: Processes loading shards in parallel, default one per CPU
+        """
+        self.result_cache = ResultCache(result_cache_size)
+        self.instrumentation = Instrumentation(enabled=bool(instrument),
+                                               callback=instrument if callable(instrument) else None)
+        self._df = None
+        self._pending = []
+        self._n_pending = 0
+        self._next_label = None
+        self._data_version = 0
+        self._codecs = {}
+        self.compact_report = None
+        self._editions = None
+        # Edition rows of works appended since the last read of self.editions
+        self._pending_editions = []
+        self.edition_map = None
+        self.collapse_report = None
+        # Shards loaded and skipped, when csv_path names several files
+        self.shard_report = None
+        self._recommender = None
+        self._ann_index = None
+        # Rows updated since the ANN index was built, scored exactly
+        self._ann_updated = np.empty(0, dtype=np.intp)
+        self._author_index = None
+        self._author_tables = {}
+        self._text_index = None
+        self._query_engine = None
+        self._key_positions = {}
+        
+        with self.instrumentation.measure('load', kind='method') as record:
+            shard_paths = find_shards(csv_path)
+            if shard_paths is not None:
+                with stage('load_shards'):
+                    self.df, author_index, self.shard_report = load_shards(shard_paths, workers, cache_dir)
+                self._author_index = (self._data_version, author_index)
+            elif cache_dir is None:
+                self._load_csv(csv_path)
+            else:
+                self.df = load_cached_frame(csv_path, cache_dir, 'clean', lambda: self._load_csv(csv_path))
+            # Publication dates that could not be parsed during cleaning
+            self.unparseable_dates = self._df.attrs.get('unparseable_dates', 0)
+            if collapse_editions:
+                self.collapse_editions()
+            if compact:
+                self.compact()
+            record['rows'] = len(self._df)
+    
+    @property
+    def df(self):
+        """The cleaned book data, including rows appended since the last read."""
+        if self._pending:
+            self._flush_pending()
+        return self._df
+    
+    @df.setter
+    def df(self, value):
+        # Replacing the data invalidates everything derived from it
+        self._df = value
+        self._pending = []
+        self._n_pending = 0
+        self._next_label = None
+        self._data_version += 1
+        self.result_cache.clear()
+    
+    @property
+    def editions(self):
+        """Edition rows after collapse_editions(), including those of appended works."""
+        if self._pending_editions:
+            self._editions = pd.concat([self._editions, *self._pending_editions])
+            self._pending_editions = []
+        return self._editions
+    
+    @editions.setter
+    def editions(self, value):
+        self._editions = value
+        self._pending_editions = []
+    
+    @staticmethod
+    def stream(csv_path, chunksize=100_000, min_ratings=1000):
+        """
+        Compute summary statistics of a CSV too large to load into memory.
+        
+        Parameters:
+        - csv_path: Path to a CSV file in the books.csv schema
+        - chunksize: Number of rows read and cleaned at a time
+        - min_ratings: Ratings threshold for get_top_rated_books
+        
+        Returns:
+        - StreamingBookStats with get_basic_stats, get_language_distribution,
+          get_most_prolific_authors, get_top_rated_books and
+          get_top_authors_by_rating
+        """
+        return StreamingBookStats.from_csv(csv_path, chunksize=chunksize, min_ratings=min_ratings)
+    
+    def _load_csv(self, csv_path):
+        """Read and clean the CSV file, returning the cleaned frame."""
+        with stage('read_csv') as record:
+            self.df = pd.read_csv(csv_path)
+            record['rows'] = len(self._df)
         self._clean_data()
+        return self.df
     
     def _clean_data(self):
         """Clean the dataset by handling missing values and data types."""
-        # Convert ratings to float
-        self.df['average_rating'] = pd.to_numeric(self.df['average_rating'], errors='coerce')
+        with stage('clean') as record:
+            self.df = clean_books(self.df)
+            record['rows'] = len(self._df)
+    
+    @instrumented
+    def compact(self):
+        """
+        Switch the data to a compact in-memory representation.
+        
+        Low-cardinality strings become categoricals, numerics are downcast
+        where that is lossless and the raw '  num_pages' column is dropped.
+        Every query method keeps returning the same results as before.
+        
+        Returns:
+        - Report dict with bytes before/after, bytes saved and column changes
+        """
+        if not self._codecs:
+            self.df, self._codecs, self.compact_report = compact_frame(self.df)
+        return self.compact_report
+    
+    @instrumented
+    def collapse_editions(self):
+        """
+        Switch the data to one row per work, merging the editions of a book.
+        
+        Editions are grouped by hashed normalized title and primary author,
+        and by ISBN-13 (see src/editions.py). Each work keeps its most rated
+        edition's title, authors and details, the summed ratings and reviews,
+        the ratings-weighted average rating, the earliest publication date
+        and an n_editions count. Every query method then runs on the smaller
+        work table, indexed by work id. The edition rows stay available in
+        self.editions, and get_editions() lists the editions of a work.
         
-        # Convert num_pages to numeric, removing any leading/trailing spaces
-        self.df['num_pages'] = pd.to_numeric(self.df['  num_pages'].str.strip(), errors='coerce')
+        Rows appended afterwards are added as works of their own.
         
-        # Drop unnamed columns and empty rows
-        self.df = self.df.drop(columns=[col for col in self.df.columns if 'Unnamed' in col])
-        self.df = self.df.dropna(subset=['title', 'authors', 'average_rating'])
+        Returns:
+        - Report dict with the number of editions, works, works with several
+          editions and rows saved
+        """
+        if self._editions is None:
+            editions = self._restore(self.df)
+            works, self.edition_map, self.collapse_report = collapse_frame(editions)
+            if self._codecs:
+                works, self._codecs, self.compact_report = compact_frame(works)
+            self.editions = editions
+            self.df = works
+            self._key_positions = {}
+        return self.collapse_report
+    
+    def get_editions(self, work_id):
+        """
+        Get the edition rows of a work after collapse_editions().
         
-        # Convert dates to datetime
-        self.df['publication_date'] = pd.to_datetime(self.df['publication_date'], errors='coerce')
+        Parameters:
+        - work_id: Work id, as in the index of the collapsed data
+        
+        Returns:
+        - DataFrame of the work's editions in their original row order
+        """
+        if self.edition_map is None:
+            raise ValueError("Editions are not collapsed; call collapse_editions() first")
+        # Labels of appended rows dropped by cleaning are works without editions
+        if not 0 <= work_id < len(self.edition_map) or self.edition_map.n_editions[work_id] == 0:
+            raise KeyError(work_id)
+        return self.editions.iloc[self.edition_map.editions(work_id)]
+    
+    def _columns(self, columns):
+        """Get data columns in their default dtypes, decoding compact ones."""
+        return self._restore(self.df[columns])
+    
+    def _restore(self, frame):
+        """Decode any compact columns of a frame taken from self.df."""
+        return restore_columns(frame, self._codecs) if self._codecs else frame
     
+    @instrumented
+    @memoized
     def get_basic_stats(self):
         """Get basic statistics about the dataset."""
+        engine = self.get_query_engine()
+        summary = engine.summary()
         stats = {
-            'Total Books': len(self.df),
-            'Unique Authors': len(self.df['authors'].unique()),
-            'Average Rating': round(self.df['average_rating'].mean(), 2),
-            'Average Pages': int(self.df['num_pages'].mean()),
-            'Most Common Languages': self.df['language_code'].value_counts().head(3).to_dict(),
-            'Date Range': f"{self.df['publication_date'].min().year} to {self.df['publication_date'].max().year}",
-            'Total Ratings': self.df['ratings_count'].sum(),
-            'Average Ratings per Book': int(self.df['ratings_count'].mean())
+            'Total Books': len(engine),
+            'Unique Authors': len(self.get_author_table()),
+            'Average Rating': round(summary['average_rating'], 2),
+            'Average Pages': int(summary['average_pages']),
+            'Most Common Languages': engine.language_counts().head(3).to_dict(),
+            'Date Range': f"{summary['first_date'].year} to {summary['last_date'].year}",
+            'Total Ratings': summary['total_ratings'],
+            'Average Ratings per Book': int(summary['average_ratings'])
         }
         return stats
     
+    @instrumented
+    @memoized
     def get_language_distribution(self):
         """Get distribution of books across languages."""
-        return self.df['language_code'].value_counts()
+        return self.get_query_engine().language_counts()
     
+    @instrumented
+    @memoized
     def get_top_rated_books(self, min_ratings=1000):
         """Get top 10 most rated books with minimum ratings threshold."""
-        mask = self.df['ratings_count'] >= min_ratings
-        return (self.df[mask]
-                .sort_values('average_rating', ascending=False)
-                .head(10)[['title', 'authors', 'average_rating', 'ratings_count']])
-    
-    def get_most_prolific_authors(self):
-        """Get authors with most books."""
-        return self.df['authors'].value_counts().head(10)
-    
-    def analyze_author_performance(self, author_name):
-        """Analyze performance of a specific author over time."""
-        author_df = self.df[self.df['authors'].str.contains(author_name, case=False, na=False)]
+        return self.query(10, min_ratings=min_ratings, columns=['title', 'authors', 'average_rating', 'ratings_count'])
+    
+    @instrumented
+    def query(self, n=10, by='average_rating', ascending=False, columns=None, language=None, **filters):
+        """
+        Get the first books matching filters, ordered by a column.
+        
+        Filters are combined in one pass over NumPy copies of the columns
+        and only the selected rows are taken from the data (see QueryEngine).
+        Books with equal values keep their row order.
+        
+        Parameters:
+        - n: Number of books to return; None for every match
+        - by: 'average_rating', 'ratings_count', 'num_pages' or
+          'publication_date'
+        - ascending: Smallest values first instead of largest
+        - columns: Columns to return, default all
+        - language: Language code or list of codes to keep
+        - filters: Inclusive bounds min_rating/max_rating,
+          min_ratings/max_ratings (ratings_count), min_pages/max_pages and
+          start_date/end_date (publication_date)
+        
+        Example:
+        - analyzer.query(5, language='eng', min_ratings=1000,
+          start_date='2000-01-01', max_pages=300)
+        """
+        positions = self.get_query_engine().top(n, by, ascending, language, **filters)
+        books = self._restore(self.df.iloc[positions])
+        return books if columns is None else books[columns]
+    
+    @instrumented
+    @memoized
+    def get_most_prolific_authors(self, split_authors=False):
+        """
+        Get authors with most books.
+        
+        Parameters:
+        - split_authors: Count each author of a '/'-separated list separately
+          instead of counting the raw author string
+        """
+        return self.get_author_table(split_authors).most_prolific(10)
+    
+    @instrumented
+    @memoized
+    def analyze_author_performance(self, author_name, match='substring'):
+        """
+        Analyze performance of a specific author over time.
+        
+        Parameters:
+        - author_name: Author to analyze
+        - match: 'substring' for a case-insensitive pattern search of the
+          authors column, or 'exact'/'prefix' for an author index lookup
+        """
+        author_df = self.find_author_books(author_name, match)
         return author_df.sort_values('publication_date')[
             ['title', 'publication_date', 'average_rating', 'ratings_count']
         ]
     
-    def get_top_authors_by_rating(self, min_books=3):
-        """Get top authors by average rating with minimum books threshold."""
-        author_stats = (self.df.groupby('authors')
-                       .agg({
-                           'average_rating': 'mean',
-                           'title': 'count'
-                       })
-                       .reset_index())
-        
-        mask = author_stats['title'] >= min_books
-        return (author_stats[mask]
-                .sort_values('average_rating', ascending=False)
-                .head(10))
-    
-    def plot_ratings_reviews_correlation(self):
-        """Plot correlation between ratings and review counts."""
+    @instrumented
+    def analyze_authors(self, authors=None, workers=1):
+        """
+        Summarize and list the books of many authors in one pass.
+        
+        Each individual author of a '/'-separated list is matched exactly,
+        as with match='exact'. See author_analytics.author_analytics.
+        
+        Parameters:
+        - authors: Author names to report, default every author; unknown
+          names are skipped
+        - workers: Processes sharing the work through memory-mapped arrays
+        
+        Returns:
+        - (summaries, performance): a DataFrame of create_author_summary
+          statistics per author, and each author's books by publication
+          date as in analyze_author_performance, indexed by (author, book)
+        """
+        frame = self._columns(['title', 'average_rating', 'ratings_count', 'num_pages', 'publication_date'])
+        return author_analytics(frame, self.get_author_index(), authors, workers)
+    
+    @instrumented
+    @memoized
+    def get_top_authors_by_rating(self, min_books=3, split_authors=False):
+        """
+        Get top authors by average rating with minimum books threshold.
+        
+        Parameters:
+        - min_books: Minimum number of books per author
+        - split_authors: Aggregate per individual author instead of per raw
+          author string
+        """
+        return self.get_author_table(split_authors).top_by_rating(min_books, 10)
+    
+    def plot_ratings_reviews_correlation(self, mode='auto'):
+        """
+        Plot correlation between ratings and review counts.
+        
+        Parameters:
+        - mode: 'points', 'density' (2-D histogram image with log-spaced
+          bins along the log x axis) or 'auto' to pick density for large
+          catalogs (see utils.plot_scatter)
+        """
+        import matplotlib.pyplot as plt
+        
+        df = self._columns(['ratings_count', 'average_rating'])
         plt.figure(figsize=(10, 6))
-        plt.scatter(self.df['ratings_count'], 
-                   self.df['average_rating'],
-                   alpha=0.5)
+        plot_scatter(df['ratings_count'], df['average_rating'], mode=mode, log_x=True)
         plt.xlabel('Number of Ratings')
         plt.ylabel('Average Rating')
         plt.title('Correlation between Ratings Count and Average Rating')
-        plt.xscale('log')
         return plt
     
-    def plot_pages_ratings_correlation(self):
-        """Plot correlation between number of pages and ratings."""
+    def plot_pages_ratings_correlation(self, mode='auto'):
+        """
+        Plot correlation between number of pages and ratings.
+        
+        Parameters:
+        - mode: 'points', 'density' or 'auto' (see utils.plot_scatter)
+        """
+        import matplotlib.pyplot as plt
+        
+        df = self._columns(['num_pages', 'average_rating'])
         plt.figure(figsize=(10, 6))
-        plt.scatter(self.df['num_pages'],
-                   self.df['average_rating'],
-                   alpha=0.5)
+        plot_scatter(df['num_pages'], df['average_rating'], mode=mode)
         plt.xlabel('Number of Pages')
         plt.ylabel('Average Rating')
         plt.title('Correlation between Number of Pages and Average Rating')
         return plt
     
-    def recommend_books(self, query_value, attribute='authors', n_recommendations=5):
+    @instrumented
+    def recommend_books(self, query_value, attribute='authors', n_recommendations=5, match='substring',
+                        n_probe=None):
         """
         Recommend books based on similarity to a query value.
         
@@ -110,39 +381,517 @@ class BookAnalyzer:
         - query_value: Value to base recommendations on (e.g., author name)
         - attribute: Attribute to query on ('authors', 'title', etc.)
         - n_recommendations: Number of recommendations to return
+        - match: 'substring' pattern search, or 'exact'/'prefix' author index
+          lookup (only with attribute='authors')
+        - n_probe: Search the approximate nearest-neighbour index, scoring
+          the books of this many cells, instead of every book (see
+          get_ann_index). More cells give better recall but slower queries.
+        """
+        # Find the row positions of books matching the query
+        with stage('match') as record:
+            values = self._columns([attribute])[attribute]
+            if attribute == 'authors' and match != 'substring':
+                query_positions = self.get_author_index().lookup(query_value, match)
+            elif match == 'substring':
+                query_positions = np.flatnonzero(values.str.contains(query_value, case=False, na=False))
+            else:
+                raise ValueError(f"match={match!r} is only supported for attribute='authors'")
+            record['rows'] = len(query_positions)
+        
+        if len(query_positions) == 0:
+            return pd.DataFrame()
+        
+        query_values = values.iloc[query_positions].unique()
+        recommender = self.get_recommender()
+        if n_probe is None:
+            with stage('similarity'):
+                exclude_mask = values.isin(query_values).to_numpy()
+                return self._restore(recommender.recommend(query_positions, exclude_mask, n_recommendations))
+        
+        # Only the candidates' values are checked, instead of every book's
+        with stage('similarity'):
+            positions = self._search_ann_index(
+                recommender.unit_features[query_positions].mean(axis=0), n_recommendations, n_probe,
+                lambda candidates: values.iloc[candidates].isin(query_values).to_numpy()
+            )
+        return self._restore(self.df[RecommendationEngine.OUTPUT_COLUMNS].iloc[positions])
+    
+    @instrumented
+    def recommend_similar_books(self, query_value, attribute='title', n_recommendations=5,
+                                match='substring', numeric_weight=0.0):
+        """
+        Recommend books with similar titles, authors and publishers.
+        
+        Books matching the query are found as in recommend_books and scored
+        against the catalog by TF-IDF cosine similarity of their text fields
+        (see get_text_index). Only books sharing at least one term with the
+        matching books are candidates, and the matching books themselves are
+        excluded.
+        
+        Parameters:
+        - query_value: Value to base recommendations on (e.g., a title)
+        - attribute: Attribute to query on ('title', 'authors', etc.)
+        - n_recommendations: Number of recommendations to return
+        - match: 'substring' pattern search, or 'exact'/'prefix' author index
+          lookup (only with attribute='authors')
+        - numeric_weight: Share of the score taken from the cosine similarity
+          of the numeric features used by recommend_books, between 0 and 1
+        
+        Returns:
+        - DataFrame of recommended books with a 'similarity' column
+        """
+        if not 0 <= numeric_weight <= 1:
+            raise ValueError(f"numeric_weight must be between 0 and 1, got {numeric_weight}")
+        if attribute == 'authors' and match != 'substring':
+            query_positions = self.get_author_index().lookup(query_value, match)
+        elif match == 'substring':
+            values = self._columns([attribute])[attribute]
+            query_positions = np.flatnonzero(values.str.contains(query_value, case=False, na=False))
+        else:
+            raise ValueError(f"match={match!r} is only supported for attribute='authors'")
+        
+        if len(query_positions) == 0:
+            return pd.DataFrame()
+        
+        text_index = self.get_text_index()
+        with stage('similarity') as record:
+            positions, scores = text_index.similarity(query_positions)
+            record['rows'] = len(positions)
+        if numeric_weight > 0 and len(positions) > 0:
+            unit_features = self.get_recommender().unit_features
+            centroid = unit_features[query_positions].mean(axis=0)
+            scores = (1 - numeric_weight) * scores + numeric_weight * (unit_features[positions] @ centroid)
+        
+        # Books with the queried value all matched the query themselves
+        positions, scores = TextIndex.top_k(positions, scores, n_recommendations, exclude=query_positions)
+        recommendations = self.df[RecommendationEngine.OUTPUT_COLUMNS].iloc[positions]
+        return self._restore(recommendations).assign(similarity=scores)
+    
+    @instrumented
+    def recommend_books_batch(self, queries, n_recommendations=5):
         """
-        # Find books matching the query
-        query_books = self.df[self.df[attribute].str.contains(query_value, case=False, na=False)]
+        Recommend books for many queries at once.
+        
+        Each distinct attribute value is matched against a query only once,
+        and all queries are scored against the catalog in a single vectorized
+        pass. Books whose attribute value matched a query are excluded from
+        that query's recommendations, as in recommend_books.
         
-        if len(query_books) == 0:
+        Parameters:
+        - queries: Iterable of (query_value, attribute) pairs
+        - n_recommendations: Number of recommendations per query
+        
+        Returns:
+        - DataFrame of recommendations indexed by (query, attribute, book index)
+        """
+        from scipy import sparse
+        
+        queries = list(dict.fromkeys(tuple(query) for query in queries))
+        if len(queries) == 0:
             return pd.DataFrame()
         
-        # Create feature matrix
-        features = ['average_rating', 'ratings_count', 'num_pages']
-        feature_matrix = self.df[features].fillna(0)
+        rows, cols = [], []
+        for attribute in dict.fromkeys(attribute for _, attribute in queries):
+            query_ids = [i for i, (_, query_attribute) in enumerate(queries) if query_attribute == attribute]
+            codes, uniques = pd.factorize(self._columns([attribute])[attribute])
+            matched = match_values(uniques, [queries[i][0] for i in query_ids])
+            # Trailing False column so missing values (code -1) never match
+            matched = np.hstack([matched, np.zeros((len(query_ids), 1), dtype=bool)])
+            for query_id, query_matched in zip(query_ids, matched):
+                positions = np.flatnonzero(query_matched[codes])
+                rows.append(np.full(len(positions), query_id))
+                cols.append(positions)
+        
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        query_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, cols)),
+            shape=(len(queries), len(self.df))
+        )
+        recommender = self.get_recommender()
+        with stage('similarity'):
+            results = recommender.recommend_batch(query_matrix, n_recommendations)
+        
+        query_ids = np.repeat(np.arange(len(queries)), [len(positions) for positions in results])
+        if len(query_ids) == 0:
+            return pd.DataFrame()
+        recommendations = self.df.iloc[np.concatenate(results)][RecommendationEngine.OUTPUT_COLUMNS]
+        keys = [queries[query_id] for query_id in query_ids]
+        recommendations.index = pd.MultiIndex.from_arrays(
+            [[key[0] for key in keys], [key[1] for key in keys], recommendations.index],
+            names=['query', 'attribute', None]
+        )
+        return self._restore(recommendations)
+    
+    @instrumented
+    def find_author_books(self, author_name, match='substring'):
+        """
+        Get the books credited to an author.
+        
+        Parameters:
+        - author_name: Author name or pattern
+        - match: 'substring' for a case-insensitive pattern search of the raw
+          authors column, 'exact' or 'prefix' for an author index lookup
+        """
+        if match == 'substring':
+            authors = self._columns(['authors'])['authors']
+            return self._restore(self.df[authors.str.contains(author_name, case=False, na=False)])
+        return self._restore(self.df.iloc[self.get_author_index().lookup(author_name, match)])
+    
+    def cache_info(self):
+        """
+        Get result cache statistics.
+        
+        Returns:
+        - Dict with 'hits', 'misses', current 'size' and 'maxsize'
+        """
+        return self.result_cache.info()
+    
+    def profile(self, mode='cprofile', top=20, output=None):
+        """
+        Profile a block of calls with cProfile or tracemalloc.
+        
+        Usage:
+            with analyzer.profile('tracemalloc', output='hotspots.txt') as result:
+                analyzer.recommend_books('Tolkien')
+            result.hotspots
+        
+        Parameters:
+        - mode: 'cprofile' (time per function) or 'tracemalloc' (memory
+          allocated per source line and the peak)
+        - top: Number of hotspots kept
+        - output: Optional path or file the hotspot listing is written to
+        
+        Returns:
+        - Context manager yielding a Profile, filled in when the block exits
+        """
+        return profile(mode, top=top, output=output)
+    
+    def clear_cache(self):
+        """
+        Drop cached query results and everything derived from the data.
+        
+        Call after editing self.df in place: the query engine, author index
+        and tables, recommender and text and ANN indexes are rebuilt from the
+        edited frame on their next use.
+        """
+        self._data_version += 1
+        self.result_cache.clear()
+    
+    def _is_current(self, cached):
+        """Whether a (data version, value) cache entry matches the current data."""
+        return cached is not None and cached[0] == self._data_version
+    
+    def get_author_index(self):
+        """Get the author inverted index, rebuilding it if the data changed."""
+        if not self._is_current(self._author_index):
+            with stage('build.author_index'):
+                self._author_index = (self._data_version, AuthorIndex(self.df['authors']))
+        return self._author_index[1]
+    
+    def get_author_table(self, split_authors=False):
+        """
+        Get the per-author aggregate table, rebuilding it if the data changed.
+        
+        Parameters:
+        - split_authors: One row per individual author instead of per raw
+          author string
+        """
+        if not self._is_current(self._author_tables.get(split_authors)):
+            with stage('build.author_table'):
+                books = self._columns(['authors', *AUTHOR_TABLE_COLUMNS])
+                table = AuthorTable.build(books, self.get_author_index() if split_authors else None)
+                self._author_tables[split_authors] = (self._data_version, table)
+        return self._author_tables[split_authors][1]
+    
+    def get_query_engine(self):
+        """Get the NumPy query engine, rebuilding it if the data changed."""
+        if not self._is_current(self._query_engine):
+            with stage('build.query_engine'):
+                self._query_engine = (self._data_version, QueryEngine(self._columns(QueryEngine.COLUMNS)))
+        return self._query_engine[1]
+    
+    def get_recommender(self):
+        """Get the cached recommendation engine, rebuilding it if the data changed."""
+        if not self._is_current(self._recommender):
+            with stage('build.recommender'):
+                features = self._columns(RecommendationEngine.FEATURES)
+                self._recommender = (self._data_version, RecommendationEngine(self.df, features=features))
+        recommender = self._recommender[1]
+        recommender.df = self.df
+        return recommender
+    
+    def _feature_fingerprint(self):
+        """Identify the recommendation features an ANN index is built from."""
+        recommender = self.get_recommender()
+        return {'n_rows': recommender.n_rows, 'mean': recommender.scaler.mean_.tolist(),
+                'scale': recommender.scaler.scale_.tolist()}
+    
+    def get_ann_index(self):
+        """
+        Get the approximate nearest-neighbour index of the recommendation
+        features, building it if the data changed.
+        
+        The index (src/ann_index.py) partitions the standardized, unit
+        length features used by recommend_books into cells. Books appended
+        after it was built are scored exactly until it is rebuilt.
+        """
+        if not self._is_current(self._ann_index):
+            self.build_ann_index()
+        return self._ann_index[1]
+    
+    @instrumented
+    def build_ann_index(self, n_lists=None, path=None):
+        """
+        Build the approximate nearest-neighbour index.
+        
+        Parameters:
+        - n_lists: Number of cells, default the square root of the number
+          of books
+        - path: Optional directory to save the index to, for load_ann_index
+        
+        Returns:
+        - The IVFIndex
+        """
+        recommender = self.get_recommender()
+        index = IVFIndex.build(recommender.unit_features, n_lists=n_lists, metadata=self._feature_fingerprint())
+        if path is not None:
+            index.save(path)
+        self._ann_index = (self._data_version, index)
+        self._ann_updated = np.empty(0, dtype=np.intp)
+        return index
+    
+    def load_ann_index(self, path, mmap=True):
+        """
+        Use an index saved by build_ann_index(path=...), memory-mapped.
+        
+        Parameters:
+        - path: Directory the index was saved to
+        - mmap: Memory-map the index files instead of reading them
+        
+        Returns:
+        - The IVFIndex
+        
+        Raises:
+        - ValueError: If the index was built from different data
+        """
+        index = IVFIndex.load(path, mmap=mmap)
+        if index.metadata != self._feature_fingerprint():
+            raise ValueError(f"The index in {path} was built from different data")
+        self._ann_index = (self._data_version, index)
+        self._ann_updated = np.empty(0, dtype=np.intp)
+        return index
+    
+    def _search_ann_index(self, query, k, n_probe, exclude):
+        """Row positions of the approximate top k, including rows appended or updated since the build."""
+        index = self.get_ann_index()
+        updated = self._ann_updated
+        if len(updated):
+            # The index holds the old vectors of updated rows
+            positions, scores = index.search(query, k, n_probe,
+                                             lambda candidates: exclude(candidates) | np.isin(candidates, updated))
+        else:
+            positions, scores = index.search(query, k, n_probe, exclude)
+        recommender = self.get_recommender()
+        if recommender.n_rows > index.n_rows or len(updated):
+            exact = np.concatenate([updated, np.arange(index.n_rows, recommender.n_rows)])
+            exact = exact[~exclude(exact)]
+            positions = np.concatenate([positions, exact])
+            scores = np.concatenate([scores, recommender.unit_features[exact] @ query])
+            best = RecommendationEngine.top_k(scores, k)
+            positions = positions[best]
+        return positions
+    
+    def evaluate_ann_index(self, k=10, n_queries=200, n_probes=(1, 2, 4, 8, 16, 32), seed=0):
+        """
+        Report recall@k and latency of the ANN index against exact search.
+        
+        Parameters:
+        - k: Number of recommendations per query
+        - n_queries: Number of random single-book queries
+        - n_probes: n_probe settings to evaluate
+        - seed: Random seed for the query books
         
-        # Standardize features
-        scaler = StandardScaler()
-        scaled_features = scaler.fit_transform(feature_matrix)
+        Returns:
+        - DataFrame with one row for exact search and one per n_probe
+        """
+        index = self.get_ann_index()
+        vectors = self.get_recommender().unit_features[:index.n_rows]
+        return evaluate_recall(index, vectors, k=k, n_queries=n_queries, n_probes=n_probes, seed=seed)
+    
+    def get_text_index(self):
+        """Get the TF-IDF index of the text fields, building it if the data changed."""
+        if not self._is_current(self._text_index):
+            with stage('build.text_index'):
+                columns = [field for field in TextIndex.FIELDS if field in self.df.columns]
+                self._text_index = (self._data_version, TextIndex(self._columns(columns)))
+        return self._text_index[1]
+    
+    def refit_recommender(self):
+        """
+        Refit the recommendation scaler and the TF-IDF vocabulary on all
+        current rows, e.g. after many appends. The ANN index is rebuilt on
+        its next use.
+        """
+        self._recommender = None
+        self._ann_index = None
+        self._text_index = None
+        return self.get_recommender()
+    
+    def _positions_by_key(self, key):
+        """Map of key value to row position, built once and kept up to date."""
+        if not self._is_current(self._key_positions.get(key)):
+            values = self._columns([key])[key]
+            if values.duplicated().any():
+                raise ValueError(f"Cannot upsert on {key!r}: its values are not unique")
+            self._key_positions[key] = (self._data_version, dict(zip(values, range(len(values)))))
+        return self._key_positions[key][1]
+    
+    def _flush_pending(self):
+        """Concatenate rows buffered by append() onto the frame in one step."""
+        if self._codecs:
+            # Only the new rows are encoded; columns they do not fit are widened
+            pending, self._codecs = encode_rows(pd.concat(self._pending), self._df, self._codecs)
+            self._df = pd.concat([self._df, pending])
+        else:
+            self._df = pd.concat([self._df, *self._pending])
+        self._pending = []
+        self._n_pending = 0
+    
+    @instrumented
+    def append(self, rows, key='bookID'):
+        """
+        Insert new books and update existing ones without reloading the data.
         
-        # Calculate similarity
-        similarities = cosine_similarity(scaled_features)
+        Only the given rows are cleaned. Rows whose key is already present
+        replace the existing book in place; the others are buffered and joined
+        onto the frame on its next read. Summary statistics, the author index
+        the author tables, the query engine and the recommendation features
+        are maintained incrementally, so the cost is proportional to the
+        number of new rows. Recommendations keep using the scaler and TF-IDF
+        vocabulary fitted at load time until refit_recommender().
         
-        # Get indices of query books
-        query_indices = query_books.index
+        Parameters:
+        - rows: DataFrame of raw rows in the books.csv schema
+        - key: Column identifying a book, e.g. 'bookID' or 'isbn13'
+        
+        Returns:
+        - Dict with the number of rows inserted and updated
+        """
+        validate_columns(rows)
+        self.result_cache.clear()
+        rows = rows.set_axis(pd.RangeIndex(len(rows)))
+        cleaned = self._conform(clean_books(rows))
+        new_books = cleaned.drop_duplicates(key, keep='last')
+        self.unparseable_dates += cleaned.attrs['unparseable_dates']
         
-        # Calculate average similarity to query books
-        avg_similarities = similarities[query_indices].mean(axis=0)
+        positions_by_key = self._positions_by_key(key)
+        # A dict lookup per new row; Series.map would convert the whole dict
+        existing = np.array([positions_by_key.get(value, -1) for value in new_books[key]], dtype=np.int64)
+        updates = new_books[existing >= 0]
+        inserts = new_books[existing < 0]
         
-        # Get indices of most similar books
-        similar_indices = avg_similarities.argsort()[::-1]
+        # New rows continue the row labels of the file, as in iter_clean_chunks.
+        # Updates and earlier copies of a key take none, as in a file holding
+        # only the final version of each book; rows dropped by cleaning do.
+        if self._next_label is None:
+            self._next_label = self._df.index.max() + 1 if len(self._df) else 0
+        labelled = ~rows.index.isin(cleaned.index.difference(inserts.index))
+        labels = np.cumsum(labelled) - 1 + self._next_label
+        self._next_label += int(labelled.sum())
+        inserts = inserts.set_axis(labels[inserts.index.to_numpy()])
+        
+        if len(updates) > 0:
+            self._update_rows(existing[existing >= 0], updates, key)
+        if len(inserts) > 0:
+            self._insert_rows(inserts, key)
+        return {'inserted': len(inserts), 'updated': len(updates)}
+    
+    def _conform(self, books):
+        """Cast new cleaned rows to the dtypes of the existing columns where possible."""
+        dtypes = self._restore(self._df.head(0)).dtypes
+        for col in books.columns:
+            if col in dtypes and books[col].dtype != dtypes[col]:
+                try:
+                    books[col] = books[col].astype(dtypes[col])
+                except (ValueError, TypeError):
+                    pass
+        return books
+    
+    def _update_rows(self, positions, updates, key):
+        """Overwrite existing rows in place and adjust derived state."""
+        frame = self.df
+        old = self._restore(frame.iloc[positions])
+        updates = updates.set_axis(old.index)
         
-        # Filter out books by the same author/attribute
-        recommendations = []
-        for idx in similar_indices:
-            if len(recommendations) >= n_recommendations:
-                break
-            if self.df.iloc[idx][attribute] not in query_books[attribute].values:
-                recommendations.append(idx)
+        columns = [col for col in updates.columns if col in old.columns]
+        values = updates[columns]
+        if self._codecs:
+            # Only the new values are encoded; columns they do not fit are widened
+            values, self._codecs = encode_rows(values, frame, self._codecs)
+        for col in columns:
+            frame.iloc[positions, frame.columns.get_loc(col)] = values[col].to_numpy()
         
-        return self.df.iloc[recommendations][['title', 'authors', 'average_rating', 'ratings_count']]
\ No newline at end of file
+        if self._is_current(self._recommender):
+            self._recommender[1].update(positions, updates[RecommendationEngine.FEATURES])
+        if self._is_current(self._query_engine):
+            self._query_engine[1].update(positions, updates[QueryEngine.COLUMNS])
+        if self._is_current(self._ann_index):
+            # Updated books may belong in other cells; score them exactly until the rebuild
+            self._ann_updated = np.union1d(self._ann_updated, positions)
+        changed = old['authors'].to_numpy() != updates['authors'].to_numpy()
+        if self._is_current(self._author_index) and changed.any():
+            self._author_index[1].update(positions[changed], updates['authors'][changed])
+        for cached in self._author_tables.values():
+            if self._is_current(cached):
+                cached[1].update(positions, old[['authors', *AUTHOR_TABLE_COLUMNS]], self._author_table_books,
+                                 self.get_author_index())
+        text_fields = [field for field in TextIndex.FIELDS if field in columns]
+        changed = (old[text_fields] != updates[text_fields]).any(axis=1).to_numpy()
+        if self._is_current(self._text_index) and changed.any():
+            self._text_index[1].update(positions[changed], updates[text_fields][changed])
+        for other in list(self._key_positions):
+            if other != key and other in columns:
+                self._update_key_positions(other, positions, old[other], updates[other])
+    
+    def _author_table_books(self, positions):
+        """Rows at positions with the columns the author tables aggregate."""
+        return self._restore(self.df.iloc[positions])[['authors', *AUTHOR_TABLE_COLUMNS]]
+    
+    def _update_key_positions(self, key, positions, old, new):
+        """Move replaced rows to their new key values in a key map, or drop it on a clash."""
+        positions_by_key = self._key_positions[key][1]
+        for value, position in zip(old, positions):
+            if positions_by_key.get(value) == position:
+                del positions_by_key[value]
+        for value, position in zip(new, positions):
+            if positions_by_key.setdefault(value, position) != position:
+                # Rebuilt, and reported as not unique, on its next use
+                del self._key_positions[key]
+                return
+    
+    def _insert_rows(self, inserts, key):
+        """Buffer new rows for the next read and extend derived state."""
+        n_rows = len(self._df) + self._n_pending
+        if self.edition_map is not None:
+            # New rows are works with a single edition, their own
+            self.edition_map.extend(inserts.index.to_numpy())
+            self._pending_editions.append(inserts.reindex(columns=self._editions.columns))
+        inserts = inserts.reindex(columns=self._df.columns)
+        if self.edition_map is not None:
+            inserts['n_editions'] = 1
+
+        self._pending.append(inserts)
+        self._n_pending += len(inserts)
+        if self._is_current(self._recommender):
+            self._recommender[1].append(inserts[RecommendationEngine.FEATURES])
+        if self._is_current(self._query_engine):
+            self._query_engine[1].append(inserts[QueryEngine.COLUMNS])
+        if self._is_current(self._author_index):
+            self._author_index[1].extend(inserts['authors'])
+        for cached in self._author_tables.values():
+            if self._is_current(cached):
+                cached[1].extend(inserts, n_rows)
+        if self._is_current(self._text_index):
+            self._text_index[1].extend(inserts)
+        positions_by_key = self._key_positions[key][1]
+        positions_by_key.update(zip(inserts[key], range(n_rows, n_rows + len(inserts))))
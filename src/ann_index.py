@@ -0,0 +1,238 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+
+def _best(positions, scores, k):
+    """The k best-scoring positions, best first, ties in favour of the later row."""
+    if k < len(positions):
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        selected = scores >= kth
+        positions, scores = positions[selected], scores[selected]
+    order = np.lexsort((-positions, -scores))[:k]
+    return positions[order], scores[order]
+
+class IVFIndex:
+    """Inverted-file index for approximate top-k inner product search.
+
+    Unit feature vectors are partitioned into ``n_lists`` cells with
+    spherical k-means, and stored cell by cell. A query ranks the cell
+    centres by their inner product with the query vector and scores only the
+    rows of the ``n_probe`` best cells exactly. Probing more cells raises
+    recall and latency; probing every cell gives the exact result.
+
+    The index is saved as a directory of .npy files and memory-mapped on
+    load, so opening it is instant and queries read only the probed cells.
+    """
+
+    def __init__(self, centers, offsets, positions, vectors, metadata=None):
+        """
+        Args:
+            centers (np.ndarray): (n_lists, dim) unit cell centres
+            offsets (np.ndarray): Start of each cell in positions/vectors,
+                with a final entry equal to n_rows
+            positions (np.ndarray): Row positions grouped by cell
+            vectors (np.ndarray): Vectors of those rows, in the same order
+            metadata (dict, optional): JSON-serializable data saved with the
+                index, e.g. a fingerprint of the features it was built from
+        """
+        self.centers = centers
+        self.offsets = offsets
+        self.positions = positions
+        self.vectors = vectors
+        self.metadata = metadata or {}
+
+    @property
+    def n_rows(self):
+        return len(self.positions)
+
+    @property
+    def n_lists(self):
+        return len(self.centers)
+
+    def __len__(self):
+        return self.n_rows
+
+    @staticmethod
+    def _assign(vectors, centers, block_rows=65536):
+        """Index of the centre with the largest inner product, per vector."""
+        labels = np.empty(len(vectors), dtype=np.intp)
+        for start in range(0, len(vectors), block_rows):
+            labels[start:start + block_rows] = np.argmax(vectors[start:start + block_rows] @ centers.T, axis=1)
+        return labels
+
+    @classmethod
+    def build(cls, vectors, n_lists=None, n_iter=10, sample_size=100_000, seed=0, metadata=None):
+        """
+        Cluster unit vectors and build the index.
+
+        Args:
+            vectors (np.ndarray): (n_rows, dim) unit vectors
+            n_lists (int, optional): Number of cells, default sqrt(n_rows)
+            n_iter (int): k-means iterations
+            sample_size (int): Rows the centres are fitted on; every row is
+                then assigned to its nearest centre
+            seed (int): Random seed for the sample and initial centres
+            metadata (dict, optional): Stored with the index
+
+        Returns:
+            IVFIndex: The built index
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        n_rows = len(vectors)
+        if n_rows == 0:
+            raise ValueError("Cannot build an index of zero rows")
+        n_lists = max(1, min(n_rows, n_lists or int(np.sqrt(n_rows))))
+        rng = np.random.default_rng(seed)
+
+        sample = vectors[rng.choice(n_rows, min(n_rows, max(sample_size, n_lists)), replace=False)]
+        centers = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(n_iter):
+            labels = cls._assign(sample, centers)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            # Cells that lost every point restart from a random sample row
+            empty = norms == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            norms[empty] = np.linalg.norm(sums[empty], axis=1)
+            centers = sums / np.maximum(norms, np.finfo(np.float32).tiny)[:, None]
+
+        labels = cls._assign(vectors, centers)
+        order = np.argsort(labels, kind='stable')
+        offsets = np.searchsorted(labels[order], np.arange(n_lists + 1))
+        return cls(centers.astype(np.float32), offsets, order.astype(np.int64), vectors[order], metadata)
+
+    def save(self, path):
+        """
+        Write the index to a directory, replacing any index already there.
+
+        Args:
+            path (str): Directory to write
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in ('centers', 'offsets', 'positions', 'vectors'):
+            tmp_path = os.path.join(path, f"{name}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, np.asarray(getattr(self, name)))
+            os.replace(tmp_path, os.path.join(path, f"{name}.npy"))
+        meta = {'format': FORMAT_VERSION, 'n_rows': self.n_rows, 'n_lists': self.n_lists,
+                'metadata': self.metadata}
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Open an index written by save().
+
+        Args:
+            path (str): Directory written by save()
+            mmap (bool): Memory-map the row positions and vectors instead of
+                reading them into memory
+
+        Returns:
+            IVFIndex: The loaded index
+        """
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format in {path}: {meta.get('format')}")
+        mmap_mode = 'r' if mmap else None
+        index = cls(
+            np.load(os.path.join(path, 'centers.npy')),
+            np.load(os.path.join(path, 'offsets.npy')),
+            np.load(os.path.join(path, 'positions.npy'), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, 'vectors.npy'), mmap_mode=mmap_mode),
+            meta['metadata']
+        )
+        if index.n_rows != meta['n_rows'] or index.n_lists != meta['n_lists']:
+            raise ValueError(f"Index files in {path} are inconsistent")
+        return index
+
+    def search(self, query, k, n_probe=8, exclude=None):
+        """
+        Approximate top-k rows by inner product with a query vector.
+
+        Args:
+            query (np.ndarray): (dim,) query vector, e.g. the mean of the
+                unit vectors of the query books
+            k (int): Number of rows to return
+            n_probe (int): Cells to search
+            exclude (callable, optional): Maps candidate row positions to a
+                boolean mask of the rows that must not be returned
+
+        Returns:
+            tuple: (row positions, scores), best first
+        """
+        query = np.asarray(query, dtype=np.float32)
+        n_probe = max(1, min(n_probe, self.n_lists))
+        center_scores = self.centers @ query
+        cells = np.argpartition(center_scores, self.n_lists - n_probe)[self.n_lists - n_probe:]
+
+        positions = np.concatenate([self.positions[self.offsets[cell]:self.offsets[cell + 1]] for cell in cells])
+        scores = np.concatenate([self.vectors[self.offsets[cell]:self.offsets[cell + 1]] @ query
+                                 for cell in cells])
+        if exclude is not None and len(positions) > 0:
+            keep = ~np.asarray(exclude(positions))
+            positions, scores = positions[keep], scores[keep]
+        if k <= 0:
+            return positions[:0], scores[:0]
+        return _best(positions.astype(np.intp), scores, k)
+
+def evaluate_recall(index, vectors, k=10, n_queries=200, n_probes=(1, 2, 4, 8, 16, 32), seed=0):
+    """
+    Measure recall@k and latency of an index against exact search.
+
+    Each query is one random catalog row, excluded from its own results.
+    Exact search scores every row. A returned row counts as a hit when its
+    exact score is at least the k-th best exact score, so rows tied at the
+    cut-off are not counted as misses.
+
+    Args:
+        index (IVFIndex): Index built from vectors
+        vectors (np.ndarray): (n_rows, dim) vectors the index was built on
+        k (int): Number of results per query
+        n_queries (int): Number of random query rows
+        n_probes (iterable): Settings of n_probe to evaluate
+        seed (int): Random seed for the query rows
+
+    Returns:
+        pd.DataFrame: One row per method ('exact' or an n_probe setting)
+        with recall@k and mean/p50/p99 latency in milliseconds
+    """
+    rng = np.random.default_rng(seed)
+    query_rows = rng.choice(len(vectors), min(n_queries, len(vectors)), replace=False)
+
+    def timed(search):
+        latencies, results = [], []
+        for row in query_rows:
+            start = time.perf_counter()
+            results.append(search(row))
+            latencies.append(time.perf_counter() - start)
+        return np.array(latencies) * 1000, results
+
+    def exact_search(row):
+        scores = vectors @ vectors[row]
+        scores[row] = -np.inf
+        return _best(np.arange(len(vectors)), scores, k)
+
+    def summary(method, latencies, recall):
+        return {'method': method, f'recall@{k}': round(recall, 4),
+                'mean_ms': round(float(latencies.mean()), 3),
+                'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+                'p99_ms': round(float(np.percentile(latencies, 99)), 3)}
+
+    exact_latencies, exact_results = timed(exact_search)
+    cutoffs = np.array([scores[-1] if len(scores) else np.inf for _, scores in exact_results])
+    rows = [summary('exact', exact_latencies, 1.0)]
+
+    for n_probe in n_probes:
+        latencies, results = timed(lambda row: index.search(
+            vectors[row], k, n_probe, exclude=lambda positions: positions == row))
+        hits = [np.sum(vectors[positions] @ vectors[row] >= cutoff - 1e-6)
+                for row, (positions, _), cutoff in zip(query_rows, results, cutoffs)]
+        rows.append(summary(f'n_probe={n_probe}', latencies, float(np.mean(hits)) / k))
+    return pd.DataFrame(rows).set_index('method')
@@ -0,0 +1,178 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.author_index import normalize_author
+
+SUMMARY_COLUMNS = ['num_books', 'avg_rating', 'total_ratings', 'avg_pages', 'most_rated_book', 'highest_rated_book']
+PERFORMANCE_COLUMNS = ['title', 'publication_date', 'average_rating', 'ratings_count']
+
+# Input arrays, one entry per (author, book) pair grouped by author
+_INPUTS = ['group', 'position', 'average_rating', 'ratings_count', 'num_pages', 'publication_date', 'starts']
+# Output arrays: one entry per author, except 'order' (one per pair)
+_OUTPUTS = {'avg_rating': np.float64, 'total_ratings': np.int64, 'avg_pages': np.float64,
+            'most_rated': np.int64, 'highest_rated': np.int64, 'order': np.int64}
+
+# Memory-mapped arrays of the current run, opened once per worker process
+_arrays = None
+
+# Files in a tmpfs such as /dev/shm live in shared memory and never hit disk
+SHARED_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+def _open_arrays(directory):
+    global _arrays
+    _arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+               for name in _INPUTS}
+    _arrays.update({name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r+')
+                    for name in _OUTPUTS})
+
+def _group_argmax(values, groups, bounds):
+    """
+    Index of the first largest value in each group, skipping NaN like idxmax.
+
+    Groups must be contiguous, non-empty and start at ``bounds``.
+    """
+    values = np.where(np.isnan(values), -np.inf, values)
+    is_max = values == np.maximum.reduceat(values, bounds)[groups]
+    candidates = np.flatnonzero(is_max)
+    return candidates[np.r_[True, groups[candidates][1:] != groups[candidates][:-1]]]
+
+def _summarize(arrays, lo, hi):
+    """
+    Aggregate authors lo..hi-1 and order their books by publication date.
+
+    Works on one contiguous range of author groups, writing into the output
+    arrays, so disjoint ranges can be filled by different processes.
+    """
+    start, stop = arrays['starts'][lo], arrays['starts'][hi]
+    if stop == start:
+        return
+    pairs = slice(start, stop)
+    groups = np.asarray(arrays['group'][pairs]) - lo
+    position = np.asarray(arrays['position'][pairs])
+    rating = np.asarray(arrays['average_rating'][pairs])
+    ratings_count = np.asarray(arrays['ratings_count'][pairs])
+    pages = np.asarray(arrays['num_pages'][pairs])
+    n_groups = hi - lo
+    bounds = np.asarray(arrays['starts'][lo:hi]) - start
+
+    # Means skip missing values, as pandas does
+    def mean(values):
+        valid = ~np.isnan(values)
+        with np.errstate(invalid='ignore'):
+            return (np.bincount(groups[valid], values[valid], n_groups)
+                    / np.bincount(groups[valid], minlength=n_groups))
+
+    arrays['avg_rating'][lo:hi] = mean(rating)
+    arrays['avg_pages'][lo:hi] = mean(pages)
+    arrays['total_ratings'][lo:hi] = np.bincount(groups, ratings_count, n_groups).round().astype(np.int64)
+    # Pairs of an author are in row order, so the first maximum is the earliest row
+    arrays['most_rated'][lo:hi] = position[_group_argmax(ratings_count, groups, bounds)]
+    arrays['highest_rated'][lo:hi] = position[_group_argmax(rating, groups, bounds)]
+    # lexsort is stable, so books published the same day stay in row order
+    arrays['order'][pairs] = start + np.lexsort((np.asarray(arrays['publication_date'][pairs]), groups))
+
+def _summarize_shard(lo, hi):
+    _summarize(_arrays, lo, hi)
+    for name in _OUTPUTS:
+        _arrays[name].flush()
+
+def _select_authors(author_index, authors):
+    """Author codes to report, in the requested order, skipping unknown authors."""
+    keys = author_index.keys
+    if authors is None:
+        return np.arange(len(keys))
+    wanted = pd.unique(pd.Series([normalize_author(name) for name in authors], dtype=object))
+    found = np.searchsorted(keys, wanted)
+    found = np.minimum(found, len(keys) - 1)
+    return found[keys[found] == wanted] if len(keys) else found[:0]
+
+def author_analytics(df, author_index, authors=None, workers=1, min_pairs_per_shard=50_000):
+    """
+    Summarize and chart many authors in one pass.
+
+    Every individual author of the '/'-separated author lists is reported,
+    with the same statistics as create_author_summary(..., match='exact')
+    and the same book listing as analyze_author_performance(..., 'exact').
+
+    The numeric columns are gathered once into arrays with one entry per
+    (author, book) pair, grouped by author, so the statistics are a handful
+    of grouped reductions. With several workers the authors are split into
+    contiguous shards handled by a process pool. The input and output arrays
+    are memory-mapped files in SHARED_DIR (/dev/shm where available), so
+    workers share them instead of receiving pickled copies.
+
+    Args:
+        df (pd.DataFrame): Book data with title, average_rating,
+            ratings_count, num_pages and publication_date columns, in the
+            row order author_index was built from
+        author_index (AuthorIndex): Index over df['authors']
+        authors (iterable, optional): Author names to report; default all.
+            Unknown names are skipped.
+        workers (int): Processes to use; 1 computes in this process
+        min_pairs_per_shard (int): Smallest shard worth sending to a worker
+
+    Returns:
+        tuple: (summaries, performance). summaries is a DataFrame indexed by
+        author with SUMMARY_COLUMNS. performance lists each author's books
+        by publication date with PERFORMANCE_COLUMNS, indexed by (author,
+        book index).
+    """
+    codes = _select_authors(author_index, authors)
+    offsets = np.searchsorted(author_index.author_codes, np.arange(len(author_index) + 1))
+    counts = offsets[codes + 1] - offsets[codes]
+    starts = np.r_[0, np.cumsum(counts)]
+    # Pairs of the selected authors, grouped in the requested order
+    pair_index = np.repeat(offsets[codes] - starts[:-1], counts) + np.arange(starts[-1])
+    positions = author_index.positions[pair_index]
+
+    dates = df['publication_date'].to_numpy().view(np.int64)
+    # Missing dates sort last, as in sort_values
+    dates = np.where(dates == np.iinfo(np.int64).min, np.iinfo(np.int64).max, dates)
+    inputs = {
+        'group': np.repeat(np.arange(len(codes)), counts),
+        'position': positions,
+        'average_rating': df['average_rating'].to_numpy(dtype=np.float64, na_value=np.nan)[positions],
+        'ratings_count': df['ratings_count'].to_numpy(dtype=np.float64, na_value=np.nan)[positions],
+        'num_pages': df['num_pages'].to_numpy(dtype=np.float64, na_value=np.nan)[positions],
+        'publication_date': dates[positions],
+        'starts': starts
+    }
+
+    n_shards = min(len(codes), workers * 4, max(1, len(positions) // min_pairs_per_shard))
+    if workers <= 1 or n_shards <= 1:
+        outputs = {name: np.empty(len(positions) if name == 'order' else len(codes), dtype=dtype)
+                   for name, dtype in _OUTPUTS.items()}
+        _summarize({**inputs, **outputs}, 0, len(codes))
+    else:
+        with tempfile.TemporaryDirectory(prefix='author-analytics-', dir=SHARED_DIR) as directory:
+            for name, values in inputs.items():
+                np.save(os.path.join(directory, f"{name}.npy"), values)
+            for name, dtype in _OUTPUTS.items():
+                np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode='w+', dtype=dtype,
+                                          shape=(len(positions) if name == 'order' else len(codes),))
+            # Shards hold about the same number of pairs
+            bounds = np.unique(np.searchsorted(starts, np.linspace(0, len(positions), n_shards + 1)))
+            bounds[-1] = len(codes)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_open_arrays,
+                                     initargs=(directory,)) as pool:
+                list(pool.map(_summarize_shard, bounds[:-1], bounds[1:]))
+            outputs = {name: np.load(os.path.join(directory, f"{name}.npy")) for name in _OUTPUTS}
+
+    names = pd.Index(author_index.names[codes], name='author')
+    titles = df['title']
+    summaries = pd.DataFrame({
+        'num_books': counts,
+        'avg_rating': outputs['avg_rating'],
+        'total_ratings': outputs['total_ratings'],
+        'avg_pages': outputs['avg_pages'],
+        'most_rated_book': titles.iloc[outputs['most_rated']].to_numpy(),
+        'highest_rated_book': titles.iloc[outputs['highest_rated']].to_numpy()
+    }, index=names)
+
+    ordered = positions[outputs['order']]
+    performance = df[PERFORMANCE_COLUMNS].iloc[ordered]
+    performance.index = pd.MultiIndex.from_arrays(
+        [np.repeat(names.to_numpy(), counts), performance.index], names=['author', None])
+    return summaries, performance
@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+
+
+def normalize_author(name):
+    """Normalize an author name for lookups: collapse whitespace and casefold."""
+    return ' '.join(str(name).split()).casefold()
+
+class _Segment:
+    """Sorted (author, position) pairs for a contiguous range of rows."""
+
+    def __init__(self, pairs):
+        key_codes, keys = pd.factorize(pairs['key'], sort=True)
+        self.keys = np.asarray(keys, dtype=object)
+        # Display each author with the spelling of their first listed book
+        first_seen = ~pd.Series(key_codes).duplicated().to_numpy()
+        self.names = np.empty(len(self.keys), dtype=object)
+        self.names[key_codes[first_seen]] = pairs['name'].to_numpy()[first_seen]
+
+        order = np.lexsort((pairs['position'].to_numpy(), key_codes))
+        self.author_codes = key_codes[order]
+        self.positions = pairs['position'].to_numpy()[order]
+        self.offsets = np.searchsorted(self.author_codes, np.arange(len(self.keys) + 1))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def pairs(self):
+        return pd.DataFrame({
+            'key': self.keys[self.author_codes],
+            'name': self.names[self.author_codes],
+            'position': self.positions
+        }).sort_values('position', kind='stable')
+
+    def without(self, positions):
+        """A copy without the pairs of the given rows, or None if it has none."""
+        removed = np.isin(self.positions, positions)
+        if not removed.any():
+            return None
+        segment = _Segment.__new__(_Segment)
+        keep = ~removed
+        # Authors left without books are dropped and the codes renumbered
+        counts = np.bincount(self.author_codes[keep], minlength=len(self.keys))
+        kept_keys = counts > 0
+        segment.keys = self.keys[kept_keys]
+        segment.names = self.names[kept_keys]
+        segment.author_codes = (np.cumsum(kept_keys) - 1)[self.author_codes[keep]]
+        segment.positions = self.positions[keep]
+        segment.offsets = np.searchsorted(segment.author_codes, np.arange(len(segment.keys) + 1))
+        return segment
+
+    def lookup(self, key, match):
+        lo = np.searchsorted(self.keys, key, side='left')
+        if match == 'exact':
+            hi = lo + 1 if lo < len(self.keys) and self.keys[lo] == key else lo
+        else:
+            hi = np.searchsorted(self.keys, key + '\U0010ffff', side='left')
+        return self.positions[self.offsets[lo]:self.offsets[hi]], hi - lo
+
+class AuthorIndex:
+    """Inverted index from individual authors to the rows that credit them.
+
+    The ``authors`` column holds '/'-separated lists such as
+    'J.K. Rowling/Mary GrandPré'. Every listed author is normalized and
+    mapped to the row positions of their books, so exact and prefix lookups
+    cost O(log A + matches) instead of a scan over every row.
+
+    Rows appended later go into small sorted segments that are merged
+    pairwise as they grow, so extending the index costs time proportional
+    to the new rows (amortized) rather than to the whole catalog.
+    """
+
+    SEPARATOR = '/'
+    MATCH_MODES = ('exact', 'prefix')
+
+    def __init__(self, authors):
+        """
+        Build the index from an authors column.
+
+        Args:
+            authors (pd.Series): '/'-separated author lists, one per row
+        """
+        self._segments = [_Segment(self._pairs(authors, 0))]
+        self.n_rows = len(authors)
+
+    @classmethod
+    def from_pairs(cls, pairs, n_rows):
+        """
+        Build the index from (key, name, position) pairs made by _pairs.
+
+        Lets the pairs of separate parts of a catalog be computed in
+        parallel, with positions shifted to the part's first row.
+
+        Args:
+            pairs (pd.DataFrame): Pairs of every row
+            n_rows (int): Number of rows indexed
+        """
+        index = cls.__new__(cls)
+        index._segments = [_Segment(pairs)]
+        index.n_rows = n_rows
+        return index
+
+    @classmethod
+    def _pairs(cls, authors, offset):
+        """One (key, name, position) row per distinct author of each book."""
+        names = (pd.Series(authors, dtype=object)
+                 .reset_index(drop=True)
+                 .fillna('')
+                 .str.split(cls.SEPARATOR)
+                 .explode())
+        names = names.str.split().str.join(' ')
+        names = names[names.str.len() > 0]
+
+        return pd.DataFrame({
+            'key': names.str.casefold().to_numpy(dtype=object),
+            'name': names.to_numpy(dtype=object),
+            'position': names.index.to_numpy(dtype=np.int64) + offset
+        }).drop_duplicates(['key', 'position'])
+
+    def extend(self, authors):
+        """
+        Index rows appended after the current last row.
+
+        Args:
+            authors (pd.Series): Author lists of the new rows
+        """
+        self._add_segment(_Segment(self._pairs(authors, self.n_rows)))
+        self.n_rows += len(authors)
+
+    def update(self, positions, authors):
+        """
+        Re-index existing rows whose authors changed.
+
+        Their old pairs are removed from the segments holding them and their
+        new pairs are added as a segment, merged as in extend().
+
+        Args:
+            positions (array-like): Row positions of the changed rows
+            authors (pd.Series): New author lists of those rows
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        for i, segment in enumerate(self._segments):
+            replaced = segment.without(positions)
+            if replaced is not None:
+                self._segments[i] = replaced
+        pairs = self._pairs(authors, 0)
+        pairs['position'] = positions[pairs['position'].to_numpy()]
+        self._add_segment(_Segment(pairs))
+
+    def _add_segment(self, segment):
+        """Add a segment, merging while the newer one is at least half the older one."""
+        self._segments.append(segment)
+        while len(self._segments) > 1 and 2 * len(self._segments[-1]) >= len(self._segments[-2]):
+            newer = self._segments.pop()
+            older = self._segments.pop()
+            pairs = pd.concat([older.pairs(), newer.pairs()]).sort_values('position', kind='stable')
+            self._segments.append(_Segment(pairs))
+
+    def _consolidated(self):
+        """The single segment covering every row, merging segments if needed."""
+        if len(self._segments) > 1:
+            pairs = pd.concat([segment.pairs() for segment in self._segments])
+            # Updated rows may sit in later segments than rows after them
+            self._segments = [_Segment(pairs.sort_values('position', kind='stable'))]
+        return self._segments[0]
+
+    @property
+    def keys(self):
+        return self._consolidated().keys
+
+    @property
+    def names(self):
+        return self._consolidated().names
+
+    @property
+    def author_codes(self):
+        return self._consolidated().author_codes
+
+    @property
+    def positions(self):
+        return self._consolidated().positions
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, name, match='exact'):
+        """
+        Row positions of books credited to an author.
+
+        Args:
+            name (str): Author name, compared after normalization
+            match (str): 'exact' for the whole name, 'prefix' for any author
+                whose normalized name starts with ``name``
+
+        Returns:
+            np.ndarray: Sorted row positions
+        """
+        if match not in self.MATCH_MODES:
+            raise ValueError(f"Unknown match mode: {match!r}, expected one of {self.MATCH_MODES}")
+        key = normalize_author(name)
+        results = [segment.lookup(key, match) for segment in self._segments]
+        positions = np.concatenate([found for found, _ in results])
+        if len(results) > 1 or results[0][1] > 1:
+            positions = np.unique(positions)
+        return positions
+
+    def lookup_keys(self, keys):
+        """
+        Row positions of books credited to any of several authors.
+
+        Args:
+            keys (array-like): Normalized author names, as in self.keys
+
+        Returns:
+            np.ndarray: Sorted distinct row positions
+        """
+        keys = np.asarray(keys, dtype=object)
+        found = []
+        for segment in self._segments:
+            codes = np.searchsorted(segment.keys, keys)
+            hit = codes < len(segment.keys)
+            hit[hit] = segment.keys[codes[hit]] == keys[hit]
+            starts, ends = segment.offsets[codes[hit]], segment.offsets[codes[hit] + 1]
+            # Concatenated ranges [start, end) of every found author
+            lengths = ends - starts
+            found.append(segment.positions[np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+                                           + np.arange(lengths.sum())])
+        return np.unique(np.concatenate(found))
+
+    def book_counts(self):
+        """
+        Number of books per individual author.
+
+        Returns:
+            pd.Series: Counts indexed by author display name
+        """
+        segment = self._consolidated()
+        return pd.Series(np.diff(segment.offsets), index=segment.names, name='count')
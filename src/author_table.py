@@ -0,0 +1,365 @@
+import numpy as np
+import pandas as pd
+from src.author_analytics import _group_argmax
+from src.author_index import AuthorIndex, _Segment, normalize_author
+
+# Book columns the aggregates are computed from
+INPUT_COLUMNS = ['title', 'average_rating', 'ratings_count', 'num_pages', 'publication_date']
+
+_NAT = np.iinfo(np.int64).min
+_LATEST = np.iinfo(np.int64).max
+
+# Statistics that are sums over an author's books
+_ADDITIVE = ['num_books', 'rating_sum', 'rating_n', 'total_ratings', 'pages_sum', 'pages_n']
+
+def _aggregate(books, keys, names, codes, positions, first_position=0, rows=None):
+    """
+    Mergeable per-author statistics of (author, book) pairs.
+
+    Args:
+        books (pd.DataFrame): INPUT_COLUMNS of consecutive books, the first
+            at row position first_position of the catalog
+        keys (array-like): Sorted distinct author keys
+        names (array-like): Display name of each key
+        codes (np.ndarray): Key code of each pair, sorted
+        positions (np.ndarray): Catalog row position of each pair's book,
+            ascending within each key
+        first_position (int): Row position of books' first row
+        rows (np.ndarray, optional): Row of each pair's book in books, for
+            books that are not consecutive in the catalog
+
+    Returns:
+        pd.DataFrame: One row per key, sorted by key
+    """
+    if rows is None:
+        rows = positions - first_position
+    n_groups = len(keys)
+    bounds = np.searchsorted(codes, np.arange(n_groups))
+
+    rating = books['average_rating'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    ratings_count = books['ratings_count'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    pages = books['num_pages'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    dates = books['publication_date'].to_numpy().view(np.int64)[rows]
+    titles = books['title'].array
+
+    def total(values):
+        return np.bincount(codes, np.nan_to_num(values), n_groups)
+
+    def present(values):
+        return np.bincount(codes, ~np.isnan(values), n_groups)
+
+    most_rated = _group_argmax(ratings_count, codes, bounds)
+    highest_rated = _group_argmax(rating, codes, bounds)
+    with np.errstate(invalid='ignore'):
+        stats = pd.DataFrame({
+            'author': names,
+            'num_books': np.bincount(codes, minlength=n_groups),
+            'rating_sum': total(rating),
+            'rating_n': present(rating),
+            'total_ratings': total(ratings_count),
+            'pages_sum': total(pages),
+            'pages_n': present(pages),
+            'min_pages': np.fmin.reduceat(pages, bounds) if n_groups else pages[:0],
+            'max_pages': np.fmax.reduceat(pages, bounds) if n_groups else pages[:0],
+            'first_published': np.minimum.reduceat(np.where(dates == _NAT, _LATEST, dates), bounds)
+                               if n_groups else dates[:0],
+            'last_published': np.maximum.reduceat(dates, bounds) if n_groups else dates[:0],
+            'most_rated_count': np.nan_to_num(ratings_count[most_rated], nan=-np.inf),
+            'most_rated_book': titles.take(rows[most_rated]),
+            'most_rated_position': positions[most_rated],
+            'highest_rating': np.nan_to_num(rating[highest_rated], nan=-np.inf),
+            'highest_rated_book': titles.take(rows[highest_rated]),
+            'highest_rated_position': positions[highest_rated],
+            'first_position': positions[bounds]
+        }, index=pd.Index(keys, name='key'))
+    stats['first_published'] = stats['first_published'].where(stats['first_published'] != _LATEST, _NAT)
+    return stats
+
+def _raw_authors(authors, first_position=0):
+    """Keys, names, codes and positions grouping books by raw author string."""
+    codes, uniques = pd.factorize(authors, sort=True)
+    order = np.argsort(codes, kind='stable')
+    # Books without authors (code -1) sort first and belong to no author
+    order = order[np.count_nonzero(codes < 0):]
+    return uniques, uniques, codes[order], order + first_position
+
+def _merge(old, new):
+    """Combine the statistics of two disjoint sets of books."""
+    dtypes = old.dtypes.to_dict()
+    keys = old.index.union(new.index)
+    old, new = old.reindex(keys), new.reindex(keys)
+    in_old, in_new = old['num_books'].notna(), new['num_books'].notna()
+    merged = old.copy()
+    merged.loc[~in_old] = new.loc[~in_old]
+    both = in_old & in_new
+    if both.any():
+        a, b = old[both], new[both]
+        for col in _ADDITIVE:
+            merged.loc[both, col] = a[col] + b[col]
+        merged.loc[both, 'min_pages'] = np.fmin(a['min_pages'], b['min_pages'])
+        merged.loc[both, 'max_pages'] = np.fmax(a['max_pages'], b['max_pages'])
+        first = np.where(a['first_published'] == _NAT, b['first_published'],
+                         np.where(b['first_published'] == _NAT, a['first_published'],
+                                  np.minimum(a['first_published'], b['first_published'])))
+        merged.loc[both, 'first_published'] = first
+        merged.loc[both, 'last_published'] = np.maximum(a['last_published'], b['last_published'])
+        merged.loc[both, 'first_position'] = np.minimum(a['first_position'], b['first_position'])
+        # Earlier rows win ties, as the first maximum does
+        for value, book, position in (('most_rated_count', 'most_rated_book', 'most_rated_position'),
+                                      ('highest_rating', 'highest_rated_book', 'highest_rated_position')):
+            better = ((b[value] > a[value]) | ((b[value] == a[value]) & (b[position] < a[position]))).to_numpy()
+            for col in (value, book, position):
+                merged.loc[both, col] = np.where(better, b[col], a[col])
+    return merged.astype(dtypes)
+
+def _remove(stats, removed, positions):
+    """
+    Take the statistics of removed books out of those of their authors.
+
+    Sums are subtracted. Minimums, maximums and top books cannot be, so
+    authors whose value may have come from a removed book are returned for
+    recomputation.
+
+    Args:
+        stats (pd.DataFrame): Statistics of every author
+        removed (pd.DataFrame): Statistics of the removed books
+        positions (np.ndarray): Row positions of the removed books
+
+    Returns:
+        tuple: (statistics without the removed books, keys to recompute)
+    """
+    keys = removed.index.intersection(stats.index)
+    current, gone = stats.loc[keys], removed.loc[keys]
+    stale = ((current['min_pages'] == gone['min_pages']) | (current['max_pages'] == gone['max_pages'])
+             | (current['first_published'] == gone['first_published'])
+             | (current['last_published'] == gone['last_published']))
+    for col in ('most_rated_position', 'highest_rated_position', 'first_position'):
+        stale |= current[col].isin(positions)
+    stats = stats.copy()
+    stats.loc[keys, _ADDITIVE] = current[_ADDITIVE] - gone[_ADDITIVE]
+    return stats[stats['num_books'] > 0], keys[stale.to_numpy()]
+
+class AuthorTable:
+    """Precomputed per-author aggregates with ready-made rankings.
+
+    Holds one row per author: book count, mean rating, total ratings, page
+    statistics, first and last publication date and the most rated and
+    highest rated books. Authors are either the raw author strings of the
+    catalog or, with split_authors, each individual author of the
+    '/'-separated lists, keyed by normalized name.
+
+    The rankings by rating and by book count are sorted once, so the author
+    queries are a threshold scan or a lookup on the table instead of a
+    groupby over the books. New books are merged into the affected rows, so
+    the table stays current at a cost proportional to the new books and the
+    number of authors.
+    """
+
+    def __init__(self, stats, split_authors, dtypes):
+        self._stats = stats
+        self.split_authors = split_authors
+        # Catalog dtypes of ratings_count and publication_date, for the results
+        self._dtypes = dtypes
+        self._rankings = {}
+
+    @classmethod
+    def build(cls, books, author_index=None):
+        """
+        Aggregate a catalog.
+
+        Args:
+            books (pd.DataFrame): Book data with authors and INPUT_COLUMNS
+            author_index (AuthorIndex, optional): Index over books['authors'];
+                given, the table is per individual author
+
+        Returns:
+            AuthorTable: The table
+        """
+        dtypes = books[['ratings_count', 'publication_date']].dtypes.to_dict()
+        if author_index is None:
+            return cls(_aggregate(books, *_raw_authors(books['authors'])), False, dtypes)
+        segment = author_index._consolidated()
+        return cls(_aggregate(books, segment.keys, segment.names, segment.author_codes, segment.positions),
+                   True, dtypes)
+
+    def extend(self, books, first_position):
+        """
+        Merge books appended after every book already aggregated.
+
+        Args:
+            books (pd.DataFrame): The new books, with authors and INPUT_COLUMNS
+            first_position (int): Row position of the first new book
+        """
+        if len(books) == 0:
+            return
+        if self.split_authors:
+            segment = _Segment(AuthorIndex._pairs(books['authors'], first_position))
+            groups = (segment.keys, segment.names, segment.author_codes, segment.positions)
+        else:
+            groups = _raw_authors(books['authors'], first_position)
+        self._stats = _merge(self._stats, _aggregate(books, *groups, first_position))
+        self._rankings = {}
+
+    def _groups(self, authors, positions, keys=None):
+        """
+        Grouping of books at sorted row positions, as _aggregate takes it.
+
+        Args:
+            authors (pd.Series): Authors of the books
+            positions (np.ndarray): Their sorted row positions
+            keys (pd.Index, optional): Only group these author keys
+
+        Returns:
+            tuple: (keys, names, codes, positions, rows)
+        """
+        if self.split_authors:
+            pairs = AuthorIndex._pairs(authors, 0)
+            if keys is not None:
+                pairs = pairs[pairs['key'].isin(keys)]
+            segment = _Segment(pairs)
+            groups = (segment.keys, segment.names, segment.author_codes, segment.positions)
+        else:
+            selected = np.arange(len(authors)) if keys is None else np.flatnonzero(authors.isin(keys))
+            *groups, rows = _raw_authors(authors.iloc[selected])
+            groups = (*groups, selected[rows])
+        return (*groups[:3], positions[groups[3]], groups[3])
+
+    def update(self, positions, old_books, books, author_index):
+        """
+        Replace the statistics of books changed in place.
+
+        The old versions of the books are subtracted and the new ones merged
+        in. Authors whose minimum, maximum or top book may have been a
+        changed book are aggregated again over all of their books, found
+        through the author index.
+
+        Args:
+            positions (np.ndarray): Row positions of the changed books
+            old_books (pd.DataFrame): Their authors and INPUT_COLUMNS before
+                the change, in the same order
+            books (callable): Maps sorted row positions to the current books
+                there, with authors and INPUT_COLUMNS
+            author_index (AuthorIndex): Index of the current authors
+        """
+        order = np.argsort(positions)
+        positions, old_books = np.asarray(positions)[order], old_books.iloc[order]
+        *groups, rows = self._groups(old_books['authors'], positions)
+        stats, stale = _remove(self._stats, _aggregate(old_books, *groups, rows=rows), positions)
+        new_books = books(positions)
+        *groups, rows = self._groups(new_books['authors'], positions)
+        stats = _merge(stats, _aggregate(new_books, *groups, rows=rows))
+
+        if len(stale):
+            # Every book of a key lists each of its authors, so one author finds them all
+            pairs = AuthorIndex._pairs(pd.Series(stale.to_numpy()), 0).drop_duplicates('position')
+            candidates = author_index.lookup_keys(pairs['key'])
+            affected = books(candidates)
+            *groups, rows = self._groups(affected['authors'], candidates, stale)
+            recomputed = _aggregate(affected, *groups, rows=rows)
+            stats = pd.concat([stats.drop(recomputed.index), recomputed]).sort_index().astype(stats.dtypes.to_dict())
+        self._stats = stats
+        self._rankings = {}
+
+    def __len__(self):
+        return len(self._stats)
+
+    def _ranking(self, name):
+        """Table row order for a ranking, computed once per version of the table."""
+        if name not in self._rankings:
+            stats = self._stats
+            key_order = np.arange(len(stats))
+            if name == 'rating':
+                with np.errstate(invalid='ignore'):
+                    rating = (stats['rating_sum'] / stats['rating_n']).to_numpy()
+                # Highest mean first, missing means last, ties in author order
+                self._rankings[name] = np.lexsort((key_order, np.isnan(rating), -np.nan_to_num(rating)))
+            else:
+                # Most books first; ties keep author order or first appearance
+                tiebreak = key_order if self.split_authors else stats['first_position'].to_numpy()
+                self._rankings[name] = np.lexsort((tiebreak, -stats['num_books'].to_numpy()))
+        return self._rankings[name]
+
+    def _total_ratings(self, totals):
+        """Summed ratings counts in the catalog's dtype, e.g. int64."""
+        dtype = self._dtypes['ratings_count']
+        return totals.astype(dtype) if np.dtype(dtype).kind in 'iu' else totals
+
+    def _dates(self, values):
+        return values.view(self._dtypes['publication_date'])
+
+    def top_by_rating(self, min_books=3, n=10):
+        """
+        Authors with the highest mean rating among those with enough books.
+
+        Returns:
+            pd.DataFrame: 'authors', 'average_rating' and 'title' (the book
+            count) columns, indexed by the author's position in name order,
+            as get_top_authors_by_rating returns them
+        """
+        ranking = self._ranking('rating')
+        counts = self._stats['num_books'].to_numpy()
+        selected = ranking[counts[ranking] >= min_books][:n]
+        stats = self._stats.iloc[selected]
+        return pd.DataFrame({
+            'authors': stats['author'].array,
+            'average_rating': (stats['rating_sum'] / stats['rating_n']).to_numpy(),
+            'title': stats['num_books'].to_numpy(dtype=np.int64)
+        }, index=selected)
+
+    def most_prolific(self, n=10):
+        """
+        Authors with the most books.
+
+        Returns:
+            pd.Series: Book counts indexed by author, named 'count'
+        """
+        stats = self._stats.iloc[self._ranking('count')[:n]]
+        return pd.Series(stats['num_books'].to_numpy(dtype=np.int64),
+                         index=pd.Index(stats['author'].array, name='authors'), name='count')
+
+    def summary(self, author_name):
+        """
+        Summary of one author, as create_author_summary computes it.
+
+        Args:
+            author_name (str): Author name; normalized for a split table,
+                the exact author string otherwise
+
+        Returns:
+            dict or None: The summary, or None for an unknown author
+        """
+        key = normalize_author(author_name) if self.split_authors else author_name
+        if key not in self._stats.index:
+            return None
+        row = self._stats.loc[key]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return {
+                'num_books': int(row['num_books']),
+                'avg_rating': row['rating_sum'] / row['rating_n'] if row['rating_n'] else np.nan,
+                'total_ratings': self._total_ratings(np.array([row['total_ratings']]))[0],
+                'avg_pages': row['pages_sum'] / row['pages_n'] if row['pages_n'] else np.nan,
+                'most_rated_book': row['most_rated_book'],
+                'highest_rated_book': row['highest_rated_book']
+            }
+
+    def to_frame(self):
+        """
+        The table with derived columns, highest mean rating first.
+
+        Returns:
+            pd.DataFrame: One row per author, indexed by display name
+        """
+        stats = self._stats.iloc[self._ranking('rating')]
+        with np.errstate(invalid='ignore'):
+            return pd.DataFrame({
+                'num_books': stats['num_books'].to_numpy(dtype=np.int64),
+                'avg_rating': (stats['rating_sum'] / stats['rating_n']).to_numpy(),
+                'total_ratings': self._total_ratings(stats['total_ratings'].to_numpy()),
+                'avg_pages': (stats['pages_sum'] / stats['pages_n']).to_numpy(),
+                'min_pages': stats['min_pages'].to_numpy(),
+                'max_pages': stats['max_pages'].to_numpy(),
+                'first_published': self._dates(stats['first_published'].to_numpy()),
+                'last_published': self._dates(stats['last_published'].to_numpy()),
+                'most_rated_book': stats['most_rated_book'].array,
+                'highest_rated_book': stats['highest_rated_book'].array
+            }, index=pd.Index(stats['author'].array, name='author'))
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import pandas as pd
+
+# Bump whenever the cleaning rules change so stale cache entries are rebuilt
+CACHE_VERSION = 2
+
+_INDEX_COLUMN = '__index__'
+
+def file_fingerprint(file_path, previous=None):
+    """
+    Identify a file by its size, modification time and content hash.
+
+    Hashing reads the whole file, so the hash from a previous fingerprint is
+    reused when the size and modification time have not changed.
+
+    Args:
+        file_path (str): Path to the file
+        previous (dict, optional): Fingerprint recorded earlier for the file
+
+    Returns:
+        dict: Fingerprint with 'size', 'mtime_ns' and 'sha256' keys
+    """
+    stat = os.stat(file_path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    if previous and all(previous.get(key) == value for key, value in fingerprint.items()):
+        fingerprint['sha256'] = previous['sha256']
+        return fingerprint
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    fingerprint['sha256'] = digest.hexdigest()
+    return fingerprint
+
+def _cache_paths(file_path, cache_dir, kind):
+    """Manifest and data paths of the cache entry for a source file."""
+    source = os.path.abspath(file_path)
+    key = hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+    stem = f"{os.path.splitext(os.path.basename(source))[0]}-{key}-{kind}"
+    return os.path.join(cache_dir, f"{stem}.json"), os.path.join(cache_dir, f"{stem}.feather")
+
+def _read_manifest(manifest_path):
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def _atomic_write(path, write):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def _write_manifest(manifest_path, manifest):
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+    _atomic_write(manifest_path, write)
+
+def load_cached_frame(file_path, cache_dir, kind, build):
+    """
+    Load a frame derived from a source file, using an on-disk Feather cache.
+
+    The cache entry is valid while the source file's content hash and
+    CACHE_VERSION are unchanged. On a miss the frame is built with ``build``
+    and written to the cache. The index is stored alongside the columns, so
+    non-contiguous labels left by cleaning survive the round trip.
+
+    Args:
+        file_path (str): Path to the source CSV file
+        cache_dir (str): Directory holding cache entries
+        kind (str): Name of the derived frame (e.g. 'raw' or 'clean')
+        build (callable): Function returning the frame on a cache miss
+
+    Returns:
+        pd.DataFrame: The cached or freshly built frame
+    """
+    manifest_path, data_path = _cache_paths(file_path, cache_dir, kind)
+    manifest = _read_manifest(manifest_path)
+    previous = manifest['source'] if manifest and manifest.get('version') == CACHE_VERSION else None
+    fingerprint = file_fingerprint(file_path, previous)
+
+    if previous and previous['sha256'] == fingerprint['sha256'] and os.path.exists(data_path):
+        df = pd.read_feather(data_path).set_index(_INDEX_COLUMN)
+        df.index.name = manifest['index_name']
+        if fingerprint != previous:
+            # Content unchanged but the file was touched; refresh the fast path
+            manifest['source'] = fingerprint
+            _write_manifest(manifest_path, manifest)
+        return df
+
+    df = build()
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_write(data_path, lambda path: df.rename_axis(_INDEX_COLUMN).reset_index().to_feather(path))
+    manifest = {'version': CACHE_VERSION, 'source': fingerprint, 'index_name': df.index.name}
+    _write_manifest(manifest_path, manifest)
+    return df
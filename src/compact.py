@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+
+# Columns with fewer distinct values than this share of rows become categoricals
+CATEGORY_RATIO = 0.5
+
+# Raw columns that cleaning has already replaced
+DEAD_COLUMNS = ['  num_pages']
+
+ARROW_STRING = pd.StringDtype('pyarrow', na_value=np.nan)
+
+def frame_bytes(df):
+    """Deep memory usage of a DataFrame in bytes, index included."""
+    return int(df.memory_usage(deep=True).sum())
+
+def _smallest_int_dtype(values, nullable):
+    """Smallest integer dtype holding every value, or None if not all integral."""
+    finite = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+    if len(finite) and (finite % 1 != 0).any():
+        return None
+    low, high = (finite.min(), finite.max()) if len(finite) else (0, 0)
+    candidates = ['uint8', 'uint16', 'uint32', 'uint64'] if low >= 0 else ['int8', 'int16', 'int32', 'int64']
+    for name in candidates:
+        info = np.iinfo(name)
+        if info.min <= low and high <= info.max:
+            return _nullable(np.dtype(name)) if nullable else np.dtype(name)
+    return None
+
+def _nullable(dtype):
+    """Masked integer dtype so missing values survive, e.g. 'UInt16' for uint16."""
+    return pd.api.types.pandas_dtype(dtype.name.replace('uint', 'UInt').replace('int', 'Int'))
+
+def _compact_column(series):
+    """
+    Pick a compact encoding for one column.
+
+    Returns:
+        tuple: (encoded series, codec) where codec describes how to restore
+        the original values, or (series, None) if it is left unchanged
+    """
+    dtype = series.dtype
+
+    if dtype.kind == 'f' and dtype != np.float32:
+        values = series.to_numpy()
+        int_dtype = _smallest_int_dtype(values, nullable=bool(np.isnan(values).any()))
+        if int_dtype is not None:
+            return series.astype(int_dtype), ('int', dtype, None)
+        # float32 only when the values round-trip exactly at some precision
+        narrow = values.astype(np.float32).astype(np.float64)
+        for decimals in range(0, 7):
+            if np.array_equal(np.round(narrow, decimals), values, equal_nan=True):
+                return series.astype(np.float32), ('float', dtype, decimals)
+        return series, None
+
+    if dtype.kind in 'iu':
+        int_dtype = _smallest_int_dtype(series.to_numpy(), nullable=False)
+        if int_dtype is not None and int_dtype.itemsize < dtype.itemsize:
+            return series.astype(int_dtype), ('int', dtype, None)
+        return series, None
+
+    if pd.api.types.is_string_dtype(dtype):
+        if series.notna().all() and series.str.fullmatch(r'\d{13}').all():
+            return series.astype(np.int64), ('isbn13', dtype, None)
+        if series.nunique() < CATEGORY_RATIO * len(series):
+            return series.astype('category'), ('category', dtype, None)
+        if dtype != ARROW_STRING:
+            return series.astype(ARROW_STRING), ('astype', dtype, None)
+
+    return series, None
+
+def compact_frame(df):
+    """
+    Convert a cleaned books frame to a compact in-memory representation.
+
+    Low-cardinality strings become categoricals, other strings Arrow-backed
+    strings, all-digit ISBN-13 columns int64, and numerics are downcast to the
+    smallest dtype that restores the original values exactly. Raw columns
+    replaced during cleaning are dropped.
+
+    Args:
+        df (pd.DataFrame): Cleaned book data
+
+    Returns:
+        tuple: (compact DataFrame, codecs for restore_columns, report dict
+        with byte counts and the dtype change of every converted column)
+    """
+    bytes_before = frame_bytes(df)
+    compact = df.drop(columns=[col for col in DEAD_COLUMNS if col in df.columns])
+    codecs = {}
+    changes = {col: 'dropped' for col in DEAD_COLUMNS if col in df.columns}
+
+    for col in compact.columns:
+        encoded, codec = _compact_column(compact[col])
+        if codec is not None:
+            compact[col] = encoded
+            codecs[col] = codec
+            changes[col] = f"{df[col].dtype} -> {encoded.dtype}"
+
+    bytes_after = frame_bytes(compact)
+    report = {
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'bytes_saved': bytes_before - bytes_after,
+        'columns': changes
+    }
+    return compact, codecs, report
+
+def restore_columns(df, codecs):
+    """
+    Restore compact columns of a frame to their original dtypes and values.
+
+    Args:
+        df (pd.DataFrame): Frame holding some compact columns
+        codecs (dict): Codecs returned by compact_frame
+
+    Returns:
+        pd.DataFrame: Frame with every known column restored
+    """
+    restored = {}
+    for col in df.columns:
+        if col not in codecs:
+            continue
+        kind, dtype, decimals = codecs[col]
+        series = df[col]
+        if kind == 'float':
+            restored[col] = pd.Series(np.round(series.to_numpy(np.float64), decimals), index=df.index)
+        elif kind == 'int' and dtype.kind == 'f':
+            restored[col] = pd.Series(series.to_numpy(dtype, na_value=np.nan), index=df.index)
+        elif kind == 'isbn13':
+            restored[col] = series.astype(str).str.zfill(13).astype(dtype)
+        else:
+            restored[col] = series.astype(dtype)
+
+    if not restored:
+        return df
+    return df.assign(**restored)
+
+def _encode_column(series, stored, codec):
+    """
+    Encode new values of a column the way its stored values are encoded.
+
+    Returns:
+        tuple: (encoded series, replacement for the stored column or None
+        if it is unchanged, codec); the stored column is widened, or
+        restored with codec None, when the new values do not fit its
+        compact dtype
+    """
+    kind, dtype, decimals = codec
+    if kind == 'category':
+        uniques = series.dropna().unique()
+        new = uniques[stored.cat.categories.get_indexer(uniques) < 0]
+        if len(new) == 0:
+            return series.astype(stored.dtype), None, codec
+        stored = stored.cat.add_categories(new)
+        return series.astype(stored.dtype), stored, codec
+
+    if kind == 'astype':
+        return series.astype(stored.dtype), None, codec
+
+    if kind == 'isbn13':
+        if series.notna().all() and series.str.fullmatch(r'\d{13}').all():
+            return series.astype(np.int64), None, codec
+
+    if kind == 'int':
+        values = series.to_numpy(np.float64, na_value=np.nan) if dtype.kind == 'f' else series.to_numpy()
+        int_dtype = _smallest_int_dtype(values, nullable=False)
+        if int_dtype is not None:
+            target = np.promote_types(getattr(stored.dtype, 'numpy_dtype', stored.dtype), int_dtype)
+            if target.kind in 'iu':
+                if not isinstance(stored.dtype, np.dtype) or (values.dtype.kind == 'f' and np.isnan(values).any()):
+                    target = _nullable(target)
+                return series.astype(target), stored.astype(target) if target != stored.dtype else None, codec
+
+    if kind == 'float':
+        values = series.to_numpy(np.float64, na_value=np.nan)
+        narrow = values.astype(np.float32).astype(np.float64)
+        if np.array_equal(np.round(narrow, decimals), values, equal_nan=True):
+            return series.astype(np.float32), None, codec
+
+    # No compact dtype holds the new values; keep the whole column in the original one
+    restored = restore_columns(stored.to_frame(), {stored.name: codec})[stored.name]
+    return series, restored, None
+
+def encode_rows(rows, compact, codecs):
+    """
+    Encode new or changed rows with the codecs of a compact frame.
+
+    Only the given rows are converted. When their values do not fit a
+    column's compact dtype (a new category, a larger count, more decimals),
+    that column of the frame is widened in place or, if no compact dtype
+    holds them, restored to its original dtype and its codec dropped.
+
+    Args:
+        rows (pd.DataFrame): Cleaned rows in their default dtypes
+        compact (pd.DataFrame): Compact frame the rows join or update;
+            modified in place when a column is widened
+        codecs (dict): Codecs of the frame, from compact_frame
+
+    Returns:
+        tuple: (encoded rows, updated codecs)
+    """
+    rows = rows.drop(columns=[col for col in DEAD_COLUMNS if col in rows.columns])
+    codecs = dict(codecs)
+    encoded = {}
+    for col in rows.columns:
+        if col not in codecs or col not in compact.columns:
+            continue
+        encoded[col], stored, codec = _encode_column(rows[col], compact[col], codecs[col])
+        if stored is not None:
+            compact[col] = stored
+        if codec is None:
+            del codecs[col]
+    return rows.assign(**encoded) if encoded else rows, codecs
@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+
+# Columns summed over the editions of a work; the others come from its
+# representative edition, except the rating (ratings-weighted mean) and the
+# publication date (earliest)
+SUMMED_COLUMNS = ['ratings_count', 'text_reviews_count']
+
+def normalize_titles(titles):
+    """
+    Normalize titles so the editions of a book compare equal.
+
+    A trailing parenthetical such as a series name or '(Penguin Classics)'
+    is dropped, punctuation removed, whitespace collapsed and the result
+    casefolded. Titles that are nothing but a parenthetical keep it.
+
+    Args:
+        titles (pd.Series): Book titles
+
+    Returns:
+        pd.Series: Normalized titles
+    """
+    titles = titles.astype(str)
+    stripped = titles.str.replace(r'\s*\([^()]*\)\s*$', '', regex=True)
+    stripped = stripped.where(stripped.str.strip() != '', titles)
+    return (stripped.str.casefold()
+            .str.replace(r'[^\w\s]', '', regex=True)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip())
+
+def primary_authors(authors):
+    """First author of each '/'-separated list, normalized like normalize_author."""
+    first = authors.astype(str).str.replace(r'/.*', '', regex=True)
+    return first.str.replace(r'\s+', ' ', regex=True).str.strip().str.casefold()
+
+def title_author_keys(df):
+    """
+    64-bit hash of the normalized title and primary author of each row.
+
+    Args:
+        df (pd.DataFrame): Book data with title and authors columns
+
+    Returns:
+        np.ndarray: uint64 keys, equal for rows of the same work
+    """
+    keys = normalize_titles(df['title']) + '\x1f' + primary_authors(df['authors'])
+    return pd.util.hash_array(keys.to_numpy(dtype=object))
+
+def _valid_isbn13(values):
+    """Mask of int64 values that are 13-digit ISBNs with a correct check digit."""
+    digits = (values[:, None] // 10 ** np.arange(12, -1, -1, dtype=np.int64)) % 10
+    weights = np.tile([1, 3], 7)[:13]
+    return (values >= 10**12) & (values < 10**13) & ((digits * weights).sum(axis=1) % 10 == 0)
+
+def isbn13_keys(df):
+    """
+    ISBN-13 of each row as an int64, 0 where it is unknown.
+
+    Valid values of the isbn13 column are used first. Rows without one fall
+    back to the ISBN-10 in the isbn column, converted to its ISBN-13 form.
+    Values that fail their check digit are ignored.
+
+    Args:
+        df (pd.DataFrame): Book data with isbn and/or isbn13 columns
+
+    Returns:
+        np.ndarray: int64 ISBN-13 per row
+    """
+    keys = np.zeros(len(df), dtype=np.int64)
+    if 'isbn13' in df.columns:
+        raw = df['isbn13']
+        if pd.api.types.is_numeric_dtype(raw):
+            values = raw.fillna(0).to_numpy(dtype=np.int64)
+        else:
+            # e.g. '9780439785969'; spreadsheet-mangled '9.78044E+12' is rejected
+            text = raw.astype(str).str.strip()
+            values = text.where(text.str.fullmatch(r'\d{13}'), '0').astype(np.int64).to_numpy()
+        keys = np.where(_valid_isbn13(values), values, 0)
+
+    if 'isbn' in df.columns:
+        text = df['isbn'].astype(str).str.strip().str.upper().str.zfill(10)
+        text = text.where(text.str.fullmatch(r'\d{9}[\dX]'), '000000000X')
+        stem = text.str.slice(0, 9).astype(np.int64).to_numpy()
+        check = text.str.slice(9).replace('X', '10').astype(np.int64).to_numpy()
+        digits = (stem[:, None] // 10 ** np.arange(8, -1, -1, dtype=np.int64)) % 10
+        valid = (digits * np.arange(10, 1, -1)).sum(axis=1) % 11 == (11 - check) % 11
+        # '978' prefix plus the nine ISBN-10 digits, then the ISBN-13 check digit
+        base = 978 * 10**9 + stem
+        base_digits = (base[:, None] // 10 ** np.arange(11, -1, -1, dtype=np.int64)) % 10
+        check13 = (10 - (base_digits * np.tile([1, 3], 6)).sum(axis=1) % 10) % 10
+        derived = base * 10 + check13
+        keys = np.where((keys == 0) & valid & (stem > 0), derived, keys)
+    return keys
+
+def _block_edges(keys, rows):
+    """Edges linking every row of a block of equal keys to the block's first row."""
+    codes, _ = pd.factorize(keys)
+    first = np.full(codes.max() + 1 if len(codes) else 0, -1, dtype=np.int64)
+    # Assigning in reverse leaves each block's first row
+    first[codes[::-1]] = rows[::-1]
+    return rows, first[codes]
+
+def group_editions(df):
+    """
+    Assign a work id to every row, grouping the editions of each book.
+
+    Rows are editions of the same work when their normalized title and
+    primary author match, or when they share an ISBN-13; the grouping is the
+    transitive closure of both. Keys are hashed and rows are only compared
+    within a block of equal keys: each row is linked to the first row of its
+    blocks, and the works are the connected components of those links. The
+    cost is linear in the number of rows, never pairwise.
+
+    Args:
+        df (pd.DataFrame): Cleaned book data
+
+    Returns:
+        np.ndarray: Work id per row, numbered by first appearance
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    n_rows = len(df)
+    rows = np.arange(n_rows)
+    title_src, title_dst = _block_edges(title_author_keys(df), rows)
+    isbn = isbn13_keys(df)
+    known = isbn > 0
+    isbn_src, isbn_dst = _block_edges(isbn[known], rows[known])
+
+    graph = coo_matrix((np.ones(n_rows + len(isbn_src), dtype=np.int8),
+                        (np.r_[title_src, isbn_src], np.r_[title_dst, isbn_dst])), shape=(n_rows, n_rows))
+    _, labels = connected_components(graph, directed=False)
+    work_ids, _ = pd.factorize(labels)
+    return work_ids
+
+class EditionMap:
+    """Mapping between editions (rows of the edition frame) and works."""
+
+    def __init__(self, work_ids):
+        """
+        Args:
+            work_ids (np.ndarray): Work id of each edition row
+        """
+        self.work_ids = np.asarray(work_ids, dtype=np.intp)
+        self.positions = np.argsort(self.work_ids, kind='stable')
+        n_works = self.work_ids.max() + 1 if len(self.work_ids) else 0
+        self.offsets = np.searchsorted(self.work_ids[self.positions], np.arange(n_works + 1))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def n_editions(self):
+        """Number of editions of each work."""
+        return np.diff(self.offsets)
+
+    def editions(self, work_id):
+        """Row positions of a work's editions, in row order."""
+        return self.positions[self.offsets[work_id]:self.offsets[work_id + 1]]
+
+    def extend(self, work_ids):
+        """
+        Add editions appended after the current last row, each a work of its own.
+
+        Args:
+            work_ids (np.ndarray): Ascending ids of the new works, all above
+                the current last work id; ids skipped in between are works
+                without editions
+        """
+        work_ids = np.asarray(work_ids, dtype=np.intp)
+        if len(work_ids) == 0:
+            return
+        n_editions = len(self.work_ids)
+        self.offsets = np.concatenate([
+            self.offsets,
+            n_editions + np.searchsorted(work_ids, np.arange(len(self) + 1, work_ids[-1] + 2))
+        ])
+        self.positions = np.concatenate([self.positions, n_editions + np.arange(len(work_ids))])
+        self.work_ids = np.concatenate([self.work_ids, work_ids])
+
+def collapse_frame(df):
+    """
+    Collapse a cleaned books frame to one row per work.
+
+    Each work is represented by its most rated edition, which supplies the
+    title, authors, ISBNs, language, pages and publisher. Ratings and review
+    counts are summed over the editions, average_rating is their
+    ratings-weighted mean and publication_date the earliest. The frame gains
+    an n_editions column and is indexed by work id.
+
+    Args:
+        df (pd.DataFrame): Cleaned book data
+
+    Returns:
+        tuple: (works, edition_map, report) where edition_map is an
+        EditionMap over the rows of df and report counts editions and works
+    """
+    edition_map = EditionMap(group_editions(df))
+    work_ids, order, offsets = edition_map.work_ids, edition_map.positions, edition_map.offsets
+    n_works = len(edition_map)
+
+    ratings_count = df['ratings_count'].to_numpy(dtype=np.float64, na_value=np.nan)
+    counts = np.nan_to_num(ratings_count)
+    # Most rated edition of each work, the first one on ties
+    by_count = np.lexsort((np.arange(len(df)), -counts, work_ids))
+    representative = by_count[offsets[:-1]]
+    works = df.iloc[representative].copy()
+
+    rating = df['average_rating'].to_numpy(dtype=np.float64, na_value=np.nan)
+    weight = np.where(np.isnan(rating), 0, counts)
+    weight_sum = np.bincount(work_ids, weight, n_works)
+    weighted = np.bincount(work_ids, np.nan_to_num(rating) * weight, n_works)
+    # Works without ratings fall back to the plain mean of their editions
+    with np.errstate(invalid='ignore'):
+        plain = (np.bincount(work_ids, np.nan_to_num(rating), n_works)
+                 / np.bincount(work_ids, ~np.isnan(rating), n_works))
+        works['average_rating'] = np.where(weight_sum > 0, weighted / np.where(weight_sum > 0, weight_sum, 1),
+                                           plain)
+
+    for col in SUMMED_COLUMNS:
+        if col in df.columns:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            totals = np.bincount(work_ids, np.nan_to_num(values), n_works)
+            works[col] = totals.astype(df[col].dtype) if df[col].dtype.kind in 'iu' else totals
+
+    if n_works:
+        dates = df['publication_date'].to_numpy().view(np.int64)
+        # NaT is the smallest int64; lift it above every date so it loses the minimum
+        dates = np.where(dates == np.iinfo(np.int64).min, np.iinfo(np.int64).max, dates)
+        earliest = np.minimum.reduceat(dates[order], offsets[:-1])
+        earliest[earliest == np.iinfo(np.int64).max] = np.iinfo(np.int64).min
+        works['publication_date'] = earliest.view(df['publication_date'].dtype)
+
+    works['n_editions'] = edition_map.n_editions
+    works.index = pd.RangeIndex(n_works, name='work_id')
+    report = {
+        'editions': len(df),
+        'works': n_works,
+        'multi_edition_works': int((edition_map.n_editions > 1).sum()),
+        'rows_saved': len(df) - n_works
+    }
+    return works, edition_map, report
@@ -0,0 +1,145 @@
+import os
+import pandas as pd
+import pyarrow as pa
+
+# File extension -> export format
+EXPORT_FORMATS = {
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+    '.parquet': 'parquet',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson'
+}
+
+DEFAULT_BATCH_SIZE = 65_536
+
+def export_format(path, format=None):
+    """
+    The export format for a path: the given one, or the one of its extension.
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred
+    """
+    format = format or EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if format not in set(EXPORT_FORMATS.values()):
+        raise ValueError(f"Unknown export format for {path!r}: {format!r}, "
+                         f"expected one of {sorted(set(EXPORT_FORMATS.values()))}")
+    return format
+
+def as_frame(result):
+    """
+    A query result as a flat DataFrame with its index as columns.
+
+    Series become one column, dicts (e.g. get_basic_stats) one row. An
+    unnamed integer index holds row labels and is dropped; any other index
+    is kept as columns, so author names, language codes or (author, book)
+    pairs are not lost.
+    """
+    if isinstance(result, dict):
+        return pd.DataFrame([result])
+    if isinstance(result, pd.Series):
+        result = result.to_frame(result.name if result.name is not None else 'value')
+    index = result.index
+    row_labels = index.nlevels == 1 and index.name is None and pd.api.types.is_integer_dtype(index.dtype)
+    return result.reset_index(drop=row_labels)
+
+class TableWriter:
+    """Writes a table to Arrow IPC, Parquet or NDJSON one record batch at a time.
+
+    The schema is taken from the first batch; later batches are cast to it.
+    Only one batch is converted at a time, so writing a large result holds
+    at most one batch as Arrow data or JSON text besides the frame itself.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, path, format=None):
+        """
+        Open a table file for writing.
+
+        Args:
+            path (str): Output file
+            format (str, optional): 'arrow', 'parquet' or 'ndjson', default
+                from the path's extension
+        """
+        self.path = path
+        self.format = export_format(path, format)
+        self.rows = 0
+        self.batches = 0
+        self.schema = None
+        self._writer = None
+        self._file = open(path, 'w' if self.format == 'ndjson' else 'wb')
+
+    def _open(self, schema):
+        self.schema = schema
+        if self.format == 'arrow':
+            self._writer = pa.ipc.new_file(self._file, schema)
+        elif self.format == 'parquet':
+            # Imported here; the Parquet module is only needed by this format
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self._file, schema)
+
+    def write(self, frame):
+        """
+        Append rows.
+
+        Args:
+            frame (pd.DataFrame): Rows with the same columns as earlier ones
+        """
+        if self.format == 'ndjson':
+            self.schema = self.schema or list(frame.columns)
+            if len(frame):
+                self._file.write(frame.to_json(orient='records', lines=True, date_format='iso'))
+        else:
+            batch = pa.RecordBatch.from_pandas(frame, schema=self.schema, preserve_index=False)
+            if self.schema is None:
+                self._open(batch.schema)
+            self._writer.write_batch(batch)
+        self.rows += len(frame)
+        self.batches += 1
+
+    def close(self):
+        """Finish the file, writing an empty table if no rows were written."""
+        if self._file.closed:
+            return
+        try:
+            if self._writer is not None:
+                self._writer.close()
+            elif self.format != 'ndjson':
+                self._open(pa.schema([]))
+                self._writer.close()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def export_table(result, path, format=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write a query result or a stream of frames to Arrow IPC, Parquet or NDJSON.
+
+    Args:
+        result: A DataFrame, Series or dict (see as_frame), or an iterable of
+            DataFrames such as iter_clean_chunks(), written chunk by chunk
+        path (str): Output file
+        format (str, optional): 'arrow', 'parquet' or 'ndjson', default from
+            the path's extension
+        batch_size (int): Rows per record batch
+
+    Returns:
+        dict: 'path', 'format', 'rows' and 'batches' written
+    """
+    if isinstance(result, (pd.DataFrame, pd.Series, dict)):
+        frames = [as_frame(result)]
+    else:
+        frames = (as_frame(frame) for frame in result)
+    with TableWriter(path, format) as writer:
+        for frame in frames:
+            for start in range(0, len(frame), batch_size):
+                writer.write(frame.iloc[start:start + batch_size])
+            if len(frame) == 0 and writer.schema is None:
+                writer.write(frame)
+    return {'path': path, 'format': writer.format, 'rows': writer.rows, 'batches': writer.batches}
@@ -0,0 +1,306 @@
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import time
+
+# Recorder and stage path of the measurement currently running, if any
+_current = contextvars.ContextVar('instrumentation', default=None)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+def _rss():
+    """Resident set size of this process in bytes, or None where unknown."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _rows(result):
+    """Row count of a query result, or None if it has none."""
+    if hasattr(result, 'shape') and len(getattr(result, 'shape', ())) > 0:
+        return int(result.shape[0])
+    if isinstance(result, tuple) and result and hasattr(result[0], 'shape'):
+        return _rows(result[0])
+    return None
+
+class Instrumentation:
+    """Opt-in recorder of timings, row counts and memory deltas.
+
+    Measurements nest: a stage run inside a method is recorded with the
+    path of both, e.g. 'recommend_books/build.recommender'. Each finished
+    measurement becomes a record dict with name, kind, path, seconds, rows
+    and memory_delta (change in resident memory, in bytes). Records are kept
+    in order and passed to an optional callback, e.g. to feed a metrics
+    system instead of keeping them.
+
+    While disabled, measure() returns a shared no-op context manager, so
+    instrumented code pays one attribute check per call.
+    """
+
+    def __init__(self, enabled=False, callback=None, keep_records=True, track_memory=True):
+        """
+        Args:
+            enabled (bool): Start recording immediately
+            callback (callable, optional): Called with each finished record
+            keep_records (bool): Keep records for report(); disable when a
+                callback consumes them
+            track_memory (bool): Measure resident memory before and after
+        """
+        self.enabled = enabled
+        self.callback = callback
+        self.keep_records = keep_records
+        self.track_memory = track_memory
+        self.records = []
+
+    def enable(self, callback=None):
+        """Start recording, optionally replacing the callback."""
+        if callback is not None:
+            self.callback = callback
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording; recorded data is kept."""
+        self.enabled = False
+
+    def clear(self):
+        """Drop every record."""
+        self.records = []
+
+    def measure(self, name, kind='stage'):
+        """
+        Context manager measuring a block of code.
+
+        The block may set record['rows'] on the yielded dict. Stages inside
+        the block, including stage() calls in helper functions, are recorded
+        under its path.
+
+        Args:
+            name (str): Method or stage name
+            kind (str): 'method' or 'stage'
+        """
+        if not self.enabled:
+            return _NULL_MEASUREMENT
+        return self._measure(name, kind)
+
+    @contextlib.contextmanager
+    def _measure(self, name, kind):
+        parent = _current.get()
+        path = f"{parent[1]}/{name}" if parent is not None and parent[0] is self else name
+        record = {'name': name, 'kind': kind, 'path': path, 'seconds': None, 'rows': None,
+                  'memory_delta': None}
+        token = _current.set((self, path))
+        rss_before = _rss() if self.track_memory else None
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            record['error'] = type(exc).__name__
+            raise
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if rss_before is not None:
+                rss_after = _rss()
+                record['memory_delta'] = rss_after - rss_before if rss_after is not None else None
+            _current.reset(token)
+            if self.keep_records:
+                self.records.append(record)
+            if self.callback is not None:
+                self.callback(record)
+
+    def summary(self):
+        """
+        Aggregate the records by path.
+
+        Returns:
+            dict: Per path, the number of calls, total/mean/max seconds,
+            total rows and total memory delta
+        """
+        summary = {}
+        for record in self.records:
+            entry = summary.setdefault(record['path'], {
+                'kind': record['kind'], 'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                'rows': None, 'memory_delta': None})
+            entry['calls'] += 1
+            entry['total_seconds'] += record['seconds']
+            entry['max_seconds'] = max(entry['max_seconds'], record['seconds'])
+            for field in ('rows', 'memory_delta'):
+                if record[field] is not None:
+                    entry[field] = (entry[field] or 0) + record[field]
+        for entry in summary.values():
+            entry['mean_seconds'] = entry['total_seconds'] / entry['calls']
+        return summary
+
+    def report(self):
+        """
+        Records and their summary as one JSON-serializable dict.
+
+        Returns:
+            dict: 'records' (list of record dicts) and 'summary'
+        """
+        return {'records': list(self.records), 'summary': self.summary()}
+
+    def to_json(self, path=None, indent=2):
+        """
+        Serialize report() as JSON.
+
+        Args:
+            path (str, optional): Also write the JSON to this file
+
+        Returns:
+            str: The JSON text
+        """
+        text = json.dumps(self.report(), indent=indent)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+class _NullMeasurement:
+    """No-op stand-in for a measurement while instrumentation is off."""
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_MEASUREMENT = _NullMeasurement()
+
+def stage(name):
+    """
+    Measure a stage of a helper function, if called under a measurement.
+
+    Helpers such as clean_books have no recorder of their own. Their stages
+    are recorded by the recorder of the enclosing measurement, and cost a
+    context variable lookup otherwise.
+
+    Args:
+        name (str): Stage name, e.g. 'clean.parse_dates'
+    """
+    current = _current.get()
+    if current is None:
+        return _NULL_MEASUREMENT
+    return current[0].measure(name)
+
+def instrumented(method):
+    """
+    Record calls of a method in the instance's ``instrumentation``.
+
+    The result's row count is recorded when it is a DataFrame, Series or
+    array, or a tuple starting with one.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.instrumentation.enabled:
+            return method(self, *args, **kwargs)
+        with self.instrumentation.measure(method.__name__, kind='method') as record:
+            result = method(self, *args, **kwargs)
+            record['rows'] = _rows(result)
+        return result
+
+    return wrapper
+
+class Profile:
+    """Hotspots collected by profile()."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.seconds = None
+        # List of dicts, hottest first
+        self.hotspots = []
+        # Human-readable listing of the hotspots
+        self.text = ''
+        # tracemalloc only: peak traced memory in bytes during the block
+        self.peak_memory = None
+
+    def to_dict(self):
+        return {'mode': self.mode, 'seconds': self.seconds, 'peak_memory': self.peak_memory,
+                'hotspots': self.hotspots}
+
+def _cprofile_hotspots(profiler, top, sort):
+    """Functions with the most time, as dicts and as the pstats listing."""
+    import io
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, n_calls, own_time, cumulative_time, _) in stats.stats.items():
+        rows.append({'function': f"{filename}:{line}({function})", 'calls': n_calls,
+                     'tottime': own_time, 'cumtime': cumulative_time})
+    key = 'cumtime' if sort == 'cumulative' else 'tottime'
+    rows.sort(key=lambda row: row[key], reverse=True)
+
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(top)
+    return rows[:top], stream.getvalue()
+
+def _tracemalloc_hotspots(snapshot, baseline, top):
+    """Source lines that allocated the most memory still held since the baseline."""
+    statistics = snapshot.compare_to(baseline, 'lineno')[:top]
+    rows = [{'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+             'size': stat.size_diff, 'count': stat.count_diff} for stat in statistics]
+    text = '\n'.join(str(stat) for stat in statistics)
+    return rows, text
+
+@contextlib.contextmanager
+def profile(mode='cprofile', top=20, sort='cumulative', output=None):
+    """
+    Profile a block of calls with cProfile or tracemalloc.
+
+    Usage:
+        with profile('tracemalloc', output='alloc.txt') as result:
+            analyzer.recommend_books('Tolkien')
+        result.hotspots
+
+    Args:
+        mode (str): 'cprofile' for time per function, 'tracemalloc' for
+            memory allocated per source line and the peak
+        top (int): Number of hotspots kept
+        sort (str): cProfile order, 'cumulative' or 'tottime'
+        output (str or file, optional): Where to dump the hotspot listing
+
+    Yields:
+        Profile: Filled in with the hotspots when the block exits
+    """
+    if mode not in ('cprofile', 'tracemalloc'):
+        raise ValueError(f"Unknown profile mode: {mode!r}")
+    # Profilers are only imported when used, keeping the import of the analyzer light
+    import cProfile
+    import tracemalloc
+
+    result = Profile(mode)
+    start = time.perf_counter()
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            result.seconds = time.perf_counter() - start
+            result.hotspots, result.text = _cprofile_hotspots(profiler, top, sort)
+    else:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.take_snapshot()
+        try:
+            yield result
+        finally:
+            result.seconds = time.perf_counter() - start
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            result.hotspots, result.text = _tracemalloc_hotspots(snapshot, baseline, top)
+
+    if output is not None:
+        if hasattr(output, 'write'):
+            output.write(result.text)
+        else:
+            with open(output, 'w') as f:
+                f.write(result.text)
@@ -0,0 +1,107 @@
+import copy
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+class ResultCache:
+    """Bounded least-recently-used cache of query results with hit/miss counters.
+
+    Safe to share between threads; results are computed outside the lock.
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        Create an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of results kept; 0 disables caching
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def __getstate__(self):
+        # Locks cannot be pickled, e.g. when an analyzer is sent to a spawned worker
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """
+        Look up a result, computing and storing it on a miss.
+
+        Args:
+            key (tuple): Hashable key identifying the call
+            compute (callable): Function returning the result on a miss
+
+        Returns:
+            A private copy of the result, so callers cannot alter the cache
+        """
+        with self._lock:
+            cached = self._results.get(key, _MISSING)
+            if cached is not _MISSING:
+                self.hits += 1
+                self._results.move_to_end(key)
+            else:
+                self.misses += 1
+        if cached is not _MISSING:
+            return copy.deepcopy(cached)
+
+        result = compute()
+        if self.maxsize > 0:
+            stored = copy.deepcopy(result)
+            with self._lock:
+                self._results[key] = stored
+                self._results.move_to_end(key)
+                if len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop every stored result, keeping the counters."""
+        with self._lock:
+            self._results.clear()
+
+    def info(self):
+        """
+        Cache statistics.
+
+        Returns:
+            dict: 'hits', 'misses', 'size' and 'maxsize'
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self), 'maxsize': self.maxsize}
+
+def memoized(method):
+    """
+    Cache a query method's results in the instance's ``result_cache``.
+
+    Calls are keyed by method name and bound arguments with defaults filled
+    in, so f(3) and f(min_books=3) share an entry. Calls with unhashable
+    arguments are passed through uncached.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, *list(bound.arguments.items())[1:])
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        return self.result_cache.get(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,259 @@
+import numpy as np
+import pandas as pd
+
+_NAT = np.iinfo(np.int64).min
+
+class QueryEngine:
+    """Filtered top-N queries over book columns held as NumPy arrays.
+
+    The filterable columns are copied once into contiguous arrays: ratings,
+    ratings counts and page counts as numbers, publication dates as int64
+    and languages as integer codes. A query folds all of its filters into
+    one boolean mask with in-place operations, selects the top rows with
+    argpartition instead of sorting every match, and returns row positions,
+    so only the rows of the final result are ever materialized.
+
+    Rows can be appended and updated in place; buffers grow geometrically,
+    as in RecommendationEngine, so appending costs time proportional to the
+    new rows.
+    """
+
+    COLUMNS = ['language_code', 'average_rating', 'ratings_count', 'num_pages', 'publication_date']
+    SORT_COLUMNS = ('average_rating', 'ratings_count', 'num_pages', 'publication_date')
+    # Filter keyword -> (column, comparison); all bounds are inclusive
+    FILTERS = {
+        'min_rating': ('average_rating', np.greater_equal),
+        'max_rating': ('average_rating', np.less_equal),
+        'min_ratings': ('ratings_count', np.greater_equal),
+        'max_ratings': ('ratings_count', np.less_equal),
+        'min_pages': ('num_pages', np.greater_equal),
+        'max_pages': ('num_pages', np.less_equal),
+        'start_date': ('publication_date', np.greater_equal),
+        'end_date': ('publication_date', np.less_equal)
+    }
+
+    def __init__(self, df):
+        """
+        Copy the query columns of a cleaned books DataFrame.
+
+        Args:
+            df (pd.DataFrame): Book data with COLUMNS in their default dtypes
+        """
+        self.date_dtype = df['publication_date'].dtype
+        self._language_dtype = df['language_code'].dtype
+        # Languages in order of first appearance; codes index this list
+        self.languages = []
+        self._language_codes = {}
+        self._arrays = {name: np.array(values) for name, values in self._convert(df).items()}
+        self.n_rows = len(df)
+
+    def __len__(self):
+        return self.n_rows
+
+    def _encode_languages(self, values):
+        """Integer codes of languages, -1 for missing, registering new ones."""
+        codes, uniques = pd.factorize(values)
+        for language in uniques:
+            if language not in self._language_codes:
+                self._language_codes[language] = len(self.languages)
+                self.languages.append(language)
+        mapping = np.array([self._language_codes[language] for language in uniques] + [-1], dtype=np.int32)
+        return mapping[codes]
+
+    def _convert(self, df):
+        """The query columns of rows in their stored representation."""
+        ratings_count = df['ratings_count']
+        if pd.api.types.is_integer_dtype(ratings_count.dtype) and not ratings_count.hasnans:
+            # Integer counts stay exact; anything else is float with NaN
+            ratings_count = ratings_count.to_numpy(dtype=np.int64)
+        else:
+            ratings_count = ratings_count.to_numpy(dtype=np.float64, na_value=np.nan)
+        columns = {
+            'language_code': self._encode_languages(df['language_code']),
+            'average_rating': df['average_rating'].to_numpy(dtype=np.float64, na_value=np.nan),
+            'ratings_count': ratings_count,
+            'num_pages': df['num_pages'].to_numpy(dtype=np.float64, na_value=np.nan),
+            'publication_date': df['publication_date'].to_numpy().astype(self.date_dtype).view(np.int64)
+        }
+        stored = getattr(self, '_arrays', None)
+        if stored is not None and columns['ratings_count'].dtype != stored['ratings_count'].dtype:
+            # Counts of one kind arrived in a column of the other; hold both as float
+            stored['ratings_count'] = stored['ratings_count'].astype(np.float64)
+            columns['ratings_count'] = columns['ratings_count'].astype(np.float64)
+        return columns
+
+    def column(self, name):
+        """The stored values of a column for the current rows."""
+        return self._arrays[name][:self.n_rows]
+
+    def append(self, df):
+        """
+        Add rows to the end of the arrays.
+
+        Args:
+            df (pd.DataFrame): COLUMNS of the new rows
+        """
+        columns = self._convert(df)
+        needed = self.n_rows + len(df)
+        if needed > len(self._arrays['average_rating']):
+            capacity = max(needed, 2 * len(self._arrays['average_rating']))
+            for name, buffer in self._arrays.items():
+                grown = np.empty(capacity, dtype=buffer.dtype)
+                grown[:self.n_rows] = buffer[:self.n_rows]
+                self._arrays[name] = grown
+        for name, values in columns.items():
+            self._arrays[name][self.n_rows:needed] = values
+        self.n_rows = needed
+
+    def update(self, positions, df):
+        """
+        Overwrite the values of existing rows.
+
+        Args:
+            positions (array-like): Row positions being replaced
+            df (pd.DataFrame): New COLUMNS for those rows
+        """
+        positions = np.asarray(positions)
+        for name, values in self._convert(df).items():
+            self._arrays[name][positions] = values
+
+    def _bound(self, column, value):
+        """A filter value in the stored representation of its column."""
+        if column == 'publication_date':
+            return pd.Timestamp(value).to_datetime64().astype(self.date_dtype).view(np.int64)
+        return value
+
+    def mask(self, language=None, **filters):
+        """
+        Rows matching every given filter, in one pass over the arrays.
+
+        Args:
+            language (str or list, optional): Language code(s) to keep
+            **filters: Inclusive bounds from FILTERS, e.g. min_rating=4.0,
+                min_ratings=1000, max_pages=300 or start_date='2000-01-01';
+                rows with a missing value in a filtered column never match
+
+        Returns:
+            np.ndarray or None: Boolean mask, or None when nothing is filtered
+
+        Raises:
+            ValueError: For an unknown filter
+        """
+        unknown = set(filters) - set(self.FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filters: {sorted(unknown)}, expected some of {list(self.FILTERS)}")
+        mask = None
+        scratch = np.empty(self.n_rows, dtype=bool)
+        if language is not None:
+            languages = [language] if isinstance(language, str) else language
+            allowed = np.zeros(len(self.languages) + 1, dtype=bool)
+            allowed[[self._language_codes[code] for code in languages if code in self._language_codes]] = True
+            # Code -1 (missing) picks the trailing False
+            mask = allowed[self.column('language_code')]
+        for name, value in filters.items():
+            if value is None:
+                continue
+            column, compare = self.FILTERS[name]
+            out = scratch if mask is not None else np.empty(self.n_rows, dtype=bool)
+            compare(self.column(column), self._bound(column, value), out=out)
+            if column == 'publication_date':
+                # NaT is the smallest int64, so only upper bounds can admit it
+                out &= self.column(column) != _NAT
+            if mask is None:
+                mask = out
+            else:
+                mask &= out
+        return mask
+
+    def count(self, language=None, **filters):
+        """Number of rows matching the filters (see mask())."""
+        mask = self.mask(language, **filters)
+        return self.n_rows if mask is None else int(np.count_nonzero(mask))
+
+    def top(self, n=10, by='average_rating', ascending=False, language=None, **filters):
+        """
+        Positions of the first n matching rows ordered by a column.
+
+        Rows with equal values keep their row order and rows missing the
+        value come last, as with a stable sort_values. Only the n best
+        matches are sorted.
+
+        Args:
+            n (int or None): Number of positions to return; None for all
+            by (str): One of SORT_COLUMNS
+            ascending (bool): Smallest values first instead of largest
+            language, **filters: Filters as in mask()
+
+        Returns:
+            np.ndarray: Row positions in result order
+
+        Raises:
+            ValueError: For an unknown sort column or filter
+        """
+        if by not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {by!r}, expected one of {self.SORT_COLUMNS}")
+        mask = self.mask(language, **filters)
+        positions = np.arange(self.n_rows) if mask is None else np.flatnonzero(mask)
+        values = self.column(by)
+        if by == 'publication_date':
+            missing = values[positions] == _NAT
+        elif values.dtype.kind == 'f':
+            missing = np.isnan(values[positions])
+        else:
+            missing = None
+        if missing is not None and missing.any():
+            positions, missing_positions = positions[~missing], positions[missing]
+        else:
+            missing_positions = positions[:0]
+        n = len(positions) + len(missing_positions) if n is None else max(n, 0)
+
+        if 0 < n < len(positions):
+            candidates = values[positions]
+            if ascending:
+                kth = np.partition(candidates, n - 1)[n - 1]
+                inside = candidates < kth
+            else:
+                kth = np.partition(candidates, len(candidates) - n)[len(candidates) - n]
+                inside = candidates > kth
+            # Earlier rows win the ties at the cut-off
+            tied = positions[candidates == kth][:n - np.count_nonzero(inside)]
+            positions = np.concatenate([positions[inside], tied])
+        selected = values[positions]
+        order = np.lexsort((positions, selected if ascending else -selected))
+        return np.concatenate([positions[order], missing_positions])[:n]
+
+    def language_counts(self):
+        """
+        Number of rows per language, as value_counts() returns them.
+
+        Returns:
+            pd.Series: Counts named 'count', most common first
+        """
+        codes = self.column('language_code')
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.languages))
+        # Equal counts keep the order languages first appeared in
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        languages = np.asarray(self.languages, dtype=object)[order]
+        return pd.Series(counts[order], index=pd.Index(languages, dtype=self._language_dtype, name='language_code'),
+                         name='count')
+
+    def summary(self):
+        """
+        Dataset-wide statistics of the numeric columns.
+
+        Returns:
+            dict: 'average_rating', 'average_pages', 'total_ratings',
+            'average_ratings', 'first_date' and 'last_date'
+        """
+        ratings_count = self.column('ratings_count')
+        dates = self.column('publication_date')
+        dates = dates[dates != _NAT].view(self.date_dtype)
+        return {
+            'average_rating': np.nanmean(self.column('average_rating')),
+            'average_pages': np.nanmean(self.column('num_pages')),
+            'total_ratings': np.nansum(ratings_count) if ratings_count.dtype.kind == 'f' else ratings_count.sum(),
+            'average_ratings': np.nanmean(ratings_count),
+            'first_date': pd.Timestamp(dates.min()) if len(dates) else pd.NaT,
+            'last_date': pd.Timestamp(dates.max()) if len(dates) else pd.NaT
+        }
@@ -0,0 +1,259 @@
+import numpy as np
+
+
+class RecommendationEngine:
+    """Top-k cosine similarity search over standardized book features.
+
+    The scaler is fitted and the unit-normalized feature matrix is cached once
+    per frame. Queries score only the query rows against the catalog, one
+    column block at a time, so memory grows linearly with the catalog instead
+    of quadratically like a full similarity matrix.
+    """
+
+    FEATURES = ['average_rating', 'ratings_count', 'num_pages']
+    OUTPUT_COLUMNS = ['title', 'authors', 'average_rating', 'ratings_count']
+
+    def __init__(self, df, block_size=2 ** 20, features=None):
+        """
+        Fit the feature cache for a cleaned books DataFrame.
+
+        Args:
+            df (pd.DataFrame): Cleaned book data
+            block_size (int): Maximum number of similarity scores held in
+                memory at once while scoring a query
+            features (pd.DataFrame, optional): FEATURES columns to fit on
+                instead of those of df, e.g. decoded from compact dtypes
+        """
+        self.df = df
+        self.block_size = block_size
+
+        # Imported here so importing the analyzer does not load scikit-learn
+        from sklearn.preprocessing import StandardScaler, normalize
+
+        if features is None:
+            features = df[self.FEATURES]
+        feature_matrix = features.fillna(0)
+        self.scaler = StandardScaler()
+        self._scaled = self.scaler.fit_transform(feature_matrix)
+        self._norms = np.linalg.norm(self._scaled, axis=1)
+        # Same normalization cosine_similarity applies, done once per frame
+        self._unit = normalize(self._scaled)
+        self.n_rows = len(self._scaled)
+
+    @property
+    def scaled_features(self):
+        return self._scaled[:self.n_rows]
+
+    @property
+    def norms(self):
+        return self._norms[:self.n_rows]
+
+    @property
+    def unit_features(self):
+        return self._unit[:self.n_rows]
+
+    def __len__(self):
+        return self.n_rows
+
+    def _transform(self, features):
+        """Scale, measure and normalize rows with the fitted scaler."""
+        from sklearn.preprocessing import normalize
+
+        scaled = self.scaler.transform(features[self.FEATURES].fillna(0))
+        return scaled, np.linalg.norm(scaled, axis=1), normalize(scaled)
+
+    def append(self, features, df=None):
+        """
+        Add rows to the end of the feature cache.
+
+        The scaler fitted at construction is reused, so existing rows are
+        untouched and the cost is proportional to the number of new rows.
+        Buffers grow geometrically to amortize reallocation.
+
+        Args:
+            features (pd.DataFrame): FEATURES columns of the new rows
+            df (pd.DataFrame, optional): Frame now holding every row, used to
+                materialize recommendations
+        """
+        scaled, norms, unit = self._transform(features)
+        needed = self.n_rows + len(scaled)
+        if needed > len(self._scaled):
+            capacity = max(needed, 2 * len(self._scaled))
+            for name in ('_scaled', '_norms', '_unit'):
+                buffer = getattr(self, name)
+                grown = np.empty((capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+                grown[:self.n_rows] = buffer[:self.n_rows]
+                setattr(self, name, grown)
+        rows = slice(self.n_rows, needed)
+        self._scaled[rows], self._norms[rows], self._unit[rows] = scaled, norms, unit
+        self.n_rows = needed
+        if df is not None:
+            self.df = df
+
+    def update(self, positions, features):
+        """
+        Recompute the cached features of existing rows.
+
+        Args:
+            positions (array-like): Row positions being replaced
+            features (pd.DataFrame): New FEATURES columns for those rows
+        """
+        positions = np.asarray(positions)
+        self._scaled[positions], self._norms[positions], self._unit[positions] = self._transform(features)
+
+    def average_similarity(self, query_positions):
+        """
+        Mean cosine similarity of every catalog row to the query rows.
+
+        Args:
+            query_positions (array-like): Row positions of the query books
+
+        Returns:
+            np.ndarray: One score per catalog row
+        """
+        query_features = self.unit_features[np.asarray(query_positions)]
+        n_rows = self.n_rows
+        scores = np.empty(n_rows)
+        step = max(1, self.block_size // max(1, len(query_features)))
+
+        for start in range(0, n_rows, step):
+            stop = min(start + step, n_rows)
+            block = query_features @ self.unit_features[start:stop].T
+            scores[start:stop] = block.mean(axis=0)
+
+        return scores
+
+    @staticmethod
+    def top_k(scores, k, candidates=None):
+        """
+        Positions of the k highest scores, best first.
+
+        Uses partial selection instead of a full sort. Ties are broken in
+        favour of the later row, matching a reversed ascending sort.
+
+        Args:
+            scores (np.ndarray): One score per catalog row
+            k (int): Number of positions to return
+            candidates (np.ndarray, optional): Boolean mask of eligible rows
+
+        Returns:
+            np.ndarray: Selected row positions
+        """
+        if candidates is None:
+            positions = np.arange(len(scores))
+        else:
+            positions = np.flatnonzero(candidates)
+
+        if k <= 0 or len(positions) == 0:
+            return np.array([], dtype=np.intp)
+
+        candidate_scores = scores[positions]
+        if k < len(positions):
+            kth = np.partition(candidate_scores, len(positions) - k)[len(positions) - k]
+            above = positions[candidate_scores > kth]
+            tied = positions[candidate_scores == kth][::-1]
+            positions = np.concatenate([above, tied[:k - len(above)]])
+
+        order = np.lexsort((-positions, -scores[positions]))
+        return positions[order]
+
+    def recommend(self, query_positions, exclude_mask, n_recommendations=5):
+        """
+        Recommend books most similar on average to the query rows.
+
+        Args:
+            query_positions (array-like): Row positions of the query books
+            exclude_mask (np.ndarray): Boolean mask of rows that must not be
+                recommended (e.g. books by the queried author)
+            n_recommendations (int): Number of recommendations to return
+
+        Returns:
+            pd.DataFrame: Recommended books
+        """
+        scores = self.average_similarity(query_positions)
+        positions = self.top_k(scores, n_recommendations, ~np.asarray(exclude_mask))
+        return self.df.iloc[positions][self.OUTPUT_COLUMNS]
+
+    @staticmethod
+    def _keep_top(scores, positions, k):
+        """
+        Keep the k highest scores in each row of a 2-D score block.
+
+        Rows must be ordered by position. Ties at the cut-off keep the later
+        positions, and the surviving entries stay in position order.
+        """
+        if scores.shape[1] <= k:
+            return scores, positions
+        kth = np.partition(scores, scores.shape[1] - k, axis=1)[:, [scores.shape[1] - k]]
+        above = scores > kth
+        tied = scores == kth
+        needed = k - above.sum(axis=1, keepdims=True)
+        tied_from_end = np.cumsum(tied[:, ::-1], axis=1)[:, ::-1]
+        keep = above | (tied & (tied_from_end <= needed))
+        return scores[keep].reshape(-1, k), positions[keep].reshape(-1, k)
+
+    def recommend_batch(self, query_matrix, n_recommendations=5):
+        """
+        Recommend books for many queries in one vectorized pass.
+
+        The average similarity to a set of query rows equals the similarity
+        to the mean of their unit vectors, so every query is reduced to a
+        single centroid and all centroids are scored against the catalog
+        with one matrix product per block. Scores agree with
+        ``average_similarity`` up to floating point rounding.
+
+        Args:
+            query_matrix (scipy.sparse matrix): Boolean (n_queries, n_rows)
+                matrix marking the rows that match each query. Matching rows
+                are also excluded from that query's recommendations.
+            n_recommendations (int): Number of recommendations per query
+
+        Returns:
+            list: Recommended row positions for each query, best first
+        """
+        from scipy import sparse
+
+        query_matrix = sparse.csr_matrix(query_matrix, dtype=np.float64)
+        n_queries, n_rows = query_matrix.shape
+        counts = np.asarray(query_matrix.sum(axis=1)).ravel()
+        weights = sparse.diags(1.0 / np.maximum(counts, 1))
+        centroids = np.asarray((weights @ query_matrix) @ self.unit_features)
+
+        # Excluded (query, row) pairs sorted by row so each block is a slice
+        excluded = query_matrix.tocoo()
+        order = np.argsort(excluded.col, kind='stable')
+        excluded_rows, excluded_cols = excluded.row[order], excluded.col[order]
+
+        k = max(0, n_recommendations)
+        if k == 0:
+            return [np.array([], dtype=np.intp) for _ in range(n_queries)]
+
+        best_scores = np.full((n_queries, 0), -np.inf)
+        best_positions = np.empty((n_queries, 0), dtype=np.intp)
+        step = max(1, self.block_size // max(1, n_queries))
+
+        for start in range(0, n_rows, step):
+            stop = min(start + step, n_rows)
+            block = centroids @ self.unit_features[start:stop].T
+            lo, hi = np.searchsorted(excluded_cols, [start, stop])
+            block[excluded_rows[lo:hi], excluded_cols[lo:hi] - start] = -np.inf
+
+            positions = np.broadcast_to(np.arange(start, stop), block.shape)
+            block, positions = self._keep_top(block, positions, k)
+            best_scores, best_positions = self._keep_top(
+                np.concatenate([best_scores, block], axis=1),
+                np.concatenate([best_positions, positions], axis=1),
+                k
+            )
+
+        order = np.lexsort((-best_positions, -best_scores), axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_positions = np.take_along_axis(best_positions, order, axis=1)
+
+        results = []
+        for query in range(n_queries):
+            if counts[query] == 0:
+                results.append(np.array([], dtype=np.intp))
+            else:
+                results.append(best_positions[query][np.isfinite(best_scores[query])])
+        return results
@@ -0,0 +1,206 @@
+"""
+Local HTTP/JSON query service around one warm BookAnalyzer.
+
+The data is loaded once. Each query method is an endpoint named after it,
+with keyword arguments taken from the query string:
+
+    GET /get_basic_stats
+    GET /get_top_rated_books?min_ratings=500
+    GET /analyze_author_performance?author_name=J.K.%20Rowling&match=exact
+    GET /recommend_books?query_value=The%20Hobbit&attribute=title
+
+Queries run in a thread pool so the event loop keeps accepting
+connections, and identical requests that arrive while one is being
+computed share its result.
+
+Usage (from the repository root):
+    python -m src.server --csv data/books.csv --port 8000
+"""
+import argparse
+import asyncio
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+import pandas as pd
+from src.analyzer import BookAnalyzer
+
+def _boolean(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f"Expected a boolean, got {value!r}")
+
+# Endpoint name -> query parameter converters
+ENDPOINTS = {
+    'get_basic_stats': {},
+    'get_language_distribution': {},
+    'get_top_rated_books': {'min_ratings': int},
+    'get_most_prolific_authors': {'split_authors': _boolean},
+    'analyze_author_performance': {'author_name': str, 'match': str},
+    'get_top_authors_by_rating': {'min_books': int, 'split_authors': _boolean},
+    'recommend_books': {'query_value': str, 'attribute': str, 'n_recommendations': int, 'match': str,
+                        'n_probe': int},
+    'recommend_similar_books': {'query_value': str, 'attribute': str, 'n_recommendations': int, 'match': str,
+                                'numeric_weight': float},
+}
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+class RequestError(Exception):
+    """A request the client has to fix, answered with the given HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def to_json(result):
+    """
+    Serialize a query result to JSON bytes.
+
+    DataFrames and Series use pandas' 'split' layout (index, columns/name and
+    data) with ISO dates; other results are encoded as plain JSON.
+    """
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.to_json(orient='split', date_format='iso').encode('utf-8')
+    return json.dumps(result, default=lambda value: value.item() if hasattr(value, 'item') else str(value)).encode('utf-8')
+
+class BookQueryServer:
+    """asyncio HTTP/1.1 server answering BookAnalyzer queries as JSON."""
+
+    def __init__(self, analyzer, workers=4):
+        """
+        Args:
+            analyzer (BookAnalyzer): Loaded analyzer shared by all requests
+            workers (int): Threads running queries
+        """
+        self.analyzer = analyzer
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # Request key -> future of the response body being computed
+        self._in_flight = {}
+        self.coalesced = 0
+
+    def parse_query(self, target):
+        """
+        Resolve a request target to a method name and keyword arguments.
+
+        Returns:
+            tuple: (method name, dict of converted arguments)
+        """
+        url = urlsplit(target)
+        name = url.path.strip('/')
+        if name not in ENDPOINTS:
+            raise RequestError(404, f"Unknown endpoint: {url.path}")
+        converters = ENDPOINTS[name]
+        params = {}
+        for key, value in parse_qsl(url.query, keep_blank_values=True):
+            if key not in converters:
+                raise RequestError(400, f"Unknown parameter for {name}: {key}")
+            try:
+                params[key] = converters[key](value)
+            except ValueError as e:
+                raise RequestError(400, f"Invalid value for {key}: {e}")
+        try:
+            inspect.signature(getattr(self.analyzer, name)).bind(**params)
+        except TypeError as e:
+            raise RequestError(400, str(e))
+        return name, params
+
+    def _compute(self, name, params):
+        return to_json(getattr(self.analyzer, name)(**params))
+
+    async def query(self, name, params):
+        """Run a query in the pool, sharing the computation with identical concurrent requests."""
+        key = (name, tuple(sorted(params.items())))
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._compute, name, params)
+        self._in_flight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    async def respond(self, target):
+        """Answer one GET request; returns (status, JSON body)."""
+        try:
+            name, params = self.parse_query(target)
+            return 200, await self.query(name, params)
+        except RequestError as e:
+            return e.status, to_json({'error': str(e)})
+        except (ValueError, KeyError) as e:
+            return 400, to_json({'error': f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            return 500, to_json({'error': f"{type(e).__name__}: {e}"})
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection, keeping it open between requests."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split(maxsplit=2)
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    field, _, value = line.decode('latin-1').partition(':')
+                    headers[field.strip().lower()] = value.strip()
+                if int(headers.get('content-length', 0)):
+                    await reader.readexactly(int(headers['content-length']))
+
+                if method == 'GET':
+                    status, body = await self.respond(target)
+                else:
+                    status, body = 405, to_json({'error': f"Method not allowed: {method}"})
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.strip() == 'HTTP/1.1')
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8000):
+        """Start listening; returns the asyncio server."""
+        return await asyncio.start_server(self.handle, host, port)
+
+async def _main(args):
+    analyzer = BookAnalyzer(args.csv, cache_dir=args.cache_dir, compact=args.compact)
+    # Build the content index before serving so no request pays for it
+    analyzer.get_text_index()
+    server = await BookQueryServer(analyzer, workers=args.workers).serve(args.host, args.port)
+    print(f"Serving {len(analyzer.df):,} books on http://{args.host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve BookAnalyzer queries over HTTP")
+    parser.add_argument('--csv', default='data/books.csv', help="Path to the books CSV")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on")
+    parser.add_argument('--workers', type=int, default=4, help="Threads running queries")
+    parser.add_argument('--cache-dir', default=None, help="Directory for the parsed data cache")
+    parser.add_argument('--compact', action='store_true', help="Hold the data in compact dtypes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import functools
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from src.author_index import AuthorIndex
+from src.cache import load_cached_frame
+from src.compact import ARROW_STRING
+from src.utils import clean_books, load_and_validate_csv
+
+# Read as text in every shard, so a shard whose ISBNs happen to be all
+# digits keeps its leading zeros and concatenates with the others
+SHARD_DTYPES = {'isbn': str, 'isbn13': str}
+
+def find_shards(path):
+    """
+    List the CSV shards a catalog path refers to.
+
+    Args:
+        path (str): A directory (every *.csv below it), a glob pattern such
+            as 'data/shards/*/2024-*.csv', or a single CSV file
+
+    Returns:
+        list or None: Sorted shard paths, or None for a single file
+
+    Raises:
+        FileNotFoundError: If a directory or pattern matches no CSV file
+    """
+    if os.path.isdir(path):
+        paths = glob.glob(os.path.join(glob.escape(path), '**', '*.csv'), recursive=True)
+    elif glob.has_magic(path):
+        paths = [match for match in glob.glob(path, recursive=True) if os.path.isfile(match)]
+    else:
+        return None
+    if not paths:
+        raise FileNotFoundError(f"No CSV shards found at {path}")
+    return sorted(paths)
+
+def _read_clean_shard(path):
+    df = load_and_validate_csv(path, dtype=SHARD_DTYPES)
+    return clean_books(df)
+
+def _load_shard(path, cache_dir=None):
+    """
+    Read, validate, clean and author-index one shard in a worker process.
+
+    Returns:
+        tuple: (cleaned frame, author pairs, None), or (None, None, error
+        message) for a bad shard. Pair positions count from the shard's
+        first row; their strings are Arrow-backed, which pickle quickly.
+    """
+    try:
+        if cache_dir is None:
+            frame = _read_clean_shard(path)
+        else:
+            # Shards are parsed with SHARD_DTYPES, so they do not share a single-file load's entry
+            frame = load_cached_frame(path, cache_dir, 'shard-clean', lambda: _read_clean_shard(path))
+    except (OSError, ValueError, KeyError, UnicodeDecodeError, pd.errors.ParserError) as exc:
+        return None, None, f"{type(exc).__name__}: {exc}"
+    pairs = AuthorIndex._pairs(frame['authors'], 0).astype({'key': ARROW_STRING, 'name': ARROW_STRING})
+    return frame, pairs, None
+
+def _harmonize(frames):
+    """
+    Give a column the same kind of dtype in every shard before concatenating.
+
+    A column read as text in one shard (e.g. '  num_pages' with a stray
+    non-numeric value) but as numbers in others is converted to text
+    everywhere, as a read of the whole file would have done; otherwise the
+    concat would fall back to object dtype.
+    """
+    text_columns = {col for frame in frames for col in frame.columns
+                    if pd.api.types.is_string_dtype(frame[col].dtype)}
+    for frame in frames:
+        for col in text_columns:
+            if col in frame.columns and pd.api.types.is_numeric_dtype(frame[col].dtype):
+                frame[col] = frame[col].astype(str).where(frame[col].notna())
+    return frames
+
+def load_shards(paths, workers=None, cache_dir=None):
+    """
+    Load CSV shards in the books.csv schema into one cleaned frame.
+
+    Each shard is read, checked with the load_and_validate_csv column rules
+    and cleaned in a worker process, so shards load in parallel. Shards that
+    cannot be read or fail validation are reported and skipped; the others
+    are joined with a single concat. Row labels continue from one shard to
+    the next, in path order. The workers also split and normalize the
+    author lists of their shard, so building the author index in this
+    process is a single sort.
+
+    Args:
+        paths (list): Shard paths, e.g. from find_shards
+        workers (int, optional): Worker processes, default one per CPU;
+            1 loads in this process
+        cache_dir (str, optional): Directory for a binary cache of each
+            cleaned shard, reused until that shard changes
+
+    Returns:
+        tuple: (frame, author_index, report). author_index is an
+        AuthorIndex over the frame's authors. report counts shards, loaded
+        shards and rows and lists the bad shards as {'path', 'error'} dicts.
+
+    Raises:
+        ValueError: If no shard could be loaded
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    load = functools.partial(_load_shard, cache_dir=cache_dir)
+    if workers <= 1:
+        results = [load(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(load, paths))
+
+    frames, author_pairs, bad_shards = [], [], []
+    offset = 0
+    n_rows = 0
+    n_unparseable = 0
+    for path, (frame, pairs, error) in zip(paths, results):
+        if frame is None:
+            bad_shards.append({'path': path, 'error': error})
+            continue
+        n_unparseable += frame.attrs.get('unparseable_dates', 0)
+        frame.index = frame.index + offset
+        offset = frame.index.max() + 1 if len(frame) else offset
+        pairs['position'] += n_rows
+        n_rows += len(frame)
+        frames.append(frame)
+        author_pairs.append(pairs)
+
+    report = {'shards': len(paths), 'loaded': len(frames), 'rows': n_rows, 'bad_shards': bad_shards}
+    if not frames:
+        raise ValueError(f"None of the {len(paths)} shards could be loaded: {bad_shards}")
+    df = pd.concat(_harmonize(frames)) if len(frames) > 1 else frames[0]
+    df.attrs = {'unparseable_dates': n_unparseable}
+    return df, AuthorIndex.from_pairs(pd.concat(author_pairs, ignore_index=True), n_rows), report
@@ -0,0 +1,180 @@
+import heapq
+import math
+import pandas as pd
+from src.utils import iter_clean_chunks
+
+class StreamingBookStats:
+    """Mergeable partial aggregates for catalogs larger than memory.
+
+    Chunks of cleaned book data are folded into running counts, sums,
+    min/max values and a bounded heap of the best-rated books. Only these
+    aggregates are kept, so peak memory depends on the chunk size and the
+    number of distinct authors and languages, not on the number of rows.
+    Two accumulators built from different parts of a catalog can be merged.
+    The query methods mirror those of BookAnalyzer.
+    """
+
+    TOP_N = 10
+    BOOK_COLUMNS = ['title', 'authors', 'average_rating', 'ratings_count']
+
+    def __init__(self, min_ratings=1000):
+        """
+        Create an empty accumulator.
+
+        Args:
+            min_ratings (int): Ratings threshold for get_top_rated_books,
+                fixed up front because the heap is filtered while streaming
+        """
+        self.min_ratings = min_ratings
+        self.n_books = 0
+        self.rating_sums = []
+        self.page_sums = []
+        self.n_pages = 0
+        self.ratings_count_total = 0
+        self.min_date = pd.NaT
+        self.max_date = pd.NaT
+        self.language_counts = {}
+        self.author_counts = {}
+        self.author_rating_sums = {}
+        # Min-heap of (average_rating, -label, label, row) for the best books
+        self.top_books = []
+
+    @classmethod
+    def from_csv(cls, csv_path, chunksize=100_000, min_ratings=1000):
+        """
+        Stream a CSV file through the accumulator chunk by chunk.
+
+        Args:
+            csv_path (str): Path to a CSV file in the books.csv schema
+            chunksize (int): Number of raw rows read at a time
+            min_ratings (int): Ratings threshold for get_top_rated_books
+
+        Returns:
+            StreamingBookStats: Aggregates over the whole file
+        """
+        stats = cls(min_ratings=min_ratings)
+        for chunk in iter_clean_chunks(csv_path, chunksize=chunksize):
+            stats.update(chunk)
+        return stats
+
+    @staticmethod
+    def _combine(func, a, b):
+        """Apply min or max to two timestamps, ignoring missing ones."""
+        values = [value for value in (a, b) if pd.notna(value)]
+        return func(values) if values else pd.NaT
+
+    @staticmethod
+    def _add_counts(totals, counts):
+        for key, count in counts.items():
+            totals[key] = totals.get(key, 0) + count
+
+    def _push_books(self, entries):
+        for entry in entries:
+            if len(self.top_books) < self.TOP_N:
+                heapq.heappush(self.top_books, entry)
+            elif entry[:2] > self.top_books[0][:2]:
+                heapq.heapreplace(self.top_books, entry)
+
+    def update(self, chunk):
+        """
+        Fold a cleaned chunk into the aggregates.
+
+        Args:
+            chunk (pd.DataFrame): Cleaned book rows
+        """
+        self.n_books += len(chunk)
+        self.rating_sums.append(chunk['average_rating'].sum())
+        pages = chunk['num_pages'].dropna()
+        self.page_sums.append(pages.sum())
+        self.n_pages += len(pages)
+        self.ratings_count_total += int(chunk['ratings_count'].sum())
+
+        dates = chunk['publication_date']
+        self.min_date = self._combine(min, self.min_date, dates.min())
+        self.max_date = self._combine(max, self.max_date, dates.max())
+
+        self._add_counts(self.language_counts, chunk['language_code'].value_counts(sort=False))
+        authors = chunk.groupby('authors', sort=False).agg(count=('title', 'count'), rating=('average_rating', 'sum'))
+        self._add_counts(self.author_counts, authors['count'])
+        self._add_counts(self.author_rating_sums, authors['rating'])
+
+        eligible = chunk[chunk['ratings_count'] >= self.min_ratings]
+        best = eligible.nlargest(self.TOP_N, 'average_rating', keep='all')[self.BOOK_COLUMNS]
+        self._push_books(
+            (row.average_rating, -label, label, tuple(row))
+            for label, row in zip(best.index, best.itertuples(index=False))
+        )
+
+    def merge(self, other):
+        """
+        Merge the aggregates of another accumulator into this one.
+
+        Args:
+            other (StreamingBookStats): Accumulator with the same min_ratings
+
+        Returns:
+            StreamingBookStats: self
+        """
+        if other.min_ratings != self.min_ratings:
+            raise ValueError("Cannot merge accumulators with different min_ratings")
+        self.n_books += other.n_books
+        self.rating_sums.extend(other.rating_sums)
+        self.page_sums.extend(other.page_sums)
+        self.n_pages += other.n_pages
+        self.ratings_count_total += other.ratings_count_total
+        self.min_date = self._combine(min, self.min_date, other.min_date)
+        self.max_date = self._combine(max, self.max_date, other.max_date)
+        self._add_counts(self.language_counts, other.language_counts)
+        self._add_counts(self.author_counts, other.author_counts)
+        self._add_counts(self.author_rating_sums, other.author_rating_sums)
+        self._push_books(other.top_books)
+        return self
+
+    @staticmethod
+    def _ranked(counts, name):
+        """Counts as a Series sorted descending, ties in first-seen order."""
+        series = pd.Series(counts, name='count', dtype='int64')
+        series.index.name = name
+        return series.sort_values(ascending=False, kind='stable')
+
+    def get_basic_stats(self):
+        """Get basic statistics about the dataset."""
+        return {
+            'Total Books': self.n_books,
+            'Unique Authors': len(self.author_counts),
+            'Average Rating': round(math.fsum(self.rating_sums) / self.n_books, 2),
+            'Average Pages': int(math.fsum(self.page_sums) / self.n_pages),
+            'Most Common Languages': self._ranked(self.language_counts, 'language_code').head(3).to_dict(),
+            'Date Range': f"{self.min_date.year} to {self.max_date.year}",
+            'Total Ratings': self.ratings_count_total,
+            'Average Ratings per Book': int(self.ratings_count_total / self.n_books)
+        }
+
+    def get_language_distribution(self):
+        """Get distribution of books across languages."""
+        return self._ranked(self.language_counts, 'language_code')
+
+    def get_most_prolific_authors(self):
+        """Get authors with most books."""
+        return self._ranked(self.author_counts, 'authors').head(self.TOP_N)
+
+    def get_top_rated_books(self):
+        """Get top 10 books by rating among those with at least min_ratings ratings."""
+        best = sorted(self.top_books, reverse=True)
+        return pd.DataFrame(
+            [row for *_, row in best],
+            index=[label for _, _, label, _ in best],
+            columns=self.BOOK_COLUMNS
+        )
+
+    def get_top_authors_by_rating(self, min_books=3):
+        """Get top authors by average rating with minimum books threshold."""
+        authors = sorted(self.author_counts)
+        counts = pd.Series([self.author_counts[a] for a in authors], dtype='int64')
+        ratings = pd.Series([self.author_rating_sums[a] for a in authors]) / counts
+        author_stats = pd.DataFrame({'authors': authors, 'average_rating': ratings, 'title': counts})
+        mask = author_stats['title'] >= min_books
+        # Authors are in name order, which a stable sort keeps for equal ratings
+        return (author_stats[mask]
+                .sort_values('average_rating', ascending=False, kind='stable')
+                .head(self.TOP_N))
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+# Language shares observed in books.csv; the remainder is spread over rare codes
+LANGUAGE_SHARES = {
+    'eng': 0.8006, 'en-US': 0.1265, 'spa': 0.0196, 'en-GB': 0.0192,
+    'fre': 0.0129, 'ger': 0.0089, 'jpn': 0.0041
+}
+RARE_LANGUAGES = ['mul', 'zho', 'grc', 'por', 'en-CA', 'ita', 'lat', 'rus', 'swe']
+
+TITLE_WORDS = [
+    'The', 'Secret', 'History', 'of', 'Night', 'Garden', 'War', 'Love', 'House',
+    'River', 'Shadow', 'King', 'Last', 'City', 'Stars', 'Winter', 'Book', 'Girl',
+    'World', 'Dark', 'Light', 'Stone', 'Fire', 'Sea', 'Road', 'Time', 'Island',
+    'Journey', 'Empire', 'Dreams', 'Silent', 'Golden', 'Lost', 'Wild', 'Heart'
+]
+
+def _zipf_ranks(rng, n_rows, n_items, exponent):
+    """Draw item ranks 0..n_items-1 with probability proportional to 1 / (rank + 1) ** exponent."""
+    weights = 1.0 / np.arange(1, n_items + 1) ** exponent
+    cumulative = np.cumsum(weights)
+    return np.searchsorted(cumulative, rng.random(n_rows) * cumulative[-1], side='right')
+
+def _names(prefix, ranks, width):
+    """Fixed-width names such as 'Author 0000042', unique per rank."""
+    return pd.Series(ranks + 1).astype(str).str.zfill(width).radd(f'{prefix} ')
+
+def _dates(rng, n_rows, invalid_fraction):
+    """M/D/YYYY dates, a quarter zero-padded and a few impossible days like 11/31."""
+    years = np.clip(np.round(rng.normal(2000, 10, n_rows)), 1900, 2020).astype(int)
+    months = rng.integers(1, 13, n_rows)
+    days = rng.integers(1, 29, n_rows)
+    padded = rng.random(n_rows) < 0.25
+    month_text = np.where(padded, pd.Series(months).astype(str).str.zfill(2), months.astype(str))
+    day_text = np.where(padded, pd.Series(days).astype(str).str.zfill(2), days.astype(str))
+    dates = pd.Series(month_text, dtype=object) + '/' + day_text + '/' + years.astype(str)
+    invalid = rng.random(n_rows) < invalid_fraction
+    dates[invalid] = '11/31/' + pd.Series(years[invalid]).astype(str).to_numpy()
+    return dates
+
+def generate_catalog(n_rows, seed=0, first_id=1, invalid_fraction=0.0005, catalog_rows=None):
+    """
+    Generate a synthetic catalog in the raw books.csv schema.
+
+    The columns follow the shapes seen in books.csv: Zipf-like author and
+    publisher frequencies with '/'-separated co-authors, heavy-tailed
+    (log-normal) ratings and review counts, M/D/YYYY dates with and without
+    zero padding, the whitespace-padded '  num_pages' header and the empty
+    trailing column. A small share of rows has an unparseable rating or an
+    impossible date, which cleaning drops or turns into NaT.
+
+    Args:
+        n_rows (int): Number of rows
+        seed (int): Random seed; equal seeds give identical catalogs
+        first_id (int): bookID of the first row, for generating in parts
+        invalid_fraction (float): Share of rows with a bad rating or date
+        catalog_rows (int, optional): Size of the whole catalog when this is
+            one part of it, so author and publisher pools match the total
+
+    Returns:
+        pd.DataFrame: Raw rows, ready for to_csv(index=False)
+    """
+    rng = np.random.default_rng(seed)
+    catalog_rows = catalog_rows or n_rows
+
+    n_authors = max(1, int(catalog_rows * 0.6))
+    authors = _names('Author', _zipf_ranks(rng, n_rows, n_authors, 0.7), 7)
+    co_authored = rng.random(n_rows) < 0.4
+    co_authors = _names('Author', _zipf_ranks(rng, int(co_authored.sum()), n_authors, 0.7), 7)
+    authors[co_authored] = authors[co_authored] + '/' + co_authors.to_numpy()
+
+    words = np.array(TITLE_WORDS, dtype=object)
+    title = pd.Series(words[rng.integers(0, len(words), n_rows)])
+    for _ in range(2):
+        title = title + ' ' + words[rng.integers(0, len(words), n_rows)]
+    title = title + ' ' + pd.Series(np.arange(first_id, first_id + n_rows)).astype(str)
+
+    ratings_count = np.floor(rng.lognormal(6.6, 2.6, n_rows)).astype(np.int64)
+    ratings_count[rng.random(n_rows) < 0.007] = 0
+    average_rating = np.round(np.clip(rng.normal(3.93, 0.3, n_rows), 1, 5), 2)
+    average_rating[ratings_count == 0] = 0
+    rating_text = pd.Series(average_rating).astype(str)
+    rating_text[rng.random(n_rows) < invalid_fraction] = 'Jr./Unknown'
+
+    language_codes = list(LANGUAGE_SHARES) + RARE_LANGUAGES
+    rare_share = (1 - sum(LANGUAGE_SHARES.values())) / len(RARE_LANGUAGES)
+    shares = list(LANGUAGE_SHARES.values()) + [rare_share] * len(RARE_LANGUAGES)
+
+    isbn = pd.Series(rng.integers(0, 10**9, n_rows)).astype(str).str.zfill(9)
+    check_digit = np.where(rng.random(n_rows) < 0.1, 'X', rng.integers(0, 10, n_rows).astype(str))
+
+    return pd.DataFrame({
+        'bookID': np.arange(first_id, first_id + n_rows),
+        'title': title,
+        'authors': authors,
+        'average_rating': rating_text,
+        'isbn': isbn + check_digit,
+        'isbn13': '978' + isbn + rng.integers(0, 10, n_rows).astype(str),
+        'language_code': rng.choice(language_codes, n_rows, p=shares),
+        '  num_pages': np.clip(np.round(rng.lognormal(5.6, 0.6, n_rows)), 0, 6000).astype(np.int64),
+        'ratings_count': ratings_count,
+        'text_reviews_count': np.floor(ratings_count * rng.beta(1.2, 30, n_rows)).astype(np.int64),
+        'publication_date': _dates(rng, n_rows, invalid_fraction),
+        'publisher': _names('Publisher', _zipf_ranks(rng, n_rows, max(1, int(catalog_rows * 0.2)), 0.8), 6),
+        '': ''
+    })
+
+def write_catalog(path, n_rows, seed=0, chunk_rows=1_000_000):
+    """
+    Write a synthetic catalog CSV in parts, so memory stays bounded.
+
+    Args:
+        path (str): Output CSV path
+        n_rows (int): Number of rows
+        seed (int): Random seed; each part derives its own seed from it
+        chunk_rows (int): Rows generated and written at a time
+    """
+    for start in range(0, n_rows, chunk_rows):
+        part = generate_catalog(min(chunk_rows, n_rows - start), seed=(seed, start),
+                                first_id=start + 1, catalog_rows=n_rows)
+        part.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
@@ -0,0 +1,290 @@
+import numpy as np
+import pandas as pd
+from src.author_index import AuthorIndex, normalize_author
+
+
+def _author_tokens(value):
+    """Each normalized author of a '/'-separated list is one token."""
+    return [normalize_author(name) for name in value.split(AuthorIndex.SEPARATOR) if name.strip()]
+
+def _whole_value(value):
+    """The normalized value is a single token, e.g. a publisher name."""
+    value = normalize_author(value)
+    return [value] if value else []
+
+class TextIndex:
+    """Sparse TF-IDF index over the text fields of a book catalog.
+
+    Titles are split into lowercase words without English stop words, each
+    listed author is one token and the publisher name is one token. Every
+    field gets sublinear TF-IDF weights and unit length, is scaled by its
+    field weight, and the concatenated row is normalized again, so the dot
+    product of two rows is their cosine similarity. Terms found in more than
+    ``max_df`` of the books carry little information but long postings, and
+    are dropped like stop words unless they occur in fewer than
+    ``min_postings`` books, which are cheap to read anyway.
+
+    The matrix is also kept transposed (one row of postings per term), so a
+    query only reads the postings of its own terms instead of every row.
+    Nothing is ever densified.
+
+    Rows appended later are encoded with the vocabulary and IDF fitted at
+    construction and kept in a small tail block, and rows updated in place
+    are re-encoded into a block of their own that replaces their old
+    version. Both are merged once they grow past ``merge_fraction`` of the
+    catalog.
+    """
+
+    FIELDS = {'title': 1.0, 'authors': 1.0, 'publisher': 0.5}
+
+    def __init__(self, df, fields=None, max_df=0.05, min_postings=1000, merge_fraction=0.1):
+        """
+        Fit the vocabulary and IDF weights and encode every row.
+
+        Args:
+            df (pd.DataFrame): Cleaned book data with string text columns;
+                fields missing from it are skipped
+            fields (dict, optional): Column -> weight, default FIELDS
+            max_df (float): Largest fraction of books a term may occur in
+            min_postings (int): Terms in fewer books are kept regardless of
+                max_df
+            merge_fraction (float): Tail size, relative to the indexed rows,
+                at which appended rows are merged into the term postings
+        """
+        # Imported here so importing the analyzer does not load scikit-learn
+        from scipy import sparse
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        fields = self.FIELDS if fields is None else fields
+        self.fields = {field: weight for field, weight in fields.items() if field in df.columns}
+        if not self.fields:
+            raise ValueError(f"None of the text fields {list(fields)} are in the data")
+        self.merge_fraction = merge_fraction
+
+        n_rows = len(df)
+        self._vectorizers = {}
+        self._idf = {}
+        self._kept_terms = {}
+        blocks = []
+        for field in self.fields:
+            if field == 'title':
+                vectorizer = CountVectorizer(stop_words='english', dtype=np.float32)
+            else:
+                vectorizer = CountVectorizer(analyzer=_author_tokens if field == 'authors' else _whole_value,
+                                             dtype=np.float32)
+            # Each distinct value is tokenized once and broadcast to its rows
+            codes, uniques = pd.factorize(df[field])
+            try:
+                counts = vectorizer.fit_transform(uniques.astype(str))
+            except ValueError:
+                # Empty vocabulary, e.g. a column of stop words only
+                continue
+            multiplicity = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            document_frequency = (counts > 0).T @ multiplicity
+            kept = np.flatnonzero(document_frequency <= max(max_df * n_rows, min_postings - 1))
+            if len(kept) == 0:
+                continue
+            self._kept_terms[field] = kept
+            self._idf[field] = np.log((1 + n_rows) / (1 + document_frequency[kept])).astype(np.float32) + 1
+            self._vectorizers[field] = vectorizer
+            weighted = self._weigh(field, counts)
+            # Missing values map to a trailing empty row
+            weighted = sparse.vstack([weighted, sparse.csr_matrix((1, weighted.shape[1]), dtype=np.float32)],
+                                     format='csr')
+            blocks.append(weighted[np.where(codes >= 0, codes, len(uniques))])
+
+        if not blocks:
+            raise ValueError("The text fields have no indexable terms")
+        self._matrix = self._normalize(sparse.hstack(blocks, format='csr'))
+        self._by_term = self._matrix.T.tocsr()
+        self._tail = sparse.csr_matrix((0, self._matrix.shape[1]), dtype=np.float32)
+        # Sorted positions of rows updated since the last merge, and their new rows
+        self._updated_positions = np.empty(0, dtype=np.intp)
+        self._updated = sparse.csr_matrix((0, self._matrix.shape[1]), dtype=np.float32)
+
+    @property
+    def n_rows(self):
+        return self._matrix.shape[0] + self._tail.shape[0]
+
+    @property
+    def n_terms(self):
+        return self._matrix.shape[1]
+
+    def __len__(self):
+        return self.n_rows
+
+    def _weigh(self, field, counts):
+        """Sublinear TF times IDF, unit length per row, times the field weight."""
+        from sklearn.preprocessing import normalize
+
+        counts = counts.tocsr()[:, self._kept_terms[field]]
+        counts.data = (1 + np.log(counts.data)) * self._idf[field][counts.indices]
+        return normalize(counts) * np.float32(self.fields[field])
+
+    @staticmethod
+    def _normalize(matrix):
+        from sklearn.preprocessing import normalize
+
+        return normalize(matrix).astype(np.float32)
+
+    def transform(self, df):
+        """
+        Encode rows with the fitted vocabulary and IDF weights.
+
+        Terms not seen at construction are ignored.
+
+        Args:
+            df (pd.DataFrame): Rows with the indexed text columns
+
+        Returns:
+            scipy.sparse.csr_matrix: One unit-length row per book
+        """
+        from scipy import sparse
+
+        blocks = []
+        for field, vectorizer in self._vectorizers.items():
+            values = df[field].astype(object).where(df[field].notna(), '').astype(str)
+            blocks.append(self._weigh(field, vectorizer.transform(values)))
+        return self._normalize(sparse.hstack(blocks, format='csr'))
+
+    def extend(self, df):
+        """
+        Add rows to the end of the index.
+
+        Args:
+            df (pd.DataFrame): New rows with the indexed text columns
+        """
+        from scipy import sparse
+
+        self._tail = sparse.vstack([self._tail, self.transform(df)], format='csr')
+        self._merge_if_large()
+
+    def update(self, positions, df):
+        """
+        Re-encode existing rows whose text changed.
+
+        Args:
+            positions (array-like): Row positions being replaced
+            df (pd.DataFrame): New rows with the indexed text columns
+        """
+        from scipy import sparse
+
+        positions = np.concatenate([self._updated_positions, np.asarray(positions, dtype=np.intp)])
+        rows = sparse.vstack([self._updated, self.transform(df)], format='csr')
+        # The latest version of each row, in position order
+        _, first_reversed = np.unique(positions[::-1], return_index=True)
+        latest = len(positions) - 1 - first_reversed
+        self._updated_positions, self._updated = positions[latest], rows[latest]
+        self._merge_if_large()
+
+    def _merge_if_large(self):
+        """Fold the tail and updated rows into the postings once they are large."""
+        from scipy import sparse
+
+        n_pending = self._tail.shape[0] + len(self._updated_positions)
+        if n_pending <= self.merge_fraction * self._matrix.shape[0]:
+            return
+        matrix = sparse.vstack([self._matrix, self._tail, self._updated], format='csr')
+        n_rows = self.n_rows
+        order = np.arange(n_rows)
+        order[self._updated_positions] = n_rows + np.arange(len(self._updated_positions))
+        self._matrix = matrix[order]
+        self._by_term = self._matrix.T.tocsr()
+        self._tail = sparse.csr_matrix((0, self.n_terms), dtype=np.float32)
+        self._updated_positions = np.empty(0, dtype=np.intp)
+        self._updated = sparse.csr_matrix((0, self.n_terms), dtype=np.float32)
+
+    def rows(self, positions):
+        """TF-IDF rows of the given positions, as a sparse matrix."""
+        from scipy import sparse
+
+        positions = np.asarray(positions, dtype=np.intp)
+        n_indexed = self._matrix.shape[0]
+        updated = np.isin(positions, self._updated_positions)
+        indexed = (positions < n_indexed) & ~updated
+        if indexed.all():
+            return self._matrix[positions]
+        tail = ~indexed & ~updated
+        stacked = sparse.vstack([self._matrix[positions[indexed]],
+                                 self._tail[positions[tail] - n_indexed],
+                                 self._updated[np.searchsorted(self._updated_positions, positions[updated])]],
+                                format='csr')
+        # Back to the order of the given positions
+        source = np.concatenate([np.flatnonzero(indexed), np.flatnonzero(tail), np.flatnonzero(updated)])
+        return stacked[np.argsort(source)]
+
+    def similarity(self, query_positions, max_terms=64):
+        """
+        Mean cosine similarity of the catalog to the query rows, where nonzero.
+
+        The mean similarity equals the similarity to the mean query vector,
+        so the query rows are averaged into one sparse centroid and only the
+        postings of its terms are read. Only the max_terms heaviest terms of
+        the centroid are used, which bounds the cost of queries matching
+        many books (e.g. a prolific author) at the price of approximate
+        scores for them. A single book rarely has that many terms.
+
+        Args:
+            query_positions (array-like): Row positions of the query books
+            max_terms (int, optional): Centroid terms to score with; None
+                uses every term
+
+        Returns:
+            tuple: (row positions in no particular order, their scores);
+            rows sharing no term with the query are left out
+        """
+        from scipy import sparse
+
+        rows = self.rows(query_positions)
+        mean = sparse.csr_matrix(np.full((1, rows.shape[0]), 1 / max(1, rows.shape[0]), dtype=np.float32))
+        centroid = mean @ rows
+        if max_terms is not None and centroid.nnz > max_terms:
+            heaviest = np.argpartition(centroid.data, centroid.nnz - max_terms)[centroid.nnz - max_terms:]
+            centroid = sparse.csr_matrix((centroid.data[heaviest], centroid.indices[heaviest], [0, max_terms]),
+                                         shape=centroid.shape)
+        scores = centroid @ self._by_term
+        positions, values = scores.indices, scores.data
+        if self._tail.shape[0]:
+            tail = (self._tail @ centroid.T).tocoo()
+            positions = np.concatenate([positions, tail.row + self._matrix.shape[0]])
+            values = np.concatenate([values, tail.data])
+        if len(self._updated_positions):
+            # Updated rows are scored in their new version only
+            current = ~np.isin(positions, self._updated_positions)
+            updated = (self._updated @ centroid.T).tocoo()
+            positions = np.concatenate([positions[current], self._updated_positions[updated.row]])
+            values = np.concatenate([values[current], updated.data])
+        keep = values > 0
+        return positions[keep].astype(np.intp), values[keep]
+
+    @staticmethod
+    def top_k(positions, scores, k, exclude=()):
+        """
+        The k best-scoring positions, best first.
+
+        Ties are broken in favour of the later row, as in
+        RecommendationEngine.top_k. Excluded positions are removed after a
+        partial selection of k + len(exclude) rows, so they cost nothing
+        when there are many candidates.
+
+        Args:
+            positions (np.ndarray): Row positions, in any order
+            scores (np.ndarray): Score of each position
+            k (int): Number of positions to return
+            exclude (array-like): Row positions that must not be returned
+
+        Returns:
+            tuple: (selected row positions, their scores)
+        """
+        exclude = np.asarray(exclude, dtype=np.intp)
+        if k <= 0 or len(positions) == 0:
+            return np.array([], dtype=np.intp), scores[:0]
+        needed = k + len(exclude)
+        if needed < len(positions):
+            kth = np.partition(scores, len(positions) - needed)[len(positions) - needed]
+            selected = scores >= kth
+            positions, scores = positions[selected], scores[selected]
+        keep = ~np.isin(positions, exclude)
+        positions, scores = positions[keep], scores[keep]
+        order = np.lexsort((-positions, -scores))[:k]
+        return positions[order], scores[order]
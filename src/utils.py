@@ -1,34 +1,237 @@
+import hashlib
+import re
+from bisect import bisect_right
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from pandas.tseries.api import guess_datetime_format
+from src.cache import load_cached_frame
+from src.instrument import stage
 
-def load_and_validate_csv(file_path):
+REQUIRED_COLUMNS = [
+    'title', 'authors', 'average_rating', 'isbn',
+    'language_code', 'num_pages', 'ratings_count'
+]
+
+def validate_columns(df):
+    """
+    Check that a DataFrame has every required books.csv column.
+    
+    Args:
+        df (pd.DataFrame): Raw book data
+        
+    Raises:
+        ValueError: If any required column is missing
+    """
+    # Headers may be whitespace padded, as '  num_pages' is in books.csv
+    present_columns = set(df.columns.str.strip())
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in present_columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+def _dtype_kind(dtype):
+    """Cache kind of a raw read, distinct for every dtype argument of pd.read_csv."""
+    if dtype is None:
+        return 'raw'
+    if isinstance(dtype, dict):
+        spec = sorted((str(col), str(pd.api.types.pandas_dtype(value))) for col, value in dtype.items())
+    else:
+        spec = str(pd.api.types.pandas_dtype(dtype))
+    return f"raw-{hashlib.sha1(repr(spec).encode('utf-8')).hexdigest()[:8]}"
+
+def load_and_validate_csv(file_path, cache_dir=None, dtype=None):
     """
     Load CSV file and perform basic validation.
     
     Args:
         file_path (str): Path to the CSV file
+        cache_dir (str, optional): Directory for a binary cache of the parsed
+            file, shared with BookAnalyzer and reused until the CSV changes
+        dtype (dict, optional): Column dtypes passed to pd.read_csv
         
     Returns:
         pd.DataFrame: Validated DataFrame
     """
     try:
-        df = pd.read_csv(file_path)
-        required_columns = [
-            'title', 'authors', 'average_rating', 'isbn',
-            'language_code', 'num_pages', 'ratings_count'
-        ]
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
-            
+        if cache_dir is None:
+            df = pd.read_csv(file_path, dtype=dtype)
+        else:
+            df = load_cached_frame(file_path, cache_dir, _dtype_kind(dtype),
+                                   lambda: pd.read_csv(file_path, dtype=dtype))
+        validate_columns(df)
         return df
     except FileNotFoundError:
         raise FileNotFoundError(f"Could not find CSV file at {file_path}")
     except pd.errors.EmptyDataError:
         raise ValueError("The CSV file is empty")
 
+def iter_clean_chunks(file_path, chunksize=100_000):
+    """
+    Read, validate and clean a CSV file in fixed-size chunks.
+    
+    Index labels continue across chunks, so they match the labels of a
+    whole-file load.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        chunksize (int): Number of raw rows per chunk
+        
+    Yields:
+        pd.DataFrame: Cleaned chunk
+    """
+    try:
+        reader = pd.read_csv(file_path, chunksize=chunksize)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Could not find CSV file at {file_path}")
+    except pd.errors.EmptyDataError:
+        raise ValueError("The CSV file is empty")
+    
+    with reader:
+        for chunk in reader:
+            validate_columns(chunk)
+            yield clean_books(chunk)
+
+def clean_books(df):
+    """
+    Clean raw book data by handling missing values and data types.
+    
+    Args:
+        df (pd.DataFrame): Raw rows in the books.csv schema
+        
+    Returns:
+        pd.DataFrame: Cleaned copy of the data
+    """
+    # Drop unnamed columns
+    df = df.drop(columns=[col for col in df.columns if 'Unnamed' in col])
+    
+    with stage('numeric'):
+        # Convert ratings to float
+        df['average_rating'] = pd.to_numeric(df['average_rating'], errors='coerce')
+        
+        # Convert num_pages to numeric, removing any leading/trailing spaces
+        raw_pages = df['  num_pages'] if '  num_pages' in df.columns else df['num_pages']
+        df['num_pages'] = pd.to_numeric(raw_pages.astype(str).str.strip(), errors='coerce')
+    
+    # Drop empty rows
+    with stage('drop_empty') as record:
+        df = df.dropna(subset=['title', 'authors', 'average_rating'])
+        record['rows'] = len(df)
+    
+    # Convert dates to datetime
+    with stage('parse_dates') as record:
+        df['publication_date'], n_unparseable = parse_dates(df['publication_date'])
+        record['rows'] = len(df)
+    df.attrs['unparseable_dates'] = n_unparseable
+    return df
+
+# Strings pandas skips when inferring a date format from the first value
+_SKIPPED_DATE_STRINGS = {'', 'NaT', 'nat', 'NAT', 'nan', 'NaN', 'NAN', 'now', 'today'}
+
+def parse_dates(values, lenient=False):
+    """
+    Parse date strings with the results of pd.to_datetime(values, errors='coerce').
+    
+    Dates repeat heavily, so each distinct string is parsed only once and
+    the results are broadcast back to the rows. The format is detected once
+    from the first value, as pandas does, and applied as a strict vectorized
+    format string. Without a detectable format every distinct string is
+    parsed individually.
+    
+    Args:
+        values (pd.Series): Date strings
+        lenient (bool): Give strings that do not match the detected format
+            a second, per-string pass. This recovers dates in other formats,
+            so results can differ from pd.to_datetime.
+        
+    Returns:
+        tuple: (pd.Series of datetimes with NaT for unparseable values,
+        number of non-missing values that could not be parsed)
+    """
+    if not (pd.api.types.is_string_dtype(values.dtype) or values.dtype == object):
+        parsed = pd.to_datetime(values, errors='coerce')
+        return parsed, int((values.notna() & parsed.isna()).sum())
+    
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques, dtype=object)
+    first = next((value for value in uniques
+                  if not (isinstance(value, str) and value in _SKIPPED_DATE_STRINGS)), None)
+    date_format = guess_datetime_format(first) if type(first) is str else None
+    
+    if date_format is None:
+        parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors='coerce')
+    else:
+        parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=date_format, errors='coerce')
+        failed = parsed.isna().to_numpy()
+        if lenient and failed.any():
+            parsed[failed] = pd.to_datetime(pd.Series(uniques[failed], dtype=object),
+                                            format='mixed', errors='coerce').to_numpy()
+    
+    # Missing values have code -1 and are filled with NaT
+    result = pd.Series(parsed.array.take(codes, allow_fill=True), index=values.index, name=values.name)
+    failed = parsed.isna().to_numpy() & ~pd.Series(uniques).isin(_SKIPPED_DATE_STRINGS).to_numpy()
+    return result, int(np.bincount(codes + 1, minlength=len(uniques) + 1)[1:][failed].sum())
+
+_REGEX_SPECIALS = re.compile(r'[\\^$*+?{}\[\]|()]')
+
+def _required_literal(pattern):
+    """Longest literal run an ASCII pattern using only '.' wildcards must contain."""
+    if not pattern.isascii() or _REGEX_SPECIALS.search(pattern):
+        return ''
+    return max(pattern.split('.'), key=len).casefold()
+
+def match_values(values, patterns):
+    """
+    Match many case-insensitive regex patterns against many strings.
+    
+    Equivalent to calling ``Series.str.contains(pattern, case=False, na=False)``
+    once per pattern, but each pattern is scanned over a single newline-joined
+    string instead of once per value, and only candidate hits are re-checked
+    individually. Plain names (optionally with '.' wildcards, as in
+    'J.K. Rowling') are located with a literal search on casefolded text.
+    
+    Args:
+        values (array-like): Strings to search; missing values never match
+        patterns (list): Regex patterns
+        
+    Returns:
+        np.ndarray: Boolean matrix of shape (len(patterns), len(values))
+    """
+    values = pd.Series(values, dtype=object)
+    present = values.notna().to_numpy()
+    texts = values.where(present, '').astype(str).tolist()
+    folded = [text.casefold() for text in texts]
+    
+    def line_index(lines):
+        lengths = [len(line) + 1 for line in lines]
+        return '\n'.join(lines), np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+    
+    joined, starts = line_index(texts)
+    joined_folded, starts_folded = line_index(folded)
+    folded_starts_list = starts_folded.tolist() + [len(joined_folded) + 1]
+    
+    matches = np.zeros((len(patterns), len(texts)), dtype=bool)
+    for row, pattern in enumerate(patterns):
+        literal = _required_literal(pattern)
+        if literal:
+            # Jump to the next line after each hit; one hit per line is enough
+            candidates = []
+            pos = joined_folded.find(literal)
+            while pos != -1:
+                line = bisect_right(folded_starts_list, pos) - 1
+                candidates.append(line)
+                pos = joined_folded.find(literal, folded_starts_list[line + 1])
+            candidates = np.array(candidates, dtype=np.int64)
+        else:
+            scan = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+            offsets = np.fromiter((match.start() for match in scan.finditer(joined)), dtype=np.int64)
+            candidates = np.unique(np.searchsorted(starts, offsets, side='right') - 1)
+        
+        candidates = candidates[present[candidates]]
+        if len(candidates) > 0:
+            check = re.compile(pattern, re.IGNORECASE)
+            for idx in candidates:
+                matches[row, idx] = check.search(texts[idx]) is not None
+    return matches
+
 def plot_rating_distribution(df):
     """
     Plot the distribution of book ratings.
@@ -36,6 +239,10 @@ def plot_rating_distribution(df):
     Args:
         df (pd.DataFrame): DataFrame containing book data
     """
+    # Plotting libraries load on first use, keeping imports of this module fast
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     plt.figure(figsize=(10, 6))
     sns.histplot(data=df, x='average_rating', bins=50)
     plt.title('Distribution of Book Ratings')
@@ -43,18 +250,85 @@ def plot_rating_distribution(df):
     plt.ylabel('Count')
     return plt
 
-def create_author_summary(df, author_name):
+# Above this many points, mode='auto' scatter plots are drawn as a density image
+DENSITY_THRESHOLD = 50_000
+
+def _bin_edges(values, bins, log):
+    """Histogram bin edges spanning the values, log-spaced for a log axis."""
+    low, high = values.min(), values.max()
+    if log:
+        return np.geomspace(low, high, bins + 1) if high > low else np.array([low / 2, low * 2])
+    return np.linspace(low, high, bins + 1) if high > low else np.array([low - 0.5, low + 0.5])
+
+def plot_scatter(x, y, mode='auto', log_x=False, bins=200):
+    """
+    Plot y against x as points or as a 2-D density image.
+    
+    Density mode counts points into a bins x bins histogram with NumPy and
+    draws it as one rasterized mesh, so drawing time and SVG/PDF size do not
+    grow with the number of points. On a log x axis the x bins are
+    log-spaced and non-positive values are left out, as a log axis would.
+    
+    Args:
+        x, y (pd.Series or np.ndarray): Coordinates of the points
+        mode (str): 'points', 'density', or 'auto' for density above
+            DENSITY_THRESHOLD points
+        log_x (bool): Use a log-scaled x axis
+        bins (int): Number of bins per axis in density mode
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm
+    
+    if mode not in ('auto', 'points', 'density'):
+        raise ValueError(f"Unknown plot mode: {mode!r}, expected 'auto', 'points' or 'density'")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if mode == 'auto':
+        mode = 'density' if len(x) > DENSITY_THRESHOLD else 'points'
+    
+    keep = np.isfinite(x) & np.isfinite(y)
+    if log_x:
+        keep &= x > 0
+    if mode == 'points' or not keep.any():
+        plt.scatter(x, y, alpha=0.5)
+    else:
+        x, y = x[keep], y[keep]
+        counts, x_edges, y_edges = np.histogram2d(
+            x, y, bins=[_bin_edges(x, bins, log_x), _bin_edges(y, bins, False)]
+        )
+        mesh = plt.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0),
+                              norm=LogNorm(), cmap='viridis', rasterized=True)
+        plt.colorbar(mesh, label='Number of Books')
+    if log_x:
+        plt.xscale('log')
+    return plt
+
+def create_author_summary(df, author_name, author_index=None, match='substring', author_table=None):
     """
     Create a summary of an author's books.
     
     Args:
         df (pd.DataFrame): DataFrame containing book data
         author_name (str): Name of the author
+        author_index (AuthorIndex, optional): Index built over df['authors'],
+            required for the 'exact' and 'prefix' match modes
+        match (str): 'substring' for a case-insensitive pattern search, or
+            'exact'/'prefix' for an author index lookup
+        author_table (AuthorTable, optional): Per-author aggregates of df,
+            e.g. BookAnalyzer.get_author_table(split_authors=True); with
+            match='exact' the summary is looked up instead of computed
         
     Returns:
         dict: Summary statistics for the author
     """
-    author_df = df[df['authors'].str.contains(author_name, case=False, na=False)]
+    if match == 'exact' and author_table is not None:
+        return author_table.summary(author_name)
+    if match == 'substring':
+        author_df = df[df['authors'].str.contains(author_name, case=False, na=False)]
+    elif author_index is None:
+        raise ValueError(f"match={match!r} requires an author_index")
+    else:
+        author_df = df.iloc[author_index.lookup(author_name, match)]
     
     if len(author_df) == 0:
         return None
@@ -83,6 +357,39 @@ def format_book_recommendations(recommendations_df):
         
     formatted_df = recommendations_df.copy()
     formatted_df['average_rating'] = formatted_df['average_rating'].round(2)
-    formatted_df['ratings_count'] = formatted_df['ratings_count'].apply(lambda x: f"{x:,}")
+    formatted_df['ratings_count'] = format_thousands(formatted_df['ratings_count'])
+    
+    return formatted_df
+
+def format_thousands(values):
+    """
+    Format numbers with comma thousands separators, as f"{x:,}" does.
+    
+    Integer columns, including uint64 and nullable integers, are formatted
+    as whole arrays: Arrow casts the values to digit strings, which are
+    left-padded to a multiple of three characters, cut into three-digit
+    groups and joined with commas. Other values are formatted one by one.
+    Missing values stay missing.
+    
+    Args:
+        values (pd.Series): Numbers to format
+        
+    Returns:
+        pd.Series: Formatted strings with the index of values
+    """
+    if not pd.api.types.is_integer_dtype(values.dtype):
+        return values.astype(object).map('{:,}'.format, na_action='ignore')
+    import pyarrow as pa
+    import pyarrow.compute as pc
     
-    return formatted_df
\ No newline at end of file
+    text = pc.cast(pa.array(values), pa.string())
+    negative = pc.starts_with(text, '-')
+    digits = pc.utf8_ltrim(text, '-')
+    longest = pc.max(pc.utf8_length(digits)).as_py() or 1
+    width = -(-longest // 3) * 3
+    padded = pc.utf8_lpad(digits, width, ' ')
+    groups = [pc.utf8_slice_codeunits(padded, start, start + 3) for start in range(0, width, 3)]
+    # Groups that are all padding leave leading spaces and commas behind
+    grouped = pc.utf8_ltrim(pc.binary_join_element_wise(*groups, ','), ' ,')
+    signed = pc.if_else(negative, pc.binary_join_element_wise('-', grouped, ''), grouped)
+    return pd.Series(signed, index=values.index, dtype=str)
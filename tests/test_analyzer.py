@@ -1,8 +1,11 @@
+import os
+import shutil
+import tempfile
 import unittest
 import pandas as pd
 import numpy as np
 from src.analyzer import BookAnalyzer
-from src.utils import load_and_validate_csv, create_author_summary
+from src.utils import load_and_validate_csv, create_author_summary, match_values, parse_dates
 
 class TestBookAnalyzer(unittest.TestCase):
     @classmethod
@@ -18,8 +21,14 @@ class TestBookAnalyzer(unittest.TestCase):
             'ratings_count': [1000, 500, 750],
             'publication_date': ['2020-01-01', '2020-02-01', '2020-03-01']
         })
-        cls.test_data.to_csv('test_books.csv', index=False)
-        cls.analyzer = BookAnalyzer('test_books.csv')
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.csv_path = os.path.join(cls.tmp_dir.name, 'test_books.csv')
+        cls.test_data.to_csv(cls.csv_path, index=False)
+        cls.analyzer = BookAnalyzer(cls.csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
 
     def test_get_language_distribution(self):
         """Test language distribution calculation."""
@@ -39,17 +48,121 @@ class TestBookAnalyzer(unittest.TestCase):
         self.assertEqual(top_authors['Author1'], 2)
         self.assertEqual(top_authors['Author2'], 1)
 
+    def test_get_most_prolific_authors_split(self):
+        """Test per-individual-author counts."""
+        top_authors = self.analyzer.get_most_prolific_authors(split_authors=True)
+        self.assertEqual(top_authors['Author1'], 2)
+        top_rated = self.analyzer.get_top_authors_by_rating(min_books=2, split_authors=True)
+        self.assertEqual(list(top_rated['authors']), ['Author1'])
+        self.assertAlmostEqual(top_rated.iloc[0]['average_rating'], 4.35)
+
+    def test_analyze_author_performance_exact(self):
+        """Test author index lookups match the substring scan."""
+        exact = self.analyzer.analyze_author_performance('author1', match='exact')
+        self.assertTrue(exact.equals(self.analyzer.analyze_author_performance('Author1')))
+
     def test_recommend_books(self):
         """Test book recommendation system."""
         recommendations = self.analyzer.recommend_books('Author1', n_recommendations=1)
         self.assertEqual(len(recommendations), 1)
         self.assertEqual(recommendations.iloc[0]['authors'], 'Author2')
 
+    def _gapped_catalog(self):
+        """Analyzers of a catalog with bad ratings, and of the same catalog without them."""
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        rng = np.random.default_rng(5)
+        n_books = 120
+        raw = pd.DataFrame({
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 12}' for i in range(n_books)],
+            'average_rating': rng.uniform(1, 5, n_books).round(2).astype(object),
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': 'eng',
+            'num_pages': rng.integers(50, 1000, n_books),
+            'ratings_count': rng.integers(0, 100000, n_books),
+            'publication_date': '2001-02-03'
+        })
+        raw.loc[[3, 40, 41, 77], 'average_rating'] = 'bad'
+        raw.to_csv(os.path.join(tmp_dir, 'gaps.csv'), index=False)
+        raw.drop([3, 40, 41, 77]).to_csv(os.path.join(tmp_dir, 'clean.csv'), index=False)
+        gapped = BookAnalyzer(os.path.join(tmp_dir, 'gaps.csv'))
+        self.assertEqual(gapped.df.index[-1], n_books - 1)
+        return gapped, BookAnalyzer(os.path.join(tmp_dir, 'clean.csv'))
+
+    def test_recommend_books_after_dropped_rows(self):
+        """Test recommendations use row positions when cleaning leaves gaps in the index."""
+        gapped, clean = self._gapped_catalog()
+        for author in ['Author0', 'Author11']:
+            for match in ['substring', 'exact']:
+                expected = clean.recommend_books(author, match=match)['title'].tolist()
+                self.assertEqual(gapped.recommend_books(author, match=match)['title'].tolist(), expected)
+            exact = gapped.recommend_books(author, n_recommendations=3)
+            self.assertEqual(gapped.recommend_books(author, n_recommendations=3, n_probe=1000)['title'].tolist(),
+                             exact['title'].tolist())
+
+    def test_recommend_books_batch_after_dropped_rows(self):
+        """Test batched and single recommendations agree when the index has gaps."""
+        gapped, _ = self._gapped_catalog()
+        queries = [(f'Author{i}', 'authors') for i in range(12)] + [('Book11', 'title')]
+        books = {}
+        for query_value, attribute, label in gapped.recommend_books_batch(queries).index:
+            books.setdefault((query_value, attribute), []).append(label)
+        for query_value, attribute in queries:
+            single = gapped.recommend_books(query_value, attribute)
+            self.assertEqual(books[(query_value, attribute)], list(single.index))
+
+    def test_recommend_books_batch(self):
+        """Test batched recommendations match single-query recommendations."""
+        queries = [('Author1', 'authors'), ('Book2', 'title'), ('Nobody', 'authors')]
+        batch = self.analyzer.recommend_books_batch(queries, n_recommendations=1)
+        self.assertEqual(len(batch), 2)
+        for query_value, attribute in queries[:2]:
+            single = self.analyzer.recommend_books(query_value, attribute, n_recommendations=1)
+            self.assertEqual(list(batch.loc[(query_value, attribute)].index), list(single.index))
+
+    def test_utils_match_values(self):
+        """Test bulk matching agrees with str.contains."""
+        values = pd.Series(['J.K. Rowling/Mary GrandPré', 'JK Rowling', None, 'Stephen King'])
+        patterns = ['j.k. rowling', 'king$', 'GRANDPRÉ', '']
+        matches = match_values(values, patterns)
+        for row, pattern in enumerate(patterns):
+            expected = values.str.contains(pattern, case=False, na=False).to_numpy(dtype=bool)
+            np.testing.assert_array_equal(matches[row], expected)
+
+    def test_utils_parse_dates(self):
+        """Test fast date parsing matches pd.to_datetime and counts failures."""
+        for values in [pd.Series(['9/16/2006', '11/31/2000', None, '09/01/2004', '9/16/2006', '6']),
+                       pd.Series(['2020-01-05', 'NaT', '2020-13-01', '2020-01-05 10:00']),
+                       pd.Series(['6', 'Jan 5 2003', None], dtype=object)]:
+            parsed, n_unparseable = parse_dates(values)
+            expected = pd.to_datetime(values, errors='coerce')
+            pd.testing.assert_series_equal(parsed, expected)
+            self.assertEqual(n_unparseable, (values.notna() & (values != 'NaT') & expected.isna()).sum())
+
+        parsed, n_unparseable = parse_dates(pd.Series(['1/2/2003', '2003-05-06', 'x']), lenient=True)
+        self.assertEqual(parsed[1], pd.Timestamp('2003-05-06'))
+        self.assertEqual(n_unparseable, 1)
+        self.assertEqual(self.analyzer.unparseable_dates, 0)
+
     def test_utils_create_author_summary(self):
         """Test author summary creation."""
         summary = create_author_summary(self.analyzer.df, 'Author1')
         self.assertEqual(summary['num_books'], 2)
         self.assertAlmostEqual(summary['avg_rating'], 4.35)
 
+    def test_correlation_plot_modes(self):
+        """Test point and density rendering of the correlation plots."""
+        from matplotlib.collections import PathCollection, QuadMesh
+        plt = self.analyzer.plot_ratings_reviews_correlation()
+        self.assertIsInstance(plt.gca().collections[0], PathCollection)
+        plt.close('all')
+        plt = self.analyzer.plot_ratings_reviews_correlation(mode='density')
+        mesh = plt.gca().collections[0]
+        self.assertIsInstance(mesh, QuadMesh)
+        self.assertEqual(mesh.get_array().sum(), 3)
+        self.assertEqual(plt.gca().get_xscale(), 'log')
+        plt.close('all')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
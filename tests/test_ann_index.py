@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.ann_index import IVFIndex, evaluate_recall
+
+class TestIVFIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Random unit vectors and a small raw catalog shared by all tests."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((2000, 3))
+        cls.vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        cls.index = IVFIndex.build(cls.vectors, n_lists=20)
+        cls.tmp_dir = tempfile.mkdtemp()
+
+        n_books = 300
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 30}' for i in range(n_books)],
+            'average_rating': rng.uniform(1, 5, n_books).round(2),
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': 'eng',
+            'num_pages': rng.integers(50, 1000, n_books),
+            'ratings_count': rng.integers(0, 100000, n_books),
+            'publication_date': '2000-01-01'
+        }).to_csv(cls.csv_path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_probing_every_cell_is_exact(self):
+        """With n_probe equal to the number of cells the search is exhaustive."""
+        query = self.vectors[:5].mean(axis=0)
+        positions, scores = self.index.search(query, 10, n_probe=self.index.n_lists)
+        expected = np.argsort(-(self.vectors @ query), kind='stable')[:10]
+        np.testing.assert_array_equal(positions, expected)
+        self.assertTrue(np.all(np.diff(scores) <= 0))
+        self.assertEqual(self.index.offsets[-1], len(self.vectors))
+        np.testing.assert_array_equal(np.sort(self.index.positions), np.arange(len(self.vectors)))
+
+    def test_exclude_drops_candidates(self):
+        """Excluded rows never come back."""
+        positions, _ = self.index.search(self.vectors[7], 5, n_probe=4,
+                                         exclude=lambda candidates: candidates % 2 == 1)
+        self.assertEqual(len(positions), 5)
+        self.assertTrue(np.all(positions % 2 == 0))
+
+    def test_save_and_memory_mapped_load(self):
+        """A saved index opens memory-mapped and answers identically."""
+        path = os.path.join(self.tmp_dir, 'ivf')
+        self.index.save(path)
+        loaded = IVFIndex.load(path)
+        self.assertIsInstance(loaded.vectors, np.memmap)
+        for query in self.vectors[:20]:
+            np.testing.assert_array_equal(loaded.search(query, 10, n_probe=3)[0],
+                                          self.index.search(query, 10, n_probe=3)[0])
+
+    def test_evaluate_recall_reports_each_setting(self):
+        """Recall grows with n_probe and is perfect when every cell is searched."""
+        results = evaluate_recall(self.index, self.vectors, k=10, n_queries=30, n_probes=(1, 20))
+        self.assertEqual(list(results.index), ['exact', 'n_probe=1', 'n_probe=20'])
+        self.assertEqual(results.loc['n_probe=20', 'recall@10'], 1.0)
+        self.assertLessEqual(results.loc['n_probe=1', 'recall@10'], 1.0)
+        self.assertTrue({'mean_ms', 'p50_ms', 'p99_ms'} <= set(results.columns))
+
+    def test_recommend_books_with_ann_index(self):
+        """Approximate recommendations match exact ones when every cell is probed."""
+        analyzer = BookAnalyzer(self.csv_path)
+        index = analyzer.build_ann_index(n_lists=8)
+        for query in ('Author3', 'Author17'):
+            pd.testing.assert_frame_equal(analyzer.recommend_books(query, n_probe=8),
+                                          analyzer.recommend_books(query))
+        self.assertEqual(len(analyzer.recommend_books('Author3', n_recommendations=4, n_probe=1)), 4)
+
+        path = os.path.join(self.tmp_dir, 'analyzer-ivf')
+        analyzer.build_ann_index(n_lists=8, path=path)
+        fresh = BookAnalyzer(self.csv_path)
+        self.assertEqual(fresh.load_ann_index(path).n_lists, index.n_lists)
+        pd.testing.assert_frame_equal(fresh.recommend_books('Author3', n_probe=2),
+                                      analyzer.recommend_books('Author3', n_probe=2))
+
+        fresh.append(pd.DataFrame({
+            'bookID': [1000], 'title': ['New Book'], 'authors': ['Author3'], 'average_rating': [4.0],
+            'isbn': ['x'], 'language_code': ['eng'], 'num_pages': [300], 'ratings_count': [10],
+            'publication_date': ['2001-01-01']
+        }))
+        with self.assertRaises(ValueError):
+            fresh.load_ann_index(path)
+
+    def test_appended_books_are_searched(self):
+        """Books appended after the build are scored exactly alongside the index."""
+        analyzer = BookAnalyzer(self.csv_path)
+        analyzer.build_ann_index(n_lists=8)
+        twin = analyzer.df.iloc[[0]]
+        analyzer.append(pd.DataFrame({
+            'bookID': [1000], 'title': ['Twin'], 'authors': ['Newcomer'],
+            'average_rating': twin['average_rating'].to_numpy(), 'isbn': ['x'], 'language_code': ['eng'],
+            'num_pages': twin['num_pages'].to_numpy(), 'ratings_count': twin['ratings_count'].to_numpy(),
+            'publication_date': ['2001-01-01']
+        }))
+        recommendations = analyzer.recommend_books('Book0', attribute='title', n_probe=1)
+        self.assertEqual(recommendations['title'].iloc[0], 'Twin')
+        pd.testing.assert_frame_equal(recommendations, analyzer.recommend_books('Book0', attribute='title'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+
+class TestAppend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build a raw catalog with distinct ratings, split into base and new rows."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        n_books = 240
+        cls.raw = pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' if i % 29 else None for i in range(n_books)],
+            'authors': [f'Author{(i * 7) % 19}' for i in range(n_books)],
+            'average_rating': [round(1 + (i * 37 % n_books) / 61, 6) for i in range(n_books)],
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'isbn13': [f'978{i:010d}' for i in range(n_books)],
+            'language_code': [['eng', 'spa', 'fre', 'eng'][i % 4] for i in range(n_books)],
+            '  num_pages': [str(50 + i) if i % 13 else 'n/a' for i in range(n_books)],
+            'ratings_count': [(i * 389) % 5000 for i in range(n_books)],
+            'publication_date': [f'{i % 12 + 1}/{i % 28 + 1}/{1950 + i % 70}' for i in range(n_books)]
+        })
+        # New rows arrive as read from a CSV, like the loaded ones
+        path = os.path.join(cls.tmp_dir, 'raw.csv')
+        cls.raw.to_csv(path, index=False)
+        cls.raw = pd.read_csv(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def load(self, raw, name, compact=False):
+        path = os.path.join(self.tmp_dir, name)
+        raw.to_csv(path, index=False)
+        return BookAnalyzer(path, compact=compact)
+
+    def assertMatchesFresh(self, analyzer, fresh):
+        self.assertTrue(analyzer.df.index.equals(fresh.df.index))
+        pd.testing.assert_frame_equal(analyzer._restore(analyzer.df), fresh._restore(fresh.df))
+        self.assertEqual(analyzer.get_basic_stats(), fresh.get_basic_stats())
+        pd.testing.assert_series_equal(analyzer.get_language_distribution(), fresh.get_language_distribution())
+        # Updates can reorder authors with equal counts
+        pd.testing.assert_series_equal(analyzer.get_most_prolific_authors().sort_index(),
+                                       fresh.get_most_prolific_authors().sort_index())
+        pd.testing.assert_frame_equal(analyzer.get_top_rated_books(), fresh.get_top_rated_books())
+        for split_authors in (False, True):
+            pd.testing.assert_frame_equal(analyzer.get_top_authors_by_rating(min_books=5, split_authors=split_authors),
+                                          fresh.get_top_authors_by_rating(min_books=5, split_authors=split_authors))
+            pd.testing.assert_frame_equal(analyzer.get_author_table(split_authors).to_frame(),
+                                          fresh.get_author_table(split_authors).to_frame())
+        pd.testing.assert_frame_equal(analyzer.analyze_author_performance('author3', match='exact'),
+                                      fresh.analyze_author_performance('author3', match='exact'))
+
+    def test_inserts_match_fresh_load(self):
+        """Appending in several batches gives the same results as loading everything."""
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                analyzer = self.load(self.raw.iloc[:150], 'base.csv', compact)
+                analyzer.get_recommender()
+                for start in range(150, len(self.raw), 40):
+                    result = analyzer.append(self.raw.iloc[start:start + 40])
+                    self.assertEqual(result['updated'], 0)
+                fresh = self.load(self.raw, 'full.csv', compact)
+                self.assertMatchesFresh(analyzer, fresh)
+
+                analyzer.refit_recommender()
+                pd.testing.assert_frame_equal(analyzer.recommend_books('Author5'),
+                                              fresh.recommend_books('Author5'))
+
+    def test_upsert_replaces_existing_rows(self):
+        """Rows with a known key replace the existing book instead of adding one."""
+        for key, compact in (('bookID', False), ('isbn13', False), ('bookID', True)):
+            with self.subTest(key=key, compact=compact):
+                changed = self.raw.iloc[[3, 40, 77]].copy()
+                changed['average_rating'] = [4.9, 1.1, 3.3]
+                changed['authors'] = ['Author3', 'Author4', 'Author3']
+                analyzer = self.load(self.raw.iloc[:200], 'base.csv', compact)
+                analyzer.get_recommender()
+                result = analyzer.append(pd.concat([self.raw.iloc[200:], changed]), key=key)
+                # Two of the new rows have no title and are dropped by cleaning
+                self.assertEqual(result, {'inserted': 38, 'updated': 3})
+
+                expected = self.raw.copy()
+                expected.iloc[[3, 40, 77]] = changed
+                self.assertMatchesFresh(analyzer, self.load(expected, 'full.csv', compact))
+
+    def test_labels_only_for_inserted_rows(self):
+        """Updates and superseded duplicates take no row labels, so later inserts match a fresh load."""
+        changed = self.raw.iloc[[3, 40, 77, 120]].copy()
+        changed['average_rating'] = [4.9, 1.1, 3.3, 2.2]
+        analyzer = self.load(self.raw.iloc[:200], 'base.csv')
+        self.assertEqual(analyzer.append(changed), {'inserted': 0, 'updated': 4})
+        # An earlier copy of book 211 is replaced by the later one in the same batch
+        outdated = self.raw.iloc[[210]].assign(average_rating=1.0)
+        result = analyzer.append(pd.concat([outdated, self.raw.iloc[200:]]))
+        self.assertEqual(result, {'inserted': 38, 'updated': 0})
+
+        expected = self.raw.copy()
+        expected.iloc[[3, 40, 77, 120]] = changed
+        self.assertMatchesFresh(analyzer, self.load(expected, 'full.csv'))
+
+    def test_updates_keep_derived_structures(self):
+        """Updates adjust the author index and tables, text and ANN indexes instead of dropping them."""
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                analyzer = self.load(self.raw, 'full.csv', compact)
+                structures = [analyzer.get_author_index(), analyzer.get_author_table(),
+                              analyzer.get_author_table(split_authors=True), analyzer.get_text_index(),
+                              analyzer.get_ann_index(), analyzer.get_query_engine()]
+                changed = self.raw.iloc[[5, 6, 120]].copy()
+                changed['authors'] = ['Author3/New Writer', 'Author3', 'Author9']
+                changed['title'] = ['Brand New Title', 'Book6', 'Another Title']
+                changed['ratings_count'] = [4999, 0, 17]
+                with mock.patch('src.analyzer.compact_frame', side_effect=AssertionError("re-encoded the frame")):
+                    self.assertEqual(analyzer.append(changed), {'inserted': 0, 'updated': 3})
+                self.assertEqual(structures, [analyzer.get_author_index(), analyzer.get_author_table(),
+                                              analyzer.get_author_table(split_authors=True),
+                                              analyzer.get_text_index(), analyzer.get_ann_index(),
+                                              analyzer.get_query_engine()])
+
+                expected = self.raw.copy()
+                expected.iloc[[5, 6, 120]] = changed
+                fresh = self.load(expected, 'expected.csv', compact)
+                self.assertMatchesFresh(analyzer, fresh)
+                positions = analyzer.df.index.get_indexer([5, 6, 120])
+                np.testing.assert_array_equal(analyzer.get_author_index().lookup('new writer'), positions[:1])
+                text_index = analyzer.get_text_index()
+                self.assertEqual((text_index.rows(positions[::-1]) != text_index.transform(changed[::-1])).nnz, 0)
+                # Probing every cell gives the exact result, updated rows included
+                pd.testing.assert_frame_equal(analyzer.recommend_books('Author3', n_probe=1000),
+                                              analyzer.recommend_books('Author3'))
+
+    def test_compact_append_widens_columns(self):
+        """New rows that do not fit a compact dtype widen that column only."""
+        analyzer = self.load(self.raw.iloc[:200], 'base.csv', compact=True)
+        dtypes = analyzer.df.dtypes
+        self.assertEqual((dtypes['ratings_count'], dtypes['average_rating']), (np.uint16, np.float32))
+        new_rows = self.raw.iloc[200:].copy()
+        new_rows['ratings_count'] = 10 ** 7
+        new_rows['language_code'] = 'ger'
+        new_rows['average_rating'] = 1 / 3
+        with mock.patch('src.analyzer.compact_frame', side_effect=AssertionError("re-encoded the frame")):
+            analyzer.append(new_rows)
+            widened = analyzer.df.dtypes
+        self.assertEqual(widened['ratings_count'], np.uint32)
+        self.assertEqual(widened['language_code'], 'category')
+        self.assertIn('ger', widened['language_code'].categories)
+        self.assertEqual(widened['average_rating'], np.float64)
+        self.assertNotIn('average_rating', analyzer._codecs)
+        self.assertEqual(widened['title'], dtypes['title'])
+        self.assertMatchesFresh(analyzer, self.load(pd.concat([self.raw.iloc[:200], new_rows]), 'full.csv', True))
+
+    def test_recommender_extended_without_refit(self):
+        """Appended rows are scored with the scaler fitted at load time."""
+        analyzer = self.load(self.raw.iloc[:200], 'base.csv')
+        recommender = analyzer.get_recommender()
+        mean = recommender.scaler.mean_.copy()
+        analyzer.append(self.raw.iloc[200:])
+        self.assertIs(analyzer.get_recommender(), recommender)
+        self.assertEqual(len(recommender.unit_features), len(analyzer.df))
+        self.assertTrue((recommender.scaler.mean_ == mean).all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.author_analytics import SUMMARY_COLUMNS, author_analytics
+from src.utils import create_author_summary
+
+class TestAuthorAnalytics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build a catalog with co-authored books and tied ratings."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(3)
+        n_books = 400
+        authors = [f'Author{i % 37}' + (f'/Author{(i * 5) % 11}' if i % 3 == 0 else '') for i in range(n_books)]
+        csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': authors,
+            'average_rating': rng.choice([3.5, 4.0, 4.5], n_books),
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': 'eng',
+            'num_pages': rng.integers(50, 900, n_books),
+            'ratings_count': rng.choice([10, 500, 2000], n_books),
+            'publication_date': [f'{1950 + i % 60}-{i % 12 + 1:02d}-{i % 27 + 1:02d}' for i in range(n_books)]
+        }).to_csv(csv_path, index=False)
+        cls.analyzer = BookAnalyzer(csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_summaries_match_per_author_summary(self):
+        """Every author's row equals create_author_summary with an exact match."""
+        summaries, _ = self.analyzer.analyze_authors()
+        index = self.analyzer.get_author_index()
+        self.assertEqual(list(summaries.columns), SUMMARY_COLUMNS)
+        self.assertEqual(len(summaries), len(index))
+        for author, row in summaries.iterrows():
+            expected = create_author_summary(self.analyzer.df, author, index, match='exact')
+            self.assertEqual(row[['num_books', 'total_ratings', 'most_rated_book', 'highest_rated_book']].tolist(),
+                             [expected['num_books'], expected['total_ratings'],
+                              expected['most_rated_book'], expected['highest_rated_book']])
+            self.assertAlmostEqual(row['avg_rating'], expected['avg_rating'])
+            self.assertAlmostEqual(row['avg_pages'], expected['avg_pages'])
+
+    def test_performance_matches_per_author_listing(self):
+        """Each author's books are listed by publication date with the same columns."""
+        _, performance = self.analyzer.analyze_authors(['author4', 'Nobody', 'Author7', 'AUTHOR4'])
+        self.assertEqual(list(performance.index.get_level_values('author').unique()), ['Author4', 'Author7'])
+        for author in ('Author4', 'Author7'):
+            expected = self.analyzer.analyze_author_performance(author, match='exact')
+            pd.testing.assert_frame_equal(performance.loc[author], expected)
+
+    def test_process_pool_matches_single_process(self):
+        """Sharding the authors across workers gives identical results."""
+        frame = self.analyzer.df
+        index = self.analyzer.get_author_index()
+        serial = author_analytics(frame, index)
+        pooled = author_analytics(frame, index, workers=2, min_pairs_per_shard=1)
+        pd.testing.assert_frame_equal(pooled[0], serial[0])
+        pd.testing.assert_frame_equal(pooled[1], serial[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import pandas as pd
+import numpy as np
+from src.author_index import AuthorIndex, normalize_author
+from src.utils import create_author_summary
+
+class TestAuthorIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Set up a frame with multi-author rows."""
+        cls.df = pd.DataFrame({
+            'title': ['Book1', 'Book2', 'Book3', 'Book4', 'Book5'],
+            'authors': ['J.K. Rowling/Mary GrandPré', 'J.K. Rowling', 'Stephen King/Peter Straub',
+                        'Stephen  King', 'Mary GrandPré/Mary GrandPré'],
+            'average_rating': [4.5, 4.4, 3.9, 4.1, 4.0],
+            'ratings_count': [1000, 800, 300, 500, 20],
+            'num_pages': [600, 300, 500, 400, 40]
+        }, index=[0, 2, 3, 5, 6])
+        cls.index = AuthorIndex(cls.df['authors'])
+
+    def test_normalize_author(self):
+        """Names are compared case- and whitespace-insensitively."""
+        self.assertEqual(normalize_author('  Stephen   KING '), 'stephen king')
+
+    def test_exact_lookup_returns_positions(self):
+        """Exact lookups return sorted row positions, not index labels."""
+        np.testing.assert_array_equal(self.index.lookup('j.k. rowling'), [0, 1])
+        np.testing.assert_array_equal(self.index.lookup('stephen king'), [2, 3])
+        self.assertEqual(len(self.index.lookup('Rowling')), 0)
+
+    def test_prefix_lookup_unions_authors(self):
+        """Prefix lookups cover every author starting with the prefix."""
+        np.testing.assert_array_equal(self.index.lookup('mary', match='prefix'), [0, 4])
+        np.testing.assert_array_equal(self.index.lookup('', match='prefix'), [0, 1, 2, 3, 4])
+
+    def test_unknown_match_mode(self):
+        """Unsupported match modes are rejected."""
+        with self.assertRaises(ValueError):
+            self.index.lookup('Stephen King', match='fuzzy')
+
+    def test_book_counts_per_individual_author(self):
+        """Each author is counted once per book they are credited on."""
+        counts = self.index.book_counts()
+        self.assertEqual(counts['J.K. Rowling'], 2)
+        self.assertEqual(counts['Mary GrandPré'], 2)
+        self.assertEqual(counts['Peter Straub'], 1)
+
+    def test_update_matches_rebuilt_index(self):
+        """Changing the authors of existing rows gives the index of the new column."""
+        index = AuthorIndex(self.df['authors'])
+        index.extend(pd.Series(['Peter Straub', 'J.K. Rowling']))
+        authors = pd.concat([self.df['authors'], pd.Series(['Peter Straub', 'J.K. Rowling'])], ignore_index=True)
+        authors[[1, 2, 6]] = ['Neil Gaiman', 'Stephen King', 'Neil Gaiman/J.K. Rowling']
+        index.update([1, 2, 6], authors[[1, 2, 6]])
+        rebuilt = AuthorIndex(authors)
+        for name in ['J.K. Rowling', 'Stephen King', 'Peter Straub', 'Neil Gaiman', 'Mary GrandPré']:
+            np.testing.assert_array_equal(index.lookup(name), rebuilt.lookup(name))
+        np.testing.assert_array_equal(index.lookup('', match='prefix'), np.arange(7))
+        pd.testing.assert_series_equal(index.book_counts(), rebuilt.book_counts())
+
+    def test_lookup_keys_unions_authors(self):
+        """Several normalized keys are looked up at once, unknown ones ignored."""
+        index = AuthorIndex(self.df['authors'])
+        index.extend(pd.Series(['Peter Straub']))
+        np.testing.assert_array_equal(index.lookup_keys(['peter straub', 'j.k. rowling', 'nobody']), [0, 1, 2, 5])
+        self.assertEqual(len(index.lookup_keys([])), 0)
+
+    def test_create_author_summary_with_index(self):
+        """Index lookups give the same summary as the substring scan."""
+        exact = create_author_summary(self.df, 'J.K. Rowling', self.index, match='exact')
+        self.assertEqual(exact, create_author_summary(self.df, 'J.K. Rowling'))
+        with self.assertRaises(ValueError):
+            create_author_summary(self.df, 'J.K. Rowling', match='exact')
+
+if __name__ == '__main__':
+    unittest.main()
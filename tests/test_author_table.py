@@ -0,0 +1,148 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.author_index import AuthorIndex
+from src.author_table import INPUT_COLUMNS, AuthorTable
+from src.utils import create_author_summary
+
+class TestAuthorTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build a catalog with co-authored books, tied ratings and missing values."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(5)
+        n_books = 400
+        authors = [f'Author{i % 37}' + (f'/Author{(i * 5) % 11}' if i % 3 == 0 else '') for i in range(n_books)]
+        pages = rng.integers(50, 900, n_books).astype(object)
+        pages[::17] = 'n/a'
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': authors,
+            'average_rating': rng.choice([3.5, 4.0, 4.5], n_books),
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': 'eng',
+            'num_pages': pages,
+            'ratings_count': rng.choice([10, 500, 2000], n_books),
+            'publication_date': [f'{1950 + i % 60}-{i % 12 + 1:02d}-{i % 27 + 1:02d}' if i % 13 else 'unknown'
+                                 for i in range(n_books)]
+        }).to_csv(cls.csv_path, index=False)
+        cls.analyzer = BookAnalyzer(cls.csv_path)
+        cls.df = cls.analyzer.df
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_tables_built_on_first_use(self):
+        """Loading builds no author table; each is built by the first query that needs it."""
+        analyzer = BookAnalyzer(self.csv_path)
+        self.assertEqual(analyzer._author_tables, {})
+        analyzer.get_top_authors_by_rating()
+        self.assertEqual(set(analyzer._author_tables), {False})
+        analyzer.get_most_prolific_authors(split_authors=True)
+        self.assertEqual(set(analyzer._author_tables), {False, True})
+
+    def test_rankings_match_groupby(self):
+        """The table's rankings equal a groupby over the books, ties in name order."""
+        stats = (self.df.groupby('authors')
+                 .agg({'average_rating': 'mean', 'title': 'count'})
+                 .reset_index())
+        for min_books in (1, 3, 12, 100):
+            expected = (stats[stats['title'] >= min_books]
+                        .sort_values('average_rating', ascending=False, kind='stable')
+                        .head(10))
+            pd.testing.assert_frame_equal(self.analyzer.get_top_authors_by_rating(min_books=min_books), expected,
+                                          check_index_type=False)
+        pd.testing.assert_series_equal(self.analyzer.get_most_prolific_authors(),
+                                       self.df['authors'].value_counts().head(10))
+        pd.testing.assert_series_equal(self.analyzer.get_most_prolific_authors(split_authors=True),
+                                       self.analyzer.get_author_index().book_counts().rename_axis('authors')
+                                       .sort_values(ascending=False, kind='stable').head(10))
+
+    def test_summary_matches_create_author_summary(self):
+        """Looked-up summaries equal the ones computed from the books."""
+        index = self.analyzer.get_author_index()
+        table = self.analyzer.get_author_table(split_authors=True)
+        for author in index.names:
+            expected = create_author_summary(self.df, author, index, match='exact')
+            summary = create_author_summary(self.df, author.upper(), index, match='exact', author_table=table)
+            self.assertEqual({key: summary[key] for key in ('num_books', 'total_ratings', 'most_rated_book',
+                                                            'highest_rated_book')},
+                             {key: expected[key] for key in ('num_books', 'total_ratings', 'most_rated_book',
+                                                             'highest_rated_book')})
+            self.assertAlmostEqual(summary['avg_rating'], expected['avg_rating'])
+            self.assertAlmostEqual(summary['avg_pages'], expected['avg_pages'])
+        self.assertIsNone(table.summary('Nobody'))
+
+        frame = table.to_frame()
+        books = self.df.iloc[index.lookup('Author4', 'exact')]
+        self.assertEqual(frame.loc['Author4', 'first_published'], books['publication_date'].min())
+        self.assertEqual(frame.loc['Author4', 'last_published'], books['publication_date'].max())
+        self.assertEqual(frame.loc['Author4', 'max_pages'], books['num_pages'].max())
+
+    def test_extend_matches_fresh_build(self):
+        """Merging later books gives the table built from all books at once."""
+        books = self.df[['authors', *INPUT_COLUMNS]].reset_index(drop=True)
+        for split_authors in (False, True):
+            head = books.iloc[:250]
+            table = AuthorTable.build(head, AuthorIndex(head['authors']) if split_authors else None)
+            table.extend(books.iloc[250:320], 250)
+            table.extend(books.iloc[320:], 320)
+            fresh = AuthorTable.build(books, AuthorIndex(books['authors']) if split_authors else None)
+            pd.testing.assert_frame_equal(table.to_frame(), fresh.to_frame())
+            pd.testing.assert_frame_equal(table.top_by_rating(min_books=2), fresh.top_by_rating(min_books=2))
+            pd.testing.assert_series_equal(table.most_prolific(), fresh.most_prolific())
+
+    def test_append_keeps_table_current(self):
+        """After append() the author queries equal those of a fresh load."""
+        analyzer = BookAnalyzer(self.csv_path)
+        table = analyzer.get_author_table()
+        new_rows = pd.DataFrame({
+            'bookID': [1001, 1002, 1003],
+            'title': ['New1', 'New2', 'New3'],
+            'authors': ['Author2', 'Author40', 'Author2/Author40'],
+            'average_rating': [5.0, 5.0, 5.0],
+            'isbn': ['1', '2', '3'],
+            'language_code': 'eng',
+            'num_pages': [100, 200, 300],
+            'ratings_count': [5000, 5000, 5000],
+            'publication_date': '2024-01-01'
+        })
+        analyzer.append(new_rows)
+        self.assertIs(analyzer.get_author_table(), table)
+        fresh = BookAnalyzer(self.csv_path)
+        fresh.df = pd.concat([fresh.df, analyzer.df.iloc[len(fresh.df):]])
+        for split_authors in (False, True):
+            pd.testing.assert_frame_equal(analyzer.get_top_authors_by_rating(1, split_authors),
+                                          fresh.get_top_authors_by_rating(1, split_authors))
+            pd.testing.assert_series_equal(analyzer.get_most_prolific_authors(split_authors),
+                                           fresh.get_most_prolific_authors(split_authors))
+
+    def test_clear_cache_rebuilds_table(self):
+        """After an in-place edit and clear_cache() the author queries see the edited books."""
+        analyzer = BookAnalyzer(self.csv_path)
+        tables = [analyzer.get_author_table(split_authors) for split_authors in (False, True)]
+        edited = analyzer.df.index[:20]
+        analyzer.df.loc[edited, 'authors'] = 'Author5'
+        analyzer.df.loc[edited, 'average_rating'] = 5.0
+        analyzer.clear_cache()
+        self.assertIsNot(analyzer.get_author_table(), tables[0])
+        fresh = BookAnalyzer(self.csv_path)
+        fresh.df = analyzer.df.copy()
+        for split_authors in (False, True):
+            pd.testing.assert_frame_equal(analyzer.get_top_authors_by_rating(1, split_authors),
+                                          fresh.get_top_authors_by_rating(1, split_authors))
+            pd.testing.assert_series_equal(analyzer.get_most_prolific_authors(split_authors),
+                                           fresh.get_most_prolific_authors(split_authors))
+        summary = create_author_summary(analyzer.df, 'Author5', analyzer.get_author_index(), match='exact',
+                                        author_table=analyzer.get_author_table(split_authors=True))
+        self.assertEqual(summary['num_books'], len(fresh.get_author_index().lookup('Author5')))
+
+if __name__ == '__main__':
+    unittest.main()
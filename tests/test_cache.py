@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.cache import file_fingerprint, load_cached_frame
+from src.utils import load_and_validate_csv
+
+class TestDatasetCache(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory with a small books CSV."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.csv_path = os.path.join(self.tmp_dir, 'books.csv')
+        self.write_csv(['Book1', 'Book2', None, 'Book4'])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_csv(self, titles):
+        pd.DataFrame({
+            'title': titles,
+            'authors': ['Author1', 'Author2', 'Author1', 'Author3'][:len(titles)],
+            'average_rating': [4.5, 3.8, 4.2, 4.0][:len(titles)],
+            'isbn': ['123', '456', '789', '012'][:len(titles)],
+            'language_code': ['eng', 'eng', 'spa', 'fre'][:len(titles)],
+            '  num_pages': [200, 300, 250, 150][:len(titles)],
+            'ratings_count': [1000, 500, 750, 20][:len(titles)],
+            'publication_date': ['1/1/2020', '2/1/2020', '3/1/2020', '4/1/2020'][:len(titles)]
+        }).to_csv(self.csv_path, index=False)
+
+    def load(self):
+        """Load through the cache, recording whether the frame was rebuilt."""
+        self.built = False
+        def build():
+            self.built = True
+            return BookAnalyzer(self.csv_path).df
+        return load_cached_frame(self.csv_path, self.cache_dir, 'clean', build)
+
+    def test_second_load_hits_cache_and_keeps_index(self):
+        """A cached frame equals the freshly cleaned one, labels included."""
+        first = self.load()
+        self.assertTrue(self.built)
+        second = self.load()
+        self.assertFalse(self.built)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(list(second.index), [0, 1, 3])
+
+    def test_changed_content_rebuilds(self):
+        """Editing the CSV invalidates the cache entry."""
+        self.load()
+        self.write_csv(['Book1', 'Book2', 'Book3', 'Book4'])
+        self.assertEqual(len(self.load()), 4)
+        self.assertTrue(self.built)
+
+    def test_touched_file_with_same_content_is_reused(self):
+        """Only the hash decides validity when the mtime changes."""
+        self.load()
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.load()
+        self.assertFalse(self.built)
+        self.assertEqual(file_fingerprint(self.csv_path)['mtime_ns'], stat.st_mtime_ns + 10 ** 9)
+
+    def test_analyzer_and_utils_share_cache_dir(self):
+        """BookAnalyzer and load_and_validate_csv read through the same cache."""
+        cached = BookAnalyzer(self.csv_path, cache_dir=self.cache_dir)
+        pd.testing.assert_frame_equal(cached.df, BookAnalyzer(self.csv_path).df)
+        raw = load_and_validate_csv(self.csv_path, cache_dir=self.cache_dir)
+        pd.testing.assert_frame_equal(raw, load_and_validate_csv(self.csv_path, cache_dir=self.cache_dir))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 4)
+
+    def test_raw_cache_keyed_by_dtype(self):
+        """Reads with different dtype arguments get their own cache entries."""
+        default = load_and_validate_csv(self.csv_path, cache_dir=self.cache_dir)
+        self.assertEqual(default['ratings_count'].dtype, 'int64')
+        as_text = load_and_validate_csv(self.csv_path, cache_dir=self.cache_dir, dtype={'ratings_count': str})
+        self.assertEqual(as_text['ratings_count'].tolist(), ['1000', '500', '750', '20'])
+        pd.testing.assert_frame_equal(load_and_validate_csv(self.csv_path, cache_dir=self.cache_dir), default)
+
+if __name__ == '__main__':
+    unittest.main()
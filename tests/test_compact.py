@@ -0,0 +1,113 @@
+import gc
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+from src.analyzer import BookAnalyzer
+from src.compact import compact_frame, restore_columns
+from src.synthetic import write_catalog
+
+class TestCompactMode(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Load the same CSV in default and compact mode."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        n_books = 60
+        pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 7}/Illustrator{i % 3}' if i % 4 == 0 else f'Author{i % 7}' for i in range(n_books)],
+            'average_rating': [round(3 + (i % 20) * 0.09, 2) for i in range(n_books)],
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'isbn13': [f'978{i:010d}' for i in range(n_books)],
+            'language_code': ['eng', 'spa', 'eng', 'fre'] * (n_books // 4),
+            '  num_pages': [str(100 + i * 7) if i % 9 else ' ' for i in range(n_books)],
+            'ratings_count': [i * 99991 for i in range(n_books)],
+            'text_reviews_count': [i * 13 for i in range(n_books)],
+            'publication_date': [f'{i % 12 + 1}/1/{1990 + i % 25}' for i in range(n_books)],
+            'publisher': ['Scholastic', 'Penguin', 'Vintage'] * (n_books // 3)
+        }).to_csv(csv_path, index=False)
+        cls.default = BookAnalyzer(csv_path)
+        cls.compact = BookAnalyzer(csv_path, compact=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def assertSameResult(self, method, *args):
+        expected = getattr(self.default, method)(*args)
+        actual = getattr(self.compact, method)(*args)
+        if isinstance(expected, (pd.DataFrame, pd.Series)):
+            if isinstance(expected, pd.DataFrame):
+                pd.testing.assert_frame_equal(actual, expected)
+            else:
+                pd.testing.assert_series_equal(actual, expected)
+        else:
+            self.assertEqual(actual, expected)
+
+    def test_report_and_dtypes(self):
+        """Compact mode shrinks the frame and reports the savings."""
+        report = self.compact.compact_report
+        self.assertGreater(report['bytes_saved'], 0)
+        self.assertEqual(report['bytes_before'] - report['bytes_after'], report['bytes_saved'])
+        self.assertNotIn('  num_pages', self.compact.df.columns)
+        dtypes = self.compact.df.dtypes
+        self.assertEqual(dtypes['average_rating'], np.float32)
+        self.assertEqual(dtypes['ratings_count'], np.uint32)
+        self.assertEqual(str(dtypes['num_pages']), 'UInt16')
+        self.assertEqual(dtypes['isbn13'], np.int64)
+        self.assertEqual(dtypes['language_code'], 'category')
+
+    def test_compact_analyzer_retains_less_memory(self):
+        """A compact analyzer holds only the compact frame after loading, and less memory than a default one."""
+        csv_path = os.path.join(self.tmp_dir, 'synthetic.csv')
+        write_catalog(csv_path, 5000, seed=1)
+
+        def retained(compact):
+            # NumPy and Python allocations are traced; Arrow buffers are counted by pyarrow
+            gc.collect()
+            arrow_before = pa.total_allocated_bytes()
+            tracemalloc.start()
+            try:
+                analyzer = BookAnalyzer(csv_path, compact=compact)
+                gc.collect()
+                traced = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+            return analyzer, traced + pa.total_allocated_bytes() - arrow_before
+
+        default, default_bytes = retained(False)
+        compact, compact_bytes = retained(True)
+        self.assertLess(compact_bytes, default_bytes)
+        for analyzer in (default, compact):
+            self.assertIsNone(analyzer._author_index)
+            self.assertEqual(analyzer._author_tables, {})
+            self.assertIsNone(analyzer._query_engine)
+
+    def test_query_methods_match_default_mode(self):
+        """Every query method returns the same result in both modes."""
+        self.assertSameResult('get_basic_stats')
+        self.assertSameResult('get_language_distribution')
+        self.assertSameResult('get_top_rated_books', 0)
+        self.assertSameResult('get_most_prolific_authors')
+        self.assertSameResult('get_most_prolific_authors', True)
+        self.assertSameResult('analyze_author_performance', 'Author3')
+        self.assertSameResult('get_top_authors_by_rating', 2)
+        self.assertSameResult('get_top_authors_by_rating', 2, True)
+        self.assertSameResult('recommend_books', 'Author3')
+        self.assertSameResult('recommend_books', 'Scholastic', 'publisher')
+        self.assertSameResult('recommend_books_batch', [('Author1', 'authors'), ('Book1', 'title')])
+
+    def test_restore_columns_round_trip(self):
+        """Restoring the compact frame gives back the cleaned columns."""
+        compact, codecs, _ = compact_frame(self.default.df)
+        restored = restore_columns(compact, codecs)
+        pd.testing.assert_frame_equal(restored, self.default.df.drop(columns=['  num_pages']))
+
+if __name__ == '__main__':
+    unittest.main()
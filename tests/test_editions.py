@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.editions import collapse_frame, group_editions, isbn13_keys, normalize_titles
+
+def isbn10(stem):
+    """ISBN-10 of a nine-digit stem, with its check digit."""
+    check = -sum((10 - i) * int(digit) for i, digit in enumerate(f'{stem:09d}')) % 11
+    return f'{stem:09d}' + ('X' if check == 10 else str(check))
+
+class TestEditions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """A catalog with several editions of two books among single editions."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        titles = ['The Odyssey', 'The Odyssey (Penguin Classics)', 'Hamlet', 'the odyssey.',
+                  'Odyssey: Translated', 'Hamlet', 'Hamlet', 'Macbeth']
+        authors = ['Homer/Robert Fagles', 'Homer', 'William Shakespeare', 'Homer/E.V. Rieu',
+                   'Homer', 'Someone Else', 'William  Shakespeare/Harold Bloom', 'William Shakespeare']
+        # The fifth row has another title but shares the first row's ISBN
+        stems = [14026886, 14044911, 743477111, 140449112, 14026886, 9, 743477112, 743477103]
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'bookID': range(1, 9),
+            'title': titles,
+            'authors': authors,
+            'average_rating': [3.8, 3.8, 4.0, 3.9, 3.8, 3.0, 4.0, 3.9],
+            'isbn': [isbn10(stem) for stem in stems],
+            'isbn13': '9.78044E+12',
+            'language_code': 'eng',
+            'num_pages': [541, 400, 342, 324, 500, 100, 300, 250],
+            'ratings_count': [1000, 3000, 500, 1000, 0, 10, 500, 800],
+            'text_reviews_count': [10, 30, 5, 10, 0, 1, 5, 8],
+            'publication_date': ['1999-01-01', '2003-05-06', '2004-07-01', '1946-01-01',
+                                 '2010-01-01', '2001-01-01', 'bad date', '2003-01-01']
+        }).to_csv(cls.csv_path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_normalize_titles(self):
+        """Series suffixes, punctuation, case and spacing do not matter."""
+        titles = pd.Series(['The Odyssey (Penguin Classics)', "Harry Potter and the Half-Blood Prince (Harry Potter #6)",
+                            '  THE   odyssey. ', '(Untitled)'])
+        self.assertEqual(normalize_titles(titles).tolist(),
+                         ['the odyssey', 'harry potter and the halfblood prince', 'the odyssey', 'untitled'])
+
+    def test_isbn13_keys(self):
+        """Valid ISBN-13s are used, ISBN-10s converted and bad check digits ignored."""
+        frame = pd.DataFrame({
+            'isbn': ['0439785960', '043978596X', '0439785960', 'not an isbn'],
+            'isbn13': ['9.78044E+12', '9780439785969', '9780306406157', '9780306406158']
+        })
+        np.testing.assert_array_equal(isbn13_keys(frame), [9780439785969, 9780439785969, 9780306406157, 0])
+
+    def test_group_editions(self):
+        """Title/author matches and shared ISBNs join, transitively."""
+        analyzer = BookAnalyzer(self.csv_path)
+        np.testing.assert_array_equal(group_editions(analyzer.df), [0, 0, 1, 0, 0, 2, 1, 3])
+
+    def test_collapse_frame_aggregates(self):
+        """Works sum counts, weight ratings and keep the most rated edition."""
+        editions = BookAnalyzer(self.csv_path).df
+        works, edition_map, report = collapse_frame(editions)
+        self.assertEqual(report, {'editions': 8, 'works': 4, 'multi_edition_works': 2, 'rows_saved': 4})
+        odyssey = works.loc[0]
+        self.assertEqual(odyssey['title'], 'The Odyssey (Penguin Classics)')
+        self.assertEqual(odyssey['ratings_count'], 5000)
+        self.assertEqual(odyssey['text_reviews_count'], 50)
+        self.assertAlmostEqual(odyssey['average_rating'], (3.8 * 4000 + 3.9 * 1000) / 5000)
+        self.assertEqual(odyssey['publication_date'], pd.Timestamp('1946-01-01'))
+        self.assertEqual(odyssey['n_editions'], 4)
+        # The earliest date skips an unparseable one
+        self.assertEqual(works.loc[1, 'publication_date'], pd.Timestamp('2004-07-01'))
+        self.assertEqual(works.loc[1, 'title'], 'Hamlet')
+        np.testing.assert_array_equal(edition_map.editions(1), [2, 6])
+        self.assertEqual(works['ratings_count'].sum(), editions['ratings_count'].sum())
+
+    def test_queries_run_on_works(self):
+        """Query methods answer from the work table; editions stay available."""
+        analyzer = BookAnalyzer(self.csv_path, collapse_editions=True)
+        self.assertEqual(len(analyzer.df), 4)
+        self.assertEqual(analyzer.get_basic_stats()['Total Books'], 4)
+        self.assertEqual(analyzer.get_top_rated_books(min_ratings=1000)['title'].tolist(),
+                         ['Hamlet', 'The Odyssey (Penguin Classics)'])
+        self.assertEqual(analyzer.get_most_prolific_authors(split_authors=True)['William Shakespeare'], 2)
+        self.assertEqual(len(analyzer.recommend_books('Homer', n_recommendations=2)), 2)
+        self.assertEqual(analyzer.get_editions(0)['bookID'].tolist(), [1, 2, 4, 5])
+        with self.assertRaises(KeyError):
+            analyzer.get_editions(4)
+
+        compact = BookAnalyzer(self.csv_path, compact=True, collapse_editions=True)
+        pd.testing.assert_frame_equal(compact._restore(compact.df), analyzer.df, check_dtype=False)
+
+        analyzer.append(pd.DataFrame({
+            'bookID': [9], 'title': ['The Tempest'], 'authors': ['William Shakespeare'], 'average_rating': [3.8],
+            'isbn': ['x'], 'language_code': ['eng'], 'num_pages': [200], 'ratings_count': [70],
+            'publication_date': ['2005-01-01']
+        }))
+        self.assertEqual(analyzer.df['n_editions'].tolist(), [4, 2, 1, 1, 1])
+        self.assertEqual(analyzer.get_editions(4)['bookID'].tolist(), [9])
+
+        # The untitled row is dropped by cleaning but takes work id 5
+        analyzer.append(pd.DataFrame({
+            'bookID': [10, 11], 'title': [None, 'Othello'], 'authors': ['William Shakespeare'] * 2,
+            'average_rating': [3.0, 4.1], 'isbn': ['y', 'z'], 'language_code': ['eng'] * 2,
+            'num_pages': [100, 250], 'ratings_count': [5, 90], 'publication_date': ['2006-01-01'] * 2
+        }))
+        self.assertEqual(analyzer.df.index[-1], 6)
+        self.assertEqual(analyzer.get_editions(6)['title'].tolist(), ['Othello'])
+        self.assertEqual(analyzer.get_editions(4)['bookID'].tolist(), [9])
+        with self.assertRaises(KeyError):
+            analyzer.get_editions(5)
+        self.assertEqual(len(analyzer.editions), 10)
+        with self.assertRaises(ValueError):
+            BookAnalyzer(self.csv_path).get_editions(0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from src.analyzer import BookAnalyzer
+from src.export import export_table
+from src.utils import format_book_recommendations, format_thousands, iter_clean_chunks
+
+def read_export(path):
+    """Read an exported file back into a DataFrame."""
+    if path.endswith('.arrow'):
+        with pa.ipc.open_file(path) as reader:
+            return reader.read_all().to_pandas()
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_json(path, lines=True, convert_dates=['publication_date'])
+
+class TestExport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """A small catalog shared by all tests."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(2)
+        n_books = 300
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 30}' for i in range(n_books)],
+            'average_rating': rng.uniform(1, 5, n_books).round(2),
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': rng.choice(['eng', 'fre'], n_books),
+            'num_pages': rng.integers(50, 1000, n_books),
+            'ratings_count': rng.integers(0, 10_000_000, n_books),
+            'publication_date': '2001-02-03'
+        }).to_csv(cls.csv_path, index=False)
+        cls.analyzer = BookAnalyzer(cls.csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_round_trip(self):
+        """Every format reads back the values, with named indexes kept as columns."""
+        top = self.analyzer.get_top_rated_books(min_ratings=0)
+        languages = self.analyzer.get_language_distribution()
+        for format in ('arrow', 'parquet', 'ndjson'):
+            with self.subTest(format=format):
+                path = os.path.join(self.tmp_dir, f'top.{format}')
+                info = export_table(top, path)
+                self.assertEqual((info['format'], info['rows']), (format, 10))
+                pd.testing.assert_frame_equal(read_export(path), top.reset_index(drop=True), check_dtype=False)
+
+                path = os.path.join(self.tmp_dir, f'languages.{format}')
+                export_table(languages, path)
+                pd.testing.assert_frame_equal(read_export(path), languages.reset_index(), check_dtype=False)
+
+                path = os.path.join(self.tmp_dir, f'stats.{format}')
+                export_table(self.analyzer.get_basic_stats(), path)
+                self.assertEqual(read_export(path).loc[0, 'Total Books'], 300)
+
+    def test_record_batches_and_streams(self):
+        """Large results and chunk streams are written batch by batch."""
+        for format in ('arrow', 'parquet', 'ndjson'):
+            with self.subTest(format=format):
+                path = os.path.join(self.tmp_dir, f'catalog.{format}')
+                info = export_table(iter_clean_chunks(self.csv_path, chunksize=70), path, batch_size=50)
+                # Four chunks of 70 rows split in two batches each, then one of 20
+                self.assertEqual((info['rows'], info['batches']), (300, 9))
+                columns = ['bookID', 'title', 'ratings_count', 'publication_date']
+                pd.testing.assert_frame_equal(read_export(path)[columns],
+                                              self.analyzer.df[columns].reset_index(drop=True), check_dtype=False)
+        with pa.ipc.open_file(os.path.join(self.tmp_dir, 'catalog.arrow')) as reader:
+            self.assertEqual(reader.num_record_batches, 9)
+
+    def test_empty_result_and_bad_format(self):
+        """An empty result keeps its columns; unknown formats are rejected."""
+        path = os.path.join(self.tmp_dir, 'empty.parquet')
+        export_table(self.analyzer.query(0, columns=['title', 'average_rating']), path)
+        self.assertEqual(list(pd.read_parquet(path).columns), ['title', 'average_rating'])
+        with self.assertRaises(ValueError):
+            export_table(pd.DataFrame({'a': [1]}), os.path.join(self.tmp_dir, 'table.xlsx'))
+
+    def test_format_thousands(self):
+        """Formatting equals f'{x:,}' for every integer dtype; missing values stay missing."""
+        values = pd.Series([0, 7, -7, 999, 1000, -1000, 123456789, -999999, np.iinfo(np.int64).min,
+                            np.iinfo(np.int64).max], index=range(10, 20))
+        formatted = format_thousands(values)
+        self.assertEqual(formatted.tolist(), [f"{x:,}" for x in values])
+        self.assertTrue(formatted.index.equals(values.index))
+        self.assertEqual(formatted.dtype, values.map(lambda x: f"{x:,}").dtype)
+
+        unsigned = pd.Series([0, 1000, 2 ** 64 - 1], dtype=np.uint64)
+        self.assertEqual(format_thousands(unsigned).tolist(), ['0', '1,000', '18,446,744,073,709,551,615'])
+        compact = format_thousands(pd.Series([65535, None], dtype='UInt16'))
+        self.assertEqual(compact[0], '65,535')
+        self.assertTrue(pd.isna(compact[1]))
+        nullable = format_thousands(pd.Series([1000, None, -5], dtype='Int64'))
+        self.assertEqual(nullable[[0, 2]].tolist(), ['1,000', '-5'])
+        self.assertTrue(pd.isna(nullable[1]))
+        floats = format_thousands(pd.Series([1234.5, np.nan]))
+        self.assertEqual(floats[0], '1,234.5')
+        self.assertTrue(pd.isna(floats[1]))
+
+        recommendations = self.analyzer.recommend_books('Author3')
+        formatted = format_book_recommendations(recommendations)
+        self.assertEqual(formatted['ratings_count'].tolist(), [f"{x:,}" for x in recommendations['ratings_count']])
+
+if __name__ == '__main__':
+    unittest.main()
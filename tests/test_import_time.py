@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import time allowed for src.analyzer on top of numpy and pandas, in microseconds
+IMPORT_BUDGET_US = 100_000
+
+LAZY_MODULES = ['sklearn', 'matplotlib', 'seaborn', 'scipy']
+
+class TestImportTime(unittest.TestCase):
+    def run_python(self, code, *options):
+        return subprocess.run([sys.executable, *options, '-c', code], cwd=ROOT,
+                              capture_output=True, text=True, check=True)
+
+    def test_analyzer_import_budget(self):
+        """Importing BookAnalyzer for stats-only work stays within the budget."""
+        # numpy and pandas are needed by any workload, so only time what comes after
+        result = self.run_python('import numpy, pandas; from src.analyzer import BookAnalyzer',
+                                 '-X', 'importtime')
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                _, total, name = line.split('|')
+                if total.strip().isdigit():
+                    cumulative[name.strip()] = int(total)
+        self.assertLess(cumulative['src.analyzer'], IMPORT_BUDGET_US)
+
+    def test_plotting_and_ml_load_lazily(self):
+        """Plotting and ML libraries are not imported until they are used."""
+        result = self.run_python(
+            'import sys; from src.analyzer import BookAnalyzer; import src.utils, src.streaming; '
+            f'print(" ".join(m for m in {LAZY_MODULES!r} if m in sys.modules))'
+        )
+        self.assertEqual(result.stdout.strip(), '')
+
+if __name__ == '__main__':
+    unittest.main()
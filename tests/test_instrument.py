@@ -0,0 +1,101 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.instrument import Instrumentation, stage
+
+class TestInstrumentation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """A small raw catalog shared by all tests."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        n_books = 200
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 20}' for i in range(n_books)],
+            'average_rating': rng.uniform(1, 5, n_books).round(2),
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': 'eng',
+            'num_pages': rng.integers(50, 1000, n_books),
+            'ratings_count': rng.integers(0, 100000, n_books),
+            'publication_date': '2000-01-01'
+        }).to_csv(cls.csv_path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_disabled_records_nothing(self):
+        """Without instrument=True no records are kept and stages are no-ops."""
+        analyzer = BookAnalyzer(self.csv_path)
+        analyzer.recommend_books('Author3')
+        self.assertEqual(analyzer.instrumentation.records, [])
+        with stage('anything') as record:
+            record['rows'] = 1
+
+    def test_methods_and_stages_are_recorded(self):
+        """Loading and queries record nested stages with rows and timings."""
+        analyzer = BookAnalyzer(self.csv_path, instrument=True)
+        analyzer.recommend_books('Author3')
+        analyzer.get_top_rated_books()
+        summary = analyzer.instrumentation.summary()
+        for path in ('load', 'load/read_csv', 'load/clean', 'load/clean/parse_dates',
+                     'recommend_books', 'recommend_books/match', 'recommend_books/build.recommender',
+                     'recommend_books/similarity', 'get_top_rated_books'):
+            self.assertIn(path, summary)
+        self.assertEqual(summary['load/read_csv']['rows'], 200)
+        self.assertEqual(summary['recommend_books/match']['rows'], 10)
+        self.assertEqual(summary['recommend_books']['rows'], 5)
+        self.assertEqual(summary['recommend_books']['kind'], 'method')
+        self.assertGreaterEqual(summary['load']['total_seconds'], summary['load/clean']['total_seconds'])
+
+        report = json.loads(analyzer.instrumentation.to_json())
+        self.assertEqual(len(report['records']), len(analyzer.instrumentation.records))
+        analyzer.instrumentation.disable()
+        analyzer.get_language_distribution()
+        self.assertNotIn('get_language_distribution', analyzer.instrumentation.summary())
+
+    def test_callback_and_errors(self):
+        """A callback sees every record, including failed calls."""
+        seen = []
+        analyzer = BookAnalyzer(self.csv_path, instrument=seen.append)
+        with self.assertRaises(ValueError):
+            analyzer.recommend_books('Book1', attribute='title', match='exact')
+        self.assertEqual(seen[-1]['path'], 'recommend_books')
+        self.assertEqual(seen[-1]['error'], 'ValueError')
+        self.assertEqual(seen[0]['path'], 'load/read_csv')
+
+        instrumentation = Instrumentation(enabled=True, keep_records=False, callback=seen.append)
+        with instrumentation.measure('block'):
+            pass
+        self.assertEqual(instrumentation.records, [])
+        self.assertEqual(seen[-1]['name'], 'block')
+
+    def test_profile_modes(self):
+        """Both profilers report hotspots and dump a listing."""
+        analyzer = BookAnalyzer(self.csv_path)
+        output = io.StringIO()
+        with analyzer.profile(top=5, output=output) as result:
+            analyzer.get_top_authors_by_rating(min_books=1)
+        self.assertEqual(len(result.hotspots), 5)
+        self.assertIn('cumtime', result.hotspots[0])
+        self.assertIn('function calls', output.getvalue())
+
+        with analyzer.profile('tracemalloc', top=3) as result:
+            analyzer.get_most_prolific_authors(split_authors=True)
+        self.assertGreater(result.peak_memory, 0)
+        self.assertLessEqual(len(result.hotspots), 3)
+        with self.assertRaises(ValueError):
+            with analyzer.profile('perf'):
+                pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+import main
+from main import SECTIONS, run_batch
+from src.analyzer import BookAnalyzer
+
+class TestBatchReport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        n_books = 60
+        pd.DataFrame({
+            'title': [f'Book{i}' if i != 7 else 'The Hobbit' for i in range(n_books)],
+            'authors': [['J.K. Rowling', 'John Grisham', 'Lee Child', 'Author1'][i % 4] for i in range(n_books)],
+            'average_rating': [round(3 + (i * 7 % 20) / 10, 2) for i in range(n_books)],
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': [['eng', 'spa', 'fre'][i % 3] for i in range(n_books)],
+            'num_pages': [100 + i for i in range(n_books)],
+            'ratings_count': [(i * 389) % 5000 for i in range(n_books)],
+            'publication_date': [f'{i % 12 + 1}/1/{1990 + i % 30}' for i in range(n_books)]
+        }).to_csv(cls.csv_path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_batch_writes_every_section(self):
+        """Batch mode writes tables and figures and times every section."""
+        output_dir = os.path.join(self.tmp_dir, 'report')
+        timings = run_batch(self.csv_path, output_dir, formats=('png', 'svg'), workers=2)
+        self.assertEqual(set(timings), {'load', 'total'} | {name for name, *_ in SECTIONS})
+
+        written = set(os.listdir(output_dir))
+        for name in ['basic_stats.json', 'top_rated_books.csv', 'recommendations_hobbit.csv',
+                     'language_distribution.png', 'language_distribution.svg',
+                     'pages_ratings_correlation.png', 'author_performance.svg']:
+            self.assertIn(name, written)
+        stats = pd.read_json(os.path.join(output_dir, 'basic_stats.json'), typ='series')
+        self.assertEqual(stats['Total Books'], 60)
+
+    def test_batch_table_formats(self):
+        """Result tables can be written as Parquet instead of CSV."""
+        output_dir = os.path.join(self.tmp_dir, 'parquet-report')
+        run_batch(self.csv_path, output_dir, workers=1, table_format='parquet')
+        written = set(os.listdir(output_dir))
+        self.assertIn('top_rated_books.parquet', written)
+        self.assertNotIn('top_rated_books.csv', written)
+        authors = pd.read_parquet(os.path.join(output_dir, 'author_table.parquet'))
+        self.assertEqual(authors['num_books'].sum(), 60)
+        stats = pd.read_parquet(os.path.join(output_dir, 'basic_stats.parquet'))
+        self.assertEqual(stats.loc[0, 'Total Books'], 60)
+
+    def test_batch_with_spawned_workers(self):
+        """Workers started with spawn load the data themselves and write the same report."""
+        output_dir = os.path.join(self.tmp_dir, 'spawn-report')
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        timings = run_batch(self.csv_path, output_dir, workers=2, cache_dir=cache_dir, start_method='spawn')
+        self.assertEqual(set(timings), {'load', 'total'} | {name for name, *_ in SECTIONS})
+        stats = pd.read_json(os.path.join(output_dir, 'basic_stats.json'), typ='series')
+        self.assertEqual(stats['Total Books'], 60)
+        self.assertIn('language_distribution.png', os.listdir(output_dir))
+
+    def test_interactive_prints_every_table(self):
+        """Sections with figures print their tables too; the author table is cut to its first rows."""
+        csv_path = os.path.join(self.tmp_dir, 'many-authors.csv')
+        books = pd.read_csv(self.csv_path)
+        books['authors'] = [f'Writer{i % 12}' for i in range(len(books))]
+        books.to_csv(csv_path, index=False)
+        analyzer = BookAnalyzer(csv_path)
+        self.addCleanup(main.plt.close, 'all')
+        output = io.StringIO()
+        with mock.patch('main.BookAnalyzer', return_value=analyzer), mock.patch('builtins.input'), \
+                mock.patch('main.plt.show') as show, contextlib.redirect_stdout(output):
+            main.main()
+        printed = output.getvalue()
+        self.assertTrue(show.called)
+        self.assertIn(str(analyzer.get_language_distribution()), printed)
+        authors = analyzer.get_author_table(split_authors=True).to_frame()
+        section = printed.split('Author Statistics:')[1].split('Correlation Analysis:')[0]
+        self.assertEqual(section.strip(), str(authors.head()).strip())
+
+if __name__ == '__main__':
+    unittest.main()
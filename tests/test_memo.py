@@ -0,0 +1,113 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.memo import ResultCache
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """The least recently used result is dropped when the cache is full."""
+        cache = ResultCache(maxsize=2)
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        cache.get('a', lambda: None)
+        cache.get('c', lambda: 3)
+        self.assertEqual(cache.get('a', lambda: None), 1)
+        self.assertEqual(cache.get('b', lambda: 'recomputed'), 'recomputed')
+        self.assertEqual(cache.info(), {'hits': 2, 'misses': 4, 'size': 2, 'maxsize': 2})
+
+    def test_disabled(self):
+        """maxsize=0 stores nothing."""
+        cache = ResultCache(maxsize=0)
+        cache.get('a', lambda: 1)
+        self.assertEqual(cache.get('a', lambda: 2), 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_pickle_keeps_results(self):
+        """A pickled cache keeps its results and counters and gets a working lock."""
+        cache = ResultCache(maxsize=2)
+        cache.get('a', lambda: 1)
+        restored = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(restored.get('a', lambda: None), 1)
+        self.assertEqual(restored.info(), {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2})
+
+class TestAnalyzerResultCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'bookID': [1, 2, 3, 4],
+            'title': ['Book1', 'Book2', 'Book3', 'Book4'],
+            'authors': ['Author1', 'Author2', 'Author1', 'Author3'],
+            'average_rating': [4.5, 3.8, 4.2, 3.9],
+            'isbn': ['123', '456', '789', '012'],
+            'language_code': ['eng', 'eng', 'spa', 'fre'],
+            'num_pages': [200, 300, 250, 100],
+            'ratings_count': [1000, 500, 750, 2000],
+            'publication_date': ['2020-01-01', '2020-02-01', '2020-03-01', '2020-04-01']
+        }).to_csv(cls.csv_path, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def setUp(self):
+        self.analyzer = BookAnalyzer(self.csv_path)
+
+    def test_repeated_calls_hit(self):
+        """Equivalent argument spellings share one cache entry."""
+        first = self.analyzer.get_top_authors_by_rating(1)
+        second = self.analyzer.get_top_authors_by_rating(min_books=1)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(self.analyzer.cache_info()['hits'], 1)
+        self.analyzer.get_top_authors_by_rating(min_books=2)
+        self.assertEqual(self.analyzer.cache_info()['misses'], 2)
+
+    def test_results_cannot_alter_cache(self):
+        """Mutating a returned result leaves the cached one intact."""
+        stats = self.analyzer.get_basic_stats()
+        stats['Most Common Languages']['eng'] = -1
+        top = self.analyzer.get_top_rated_books(min_ratings=0)
+        top.loc[:, 'average_rating'] = 0.0
+        self.assertEqual(self.analyzer.get_basic_stats()['Most Common Languages']['eng'], 2)
+        self.assertEqual(self.analyzer.get_top_rated_books(min_ratings=0).iloc[0]['average_rating'], 4.5)
+
+    def test_analyzer_pickles(self):
+        """An analyzer with cached results can be sent to another process."""
+        expected = self.analyzer.get_basic_stats()
+        restored = pickle.loads(pickle.dumps(self.analyzer))
+        self.assertEqual(restored.get_basic_stats(), expected)
+        self.assertEqual(restored.cache_info()['hits'], 1)
+
+    def test_invalidated_when_data_changes(self):
+        """Replacing or appending to the data drops cached results."""
+        self.assertEqual(self.analyzer.get_basic_stats()['Total Books'], 4)
+        self.analyzer.df = self.analyzer.df.iloc[:3]
+        self.assertEqual(self.analyzer.get_basic_stats()['Total Books'], 3)
+
+        self.analyzer.append(pd.DataFrame({
+            'bookID': [5], 'title': ['Book5'], 'authors': ['Author2'], 'average_rating': [4.0],
+            'isbn': ['345'], 'language_code': ['eng'], 'num_pages': [120],
+            'ratings_count': [300], 'publication_date': ['2021-01-01']
+        }))
+        self.assertEqual(self.analyzer.get_basic_stats()['Total Books'], 4)
+        self.assertEqual(self.analyzer.cache_info()['hits'], 0)
+
+    def test_clear_cache_after_in_place_edit(self):
+        """clear_cache() makes queries see edits made to analyzer.df in place."""
+        self.assertEqual(self.analyzer.get_top_rated_books(min_ratings=0).iloc[0]['title'], 'Book1')
+        self.assertEqual(len(self.analyzer.analyze_author_performance('Author9', match='exact')), 0)
+        self.analyzer.df.loc[1, 'average_rating'] = 5.0
+        self.analyzer.df.loc[1, 'ratings_count'] = 10 ** 7
+        self.analyzer.df.loc[3, 'authors'] = 'Author9'
+        self.analyzer.clear_cache()
+        self.assertEqual(self.analyzer.get_top_rated_books(min_ratings=0).iloc[0]['title'], 'Book2')
+        found = self.analyzer.analyze_author_performance('Author9', match='exact')
+        self.assertEqual(found['title'].tolist(), ['Book4'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.query import QueryEngine
+
+class TestQueryEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """A catalog with tied ratings, missing page counts and unparseable dates."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(11)
+        n_books = 500
+        pages = rng.integers(50, 900, n_books).astype(object)
+        pages[::19] = 'n/a'
+        cls.raw = pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 40}' for i in range(n_books)],
+            'average_rating': rng.choice([3.0, 3.5, 4.0, 4.5, 5.0], n_books),
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': rng.choice(['eng', 'en-US', 'fre', 'spa'], n_books),
+            'num_pages': pages,
+            'ratings_count': rng.choice([0, 50, 1000, 5000], n_books),
+            'publication_date': [f'{1950 + i % 70}-{i % 12 + 1:02d}-01' if i % 23 else 'unknown'
+                                 for i in range(n_books)]
+        })
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        cls.raw.to_csv(cls.csv_path, index=False)
+        cls.analyzer = BookAnalyzer(cls.csv_path)
+        cls.df = cls.analyzer.df
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_queries_match_pandas(self):
+        """Filtered top-N results equal a pandas mask and stable sort."""
+        df = self.df
+        cases = [
+            ({}, df['average_rating'].notna()),
+            ({'language': 'eng', 'min_ratings': 1000},
+             (df['language_code'] == 'eng') & (df['ratings_count'] >= 1000)),
+            ({'language': ['fre', 'spa', 'xxx'], 'min_rating': 3.5, 'max_rating': 4.5},
+             df['language_code'].isin(['fre', 'spa']) & df['average_rating'].between(3.5, 4.5)),
+            ({'min_pages': 100, 'max_pages': 400, 'end_date': '1990-12-31'},
+             df['num_pages'].between(100, 400) & (df['publication_date'] <= '1990-12-31')),
+            ({'start_date': '2000', 'max_ratings': 50},
+             (df['publication_date'] >= '2000') & (df['ratings_count'] <= 50))
+        ]
+        for filters, mask in cases:
+            for by in QueryEngine.SORT_COLUMNS:
+                for ascending in (False, True):
+                    for n in (1, 10, None):
+                        with self.subTest(filters=filters, by=by, ascending=ascending, n=n):
+                            expected = df[mask].sort_values(by, ascending=ascending, kind='stable')
+                            pd.testing.assert_frame_equal(self.analyzer.query(n, by, ascending, **filters),
+                                                          expected if n is None else expected.head(n))
+            self.assertEqual(self.analyzer.get_query_engine().count(**filters), mask.sum())
+
+    def test_routed_methods(self):
+        """The summary queries give the pandas results."""
+        df = self.df
+        pd.testing.assert_series_equal(self.analyzer.get_language_distribution(), df['language_code'].value_counts())
+        pd.testing.assert_frame_equal(self.analyzer.get_top_rated_books(min_ratings=1000),
+                                      df[df['ratings_count'] >= 1000]
+                                      .sort_values('average_rating', ascending=False, kind='stable')
+                                      .head(10)[['title', 'authors', 'average_rating', 'ratings_count']])
+        stats = self.analyzer.get_basic_stats()
+        self.assertEqual(stats['Average Pages'], int(df['num_pages'].mean()))
+        self.assertEqual(stats['Total Ratings'], df['ratings_count'].sum())
+        self.assertEqual(stats['Date Range'],
+                         f"{df['publication_date'].min().year} to {df['publication_date'].max().year}")
+
+    def test_bad_arguments(self):
+        """Unknown filters and sort columns are rejected."""
+        engine = self.analyzer.get_query_engine()
+        with self.assertRaises(ValueError):
+            engine.top(by='title')
+        with self.assertRaises(ValueError):
+            engine.mask(min_year=2000)
+
+    def test_append_and_update_match_fresh_engine(self):
+        """Rows appended and replaced through append() match an engine built from scratch."""
+        analyzer = BookAnalyzer(self.csv_path)
+        engine = analyzer.get_query_engine()
+        new_rows = self.raw.iloc[:60].copy()
+        new_rows['bookID'] = new_rows['bookID'] + 10000
+        new_rows['language_code'] = 'ger'
+        analyzer.append(new_rows)
+        changed = self.raw.iloc[100:110].copy()
+        changed['average_rating'] = 1.0
+        analyzer.append(changed)
+        self.assertIs(analyzer.get_query_engine(), engine)
+
+        fresh = QueryEngine(analyzer.df[QueryEngine.COLUMNS])
+        for name in QueryEngine.COLUMNS:
+            np.testing.assert_array_equal(engine.column(name), fresh.column(name))
+        self.assertEqual(engine.count(language='ger'), 60)
+        pd.testing.assert_frame_equal(analyzer.query(10, ascending=True, min_ratings=0),
+                                      analyzer.df.sort_values('average_rating', kind='stable').head(10))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import pandas as pd
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics.pairwise import cosine_similarity
+from src.recommender import RecommendationEngine
+
+class TestRecommendationEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Set up a small random catalog shared by all tests."""
+        rng = np.random.default_rng(0)
+        n_books = 200
+        cls.df = pd.DataFrame({
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 40}' for i in range(n_books)],
+            'average_rating': rng.uniform(1, 5, n_books).round(2),
+            'ratings_count': rng.integers(0, 100000, n_books),
+            'num_pages': rng.integers(50, 1000, n_books).astype(float)
+        })
+        cls.engine = RecommendationEngine(cls.df, block_size=64)
+
+    def test_average_similarity_matches_full_matrix(self):
+        """Blocked scoring matches the full cosine similarity matrix."""
+        scaled = StandardScaler().fit_transform(self.df[RecommendationEngine.FEATURES])
+        expected = cosine_similarity(scaled)[[3, 43, 83]].mean(axis=0)
+        np.testing.assert_allclose(self.engine.average_similarity([3, 43, 83]), expected)
+
+    def test_top_k_orders_best_first_and_breaks_ties_by_later_row(self):
+        """Top-k selection is sorted and resolves ties like a reversed argsort."""
+        scores = np.array([0.1, 0.9, 0.5, 0.9, 0.2])
+        np.testing.assert_array_equal(RecommendationEngine.top_k(scores, 3), [3, 1, 2])
+        candidates = np.array([True, False, True, True, True])
+        np.testing.assert_array_equal(RecommendationEngine.top_k(scores, 2, candidates), [3, 2])
+
+    def test_recommend_excludes_masked_rows(self):
+        """Excluded rows never appear in the recommendations."""
+        exclude_mask = (self.df['authors'] == 'Author3').to_numpy()
+        query_positions = np.flatnonzero(exclude_mask)
+        recommendations = self.engine.recommend(query_positions, exclude_mask, 10)
+        self.assertEqual(len(recommendations), 10)
+        self.assertNotIn('Author3', recommendations['authors'].values)
+
+    def test_recommend_batch_matches_single_queries(self):
+        """Batched centroid scoring picks the same books as single queries."""
+        masks = [(self.df['authors'] == f'Author{i}').to_numpy() for i in (1, 7, 12)]
+        results = self.engine.recommend_batch(sparse.csr_matrix(np.vstack(masks)), 5)
+        for mask, positions in zip(masks, results):
+            expected = self.engine.recommend(np.flatnonzero(mask), mask, 5)
+            np.testing.assert_array_equal(positions, self.df.index.get_indexer(expected.index))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+import pandas as pd
+from benchmarks.load_test import run_load
+from src.analyzer import BookAnalyzer
+from src.server import BookQueryServer
+
+class TestBookQueryServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        pd.DataFrame({
+            'title': ['Book1', 'Book2', 'Book3', 'Book4'],
+            'authors': ['Author1', 'Author2', 'Author1', 'Author3'],
+            'average_rating': [4.5, 3.8, 4.2, 3.9],
+            'isbn': ['123', '456', '789', '012'],
+            'language_code': ['eng', 'eng', 'spa', 'fre'],
+            'num_pages': [200, 300, 250, 100],
+            'ratings_count': [1000, 500, 750, 2000],
+            'publication_date': ['2020-01-01', '2020-02-01', '2020-03-01', '2020-04-01']
+        }).to_csv(csv_path, index=False)
+        cls.analyzer = BookAnalyzer(csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    async def fetch(self, port, path):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"GET {path} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        return int(head.split()[1]), json.loads(body)
+
+    def serve(self, server, scenario):
+        async def run():
+            listener = await server.serve('127.0.0.1', 0)
+            async with listener:
+                return await scenario(listener.sockets[0].getsockname()[1])
+        return asyncio.run(run())
+
+    def test_endpoints(self):
+        """Query results and errors come back as JSON with matching status codes."""
+        server = BookQueryServer(self.analyzer, workers=2)
+
+        async def scenario(port):
+            return await asyncio.gather(
+                self.fetch(port, '/get_basic_stats'),
+                self.fetch(port, '/get_top_rated_books?min_ratings=600'),
+                self.fetch(port, '/analyze_author_performance?author_name=author1&match=exact'),
+                self.fetch(port, '/get_top_rated_books?min_ratings=many'),
+                self.fetch(port, '/analyze_author_performance'),
+                self.fetch(port, '/missing'),
+            )
+        stats, top, performance, bad_value, missing_arg, unknown = self.serve(server, scenario)
+
+        self.assertEqual(stats, (200, self.analyzer.get_basic_stats()))
+        self.assertEqual(top[1]['data'][0], ['Book1', 'Author1', 4.5, 1000])
+        self.assertEqual(len(top[1]['index']), 3)
+        self.assertEqual(performance[1]['data'][1][1], '2020-03-01T00:00:00.000')
+        self.assertEqual([bad_value[0], missing_arg[0], unknown[0]], [400, 400, 404])
+
+    def test_identical_requests_are_coalesced(self):
+        """Concurrent identical requests share one computation."""
+        server = BookQueryServer(self.analyzer, workers=4)
+        calls = []
+
+        def slow_recommend(query_value, attribute='authors', n_recommendations=5, match='substring'):
+            calls.append(query_value)
+            time.sleep(0.2)
+            return {'query': query_value}
+        server.analyzer = SimpleNamespace(recommend_books=slow_recommend)
+
+        async def scenario(port):
+            return await asyncio.gather(*(self.fetch(port, '/recommend_books?query_value=Author1')
+                                          for _ in range(5)))
+        responses = self.serve(server, scenario)
+        self.assertEqual(responses, [(200, {'query': 'Author1'})] * 5)
+        self.assertEqual(calls, ['Author1'])
+        self.assertEqual(server.coalesced, 4)
+
+    def test_load_test_reports_latency(self):
+        """The load test reports percentiles over keep-alive connections."""
+        server = BookQueryServer(self.analyzer, workers=2)
+        results = self.serve(server, lambda port: run_load(
+            f'http://127.0.0.1:{port}', ['/get_basic_stats', '/get_language_distribution'], 4, 40))
+        self.assertEqual((results['requests'], results['errors']), (40, 0))
+        self.assertLessEqual(results['p50_ms'], results['p99_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.shards import find_shards, load_shards
+
+class TestShards(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """A catalog written whole and as shards in two subdirectories, plus a bad shard."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        n_books = 120
+        catalog = pd.DataFrame({
+            'bookID': range(1, n_books + 1),
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{i % 12}' for i in range(n_books)],
+            'average_rating': rng.uniform(1, 5, n_books).round(2),
+            # Only the last shard has an ISBN with a check character
+            'isbn': [f'{i:010d}' for i in range(n_books - 1)] + ['000000011X'],
+            'language_code': 'eng',
+            # Only the first shard has a non-numeric page count
+            '  num_pages': ['n/a'] + [str(pages) for pages in rng.integers(50, 1000, n_books - 1)],
+            'ratings_count': rng.integers(0, 100000, n_books),
+            'publication_date': ['2000-01-01'] * (n_books - 1) + ['not a date']
+        })
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        catalog.to_csv(cls.csv_path, index=False)
+
+        cls.shard_dir = os.path.join(cls.tmp_dir, 'shards')
+        for i, start in enumerate(range(0, n_books, 30)):
+            directory = os.path.join(cls.shard_dir, 'publisher-a' if i < 2 else 'publisher-b')
+            os.makedirs(directory, exist_ok=True)
+            catalog.iloc[start:start + 30].to_csv(os.path.join(directory, f'2024-{i + 1:02d}.csv'), index=False)
+        with open(os.path.join(cls.shard_dir, 'publisher-b', '2024-99.csv'), 'w') as f:
+            f.write('title,price\nBook,10\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_find_shards(self):
+        """Directories are searched recursively, patterns are globbed, files pass through."""
+        self.assertEqual(len(find_shards(self.shard_dir)), 5)
+        self.assertEqual([os.path.basename(path) for path in find_shards(os.path.join(self.shard_dir, '*', '2024-0*.csv'))],
+                         ['2024-01.csv', '2024-02.csv', '2024-03.csv', '2024-04.csv'])
+        self.assertIsNone(find_shards(self.csv_path))
+        with self.assertRaises(FileNotFoundError):
+            find_shards(os.path.join(self.shard_dir, '*.parquet'))
+
+    def test_shards_match_single_file(self):
+        """Sharded loading gives the single-file data and reports the bad shard."""
+        whole = BookAnalyzer(self.csv_path)
+        sharded = BookAnalyzer(self.shard_dir, workers=1)
+        pd.testing.assert_frame_equal(sharded.df.reset_index(drop=True), whole.df.reset_index(drop=True))
+        self.assertTrue(sharded.df.index.is_unique)
+        self.assertEqual(sharded.unparseable_dates, whole.unparseable_dates)
+        self.assertEqual(sharded.get_basic_stats(), whole.get_basic_stats())
+        # The author index assembled from the shards equals one built from scratch
+        for attribute in ('keys', 'names', 'author_codes', 'positions'):
+            np.testing.assert_array_equal(getattr(sharded.get_author_index(), attribute),
+                                          getattr(whole.get_author_index(), attribute))
+
+        report = sharded.shard_report
+        self.assertEqual((report['shards'], report['loaded'], report['rows']), (5, 4, len(whole.df)))
+        self.assertEqual(len(report['bad_shards']), 1)
+        self.assertTrue(report['bad_shards'][0]['path'].endswith('2024-99.csv'))
+        self.assertIn('Missing required columns', report['bad_shards'][0]['error'])
+        self.assertIsNone(whole.shard_report)
+
+    def test_process_pool_and_cache(self):
+        """Worker processes and cached shards give the same frame."""
+        paths = find_shards(self.shard_dir)
+        serial, serial_index, serial_report = load_shards(paths, workers=1)
+        pooled, pooled_index, pooled_report = load_shards(paths, workers=2)
+        pd.testing.assert_frame_equal(pooled, serial)
+        self.assertEqual(pooled_report, serial_report)
+        np.testing.assert_array_equal(pooled_index.positions, serial_index.positions)
+
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        for _ in range(2):
+            cached, _, _ = load_shards(paths, workers=1, cache_dir=cache_dir)
+            pd.testing.assert_frame_equal(cached, serial)
+
+    def test_shard_cache_separate_from_single_file(self):
+        """A shard loaded on its own first does not leave its cached frame to the sharded load."""
+        cache_dir = os.path.join(self.tmp_dir, 'shared-cache')
+        shard = find_shards(self.shard_dir)[0]
+        BookAnalyzer(shard, cache_dir=cache_dir)
+        sharded = BookAnalyzer(os.path.dirname(shard), cache_dir=cache_dir)
+        pd.testing.assert_frame_equal(sharded.df, BookAnalyzer(os.path.dirname(shard)).df)
+        self.assertEqual(sharded.df['isbn'].iloc[0], '0000000000')
+
+    def test_every_shard_bad(self):
+        """A load with no usable shard fails."""
+        with self.assertRaises(ValueError):
+            load_shards([os.path.join(self.shard_dir, 'publisher-b', '2024-99.csv')], workers=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.streaming import StreamingBookStats
+from src.utils import iter_clean_chunks
+
+class TestStreamingBookStats(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Write a CSV with distinct ratings and load it whole for reference."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        n_books = 250
+        pd.DataFrame({
+            'title': [f'Book{i}' if i % 31 else None for i in range(n_books)],
+            'authors': [f'Author{(i * 7) % 23}' for i in range(n_books)],
+            'average_rating': [round(1 + (i * 37 % n_books) / 63, 6) for i in range(n_books)],
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': [['eng', 'spa', 'fre', 'ger', 'eng'][i % 5] for i in range(n_books)],
+            '  num_pages': [str(50 + i) if i % 11 else 'n/a' for i in range(n_books)],
+            'ratings_count': [(i * 389) % 5000 for i in range(n_books)],
+            'publication_date': [f'{i % 12 + 1}/{i % 28 + 1}/{1950 + i % 70}' for i in range(n_books)]
+        }).to_csv(cls.csv_path, index=False)
+        cls.analyzer = BookAnalyzer(cls.csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def assertMatchesAnalyzer(self, stats):
+        self.assertEqual(stats.get_basic_stats(), self.analyzer.get_basic_stats())
+        pd.testing.assert_series_equal(stats.get_language_distribution(),
+                                       self.analyzer.get_language_distribution())
+        pd.testing.assert_series_equal(stats.get_most_prolific_authors(),
+                                       self.analyzer.get_most_prolific_authors())
+        pd.testing.assert_frame_equal(stats.get_top_rated_books(),
+                                      self.analyzer.get_top_rated_books(min_ratings=1000))
+        pd.testing.assert_frame_equal(stats.get_top_authors_by_rating(min_books=5),
+                                      self.analyzer.get_top_authors_by_rating(min_books=5))
+
+    def test_chunked_results_match_whole_file(self):
+        """Small chunks give the same results as an in-memory analyzer."""
+        self.assertMatchesAnalyzer(BookAnalyzer.stream(self.csv_path, chunksize=17))
+
+    def test_merge_partial_aggregates(self):
+        """Accumulators over consecutive parts merge into the full result."""
+        chunks = list(iter_clean_chunks(self.csv_path, chunksize=40))
+        left, right = StreamingBookStats(), StreamingBookStats()
+        for i, chunk in enumerate(chunks):
+            (left if i < len(chunks) // 2 else right).update(chunk)
+        self.assertMatchesAnalyzer(left.merge(right))
+
+    def test_tied_author_ratings_in_name_order(self):
+        """Authors with equal mean ratings are ranked by name, as in the analyzer."""
+        csv_path = os.path.join(self.tmp_dir, 'ties.csv')
+        n_books = 90
+        pd.DataFrame({
+            'title': [f'Book{i}' for i in range(n_books)],
+            'authors': [f'Author{(i * 11) % 30}' for i in range(n_books)],
+            'average_rating': [[3.5, 4.0, 4.5][i % 3] for i in range(n_books)],
+            'isbn': [f'{i:010d}' for i in range(n_books)],
+            'language_code': 'eng',
+            'num_pages': 100,
+            'ratings_count': 10,
+            'publication_date': '2000-01-01'
+        }).to_csv(csv_path, index=False)
+        analyzer = BookAnalyzer(csv_path)
+        stats = BookAnalyzer.stream(csv_path, chunksize=13)
+        for min_books in (1, 3):
+            pd.testing.assert_frame_equal(stats.get_top_authors_by_rating(min_books=min_books),
+                                          analyzer.get_top_authors_by_rating(min_books=min_books))
+
+    def test_chunk_labels_continue_across_chunks(self):
+        """Cleaned chunks keep the labels of a whole-file load."""
+        labels = pd.concat(iter_clean_chunks(self.csv_path, chunksize=17)).index
+        self.assertTrue(labels.equals(self.analyzer.df.index))
+
+if __name__ == '__main__':
+    unittest.main()
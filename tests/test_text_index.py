@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.analyzer import BookAnalyzer
+from src.text_index import TextIndex
+
+class TestTextIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build a small catalog where series share title words, authors and publishers."""
+        cls.df = pd.DataFrame({
+            'title': ['The Hobbit', 'The Fellowship of the Ring', 'The Two Towers',
+                      'The Return of the King', 'Harry Potter and the Goblet of Fire',
+                      'Harry Potter and the Chamber of Secrets', 'The Ring and the Goblet',
+                      'A Brief History of Time', None, 'Gardening Basics'],
+            'authors': ['J.R.R. Tolkien', 'J.R.R. Tolkien', 'J.R.R. Tolkien', 'J.R.R. Tolkien',
+                        'J.K. Rowling/Mary GrandPré', 'J.K. Rowling', 'Someone Else',
+                        'Stephen Hawking', 'Nobody', 'Green Thumb'],
+            'publisher': ['Houghton Mifflin', 'Houghton Mifflin', 'Del Rey', 'Del Rey',
+                          'Scholastic', 'Scholastic', 'Del Rey', 'Bantam', None, 'Garden Press'],
+            'average_rating': [4.27, 4.36, 4.44, 4.53, 4.56, 4.42, 3.10, 4.15, 3.00, 3.90],
+            'ratings_count': [2500, 1800, 1500, 1600, 2100, 2300, 10, 900, 5, 40],
+            'num_pages': [366, 398, 352, 416, 734, 341, 200, 212, 100, 150]
+        })
+        cls.index = TextIndex(cls.df)
+        cls.tmp_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(cls.tmp_dir, 'books.csv')
+        cls.df.assign(
+            bookID=range(1, len(cls.df) + 1),
+            language_code='eng',
+            publication_date='2000-01-01'
+        ).to_csv(csv_path, index=False)
+        cls.csv_path = csv_path
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_similarity_matches_dense_cosine(self):
+        """Sparse centroid scoring equals the mean cosine similarity of the rows."""
+        rows = self.index.rows(np.arange(len(self.df))).toarray()
+        expected = (rows @ rows[[0, 1]].T).mean(axis=1)
+        positions, scores = self.index.similarity([0, 1])
+        np.testing.assert_allclose(scores, expected[positions], rtol=1e-5)
+        self.assertEqual(set(positions), set(np.flatnonzero(expected > 0)))
+        # Rows are unit length, except the row without any indexed text
+        np.testing.assert_allclose(np.linalg.norm(rows, axis=1)[:8], 1, rtol=1e-5)
+
+    def test_frequent_terms_are_dropped(self):
+        """Terms in more than max_df of the books do not link unrelated books."""
+        index = TextIndex(self.df, fields={'publisher': 1.0}, max_df=0.25, min_postings=0)
+        positions, _ = index.similarity([2])
+        self.assertEqual(len(positions), 0)
+        positions, _ = index.similarity([4])
+        self.assertEqual(sorted(positions), [4, 5])
+
+    def test_max_terms_limits_the_centroid(self):
+        """Capping the centroid terms keeps only the books sharing the heaviest ones."""
+        full, _ = self.index.similarity([0, 1, 2, 3])
+        capped, _ = self.index.similarity([0, 1, 2, 3], max_terms=1)
+        self.assertLess(len(capped), len(full))
+        self.assertTrue(set(capped) <= set(full))
+
+    def test_extend_matches_full_index(self):
+        """Rows added after construction score like rows indexed up front."""
+        index = TextIndex(self.df.iloc[:6], merge_fraction=10)
+        index.extend(self.df.iloc[6:])
+        self.assertEqual(len(index), len(self.df))
+        positions, scores = index.similarity([2])
+        self.assertIn(6, positions)
+        reference = index.transform(self.df)
+        expected = (reference @ reference[2].T).toarray().ravel()
+        np.testing.assert_allclose(scores, expected[positions], rtol=1e-5)
+
+    def test_top_k_excludes_and_breaks_ties_by_later_row(self):
+        """Selection skips excluded rows and orders ties like RecommendationEngine.top_k."""
+        positions = np.array([7, 2, 9, 4, 5])
+        scores = np.array([0.5, 0.9, 0.5, 0.8, 0.1])
+        selected, selected_scores = TextIndex.top_k(positions, scores, 3, exclude=[2])
+        np.testing.assert_array_equal(selected, [4, 9, 7])
+        np.testing.assert_array_equal(selected_scores, [0.8, 0.5, 0.5])
+
+    def test_recommend_similar_books(self):
+        """Content recommendations follow titles, authors and publishers."""
+        analyzer = BookAnalyzer(self.csv_path)
+        recommendations = analyzer.recommend_similar_books('hobbit', n_recommendations=3)
+        self.assertEqual(list(recommendations['authors']), ['J.R.R. Tolkien'] * 3)
+        self.assertTrue(recommendations['similarity'].is_monotonic_decreasing)
+
+        by_author = analyzer.recommend_similar_books('j.k. rowling', attribute='authors', match='exact')
+        self.assertNotIn('J.K. Rowling', by_author['authors'].values)
+        self.assertIn('The Ring and the Goblet', by_author['title'].values)
+
+        blended = analyzer.recommend_similar_books('hobbit', numeric_weight=1.0, n_recommendations=10)
+        engine = analyzer.get_recommender()
+        expected = engine.unit_features[analyzer.df.index.get_indexer(blended.index)] @ engine.unit_features[0]
+        np.testing.assert_allclose(blended['similarity'], expected)
+
+        self.assertTrue(analyzer.recommend_similar_books('no such book').empty)
+        with self.assertRaises(ValueError):
+            analyzer.recommend_similar_books('hobbit', numeric_weight=2)
+
+    def test_appended_books_are_recommended(self):
+        """Books added with append() are indexed without a rebuild."""
+        analyzer = BookAnalyzer(self.csv_path)
+        index = analyzer.get_text_index()
+        analyzer.append(pd.DataFrame({
+            'bookID': [11], 'isbn': ['0000000011'], 'title': ['The Hobbit: Illustrated Edition'], 'authors': ['J.R.R. Tolkien'],
+            'average_rating': [4.5], 'language_code': ['eng'], 'num_pages': [400],
+            'ratings_count': [100], 'publication_date': ['2012-10-01'], 'publisher': ['Del Rey']
+        }))
+        recommendations = analyzer.recommend_similar_books('the hobbit$', n_recommendations=1)
+        self.assertIs(analyzer.get_text_index(), index)
+        self.assertEqual(list(recommendations['title']), ['The Hobbit: Illustrated Edition'])
+
+if __name__ == '__main__':
+    unittest.main()